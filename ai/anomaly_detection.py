@@ -0,0 +1,361 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+# MAD -> standard deviation under normality
+MAD_SCALE = 1.4826
+
+
+def _nanmedian(values: np.ndarray) -> np.ndarray:
+    """
+    Median over the last axis ignoring NaN (NaN where a window is empty).
+    Sort-based, which is much faster than np.nanmedian for many short windows.
+    """
+    ordered = np.sort(values, axis=-1)  # NaN sorts last
+    k = np.count_nonzero(~np.isnan(values), axis=-1)
+    lo = np.take_along_axis(ordered, np.maximum((k - 1) // 2, 0)[..., None], axis=-1)[..., 0]
+    hi = np.take_along_axis(ordered, np.maximum(k // 2, 0)[..., None] - (k == 0)[..., None], axis=-1)[..., 0]
+    return np.where(k > 0, (lo + hi) / 2, np.nan)
+
+
+class HalfSpaceTrees:
+    """
+    Streaming isolation-style detector (Half-Space Trees, Tan et al. 2011).
+
+    Trees partition a fixed work space, so no training data needs to be kept: each tree
+    only stores node mass counts for a reference window and the window being filled.
+    Points landing in low-mass regions of the reference window score as anomalous.
+    Memory is O(n_trees * 2^depth), independent of the stream length.
+    """
+    def __init__(self, n_features: int, n_trees: int = 25, depth: int = 8, window_size: int = 250,
+                 size_limit: float = 0.1, seed: int = 42):
+        """
+        Args:
+            n_features: Dimensionality of the (pre-scaled to [0, 1]) input points.
+            n_trees: Number of random half-space trees.
+            depth: Depth of each tree.
+            window_size: Number of update() calls per reference window.
+            size_limit: Stop descending once a node's reference mass falls below this.
+            seed: Seed for the random tree structure.
+        """
+        self.n_trees = n_trees
+        self.depth = depth
+        self.window_size = window_size
+        self.size_limit = size_limit
+
+        rng = np.random.default_rng(seed)
+        n_nodes = 2 ** (depth + 1) - 1
+        self.split_dim = np.zeros((n_trees, n_nodes), dtype=np.int64)
+        self.split_val = np.zeros((n_trees, n_nodes))
+
+        # Random work space per tree that covers [0, 1] in every dimension
+        s = rng.uniform(0, 1, size=(n_trees, n_features))
+        half_width = 2 * np.maximum(s, 1 - s)
+        lo, hi = s - half_width, s + half_width
+
+        for t in range(n_trees):
+            bounds = {0: (lo[t].copy(), hi[t].copy())}
+            for node in range(2 ** depth - 1):
+                node_lo, node_hi = bounds.pop(node)
+                dim = rng.integers(n_features)
+                mid = (node_lo[dim] + node_hi[dim]) / 2
+                self.split_dim[t, node] = dim
+                self.split_val[t, node] = mid
+                left_hi, right_lo = node_hi.copy(), node_lo.copy()
+                left_hi[dim], right_lo[dim] = mid, mid
+                bounds[2 * node + 1] = (node_lo, left_hi)
+                bounds[2 * node + 2] = (right_lo, node_hi)
+
+        self.reference_mass = np.zeros((n_trees, n_nodes))
+        self.latest_mass = np.zeros((n_trees, n_nodes))
+        self.n_updates = 0
+        self.points_per_window = float(window_size)
+        self.has_reference = False
+        self._tree_idx = np.arange(n_trees)[:, None]
+
+    def _paths(self, X: np.ndarray) -> np.ndarray:
+        """
+        Node index at every level for every tree and point, shape (n_trees, depth + 1, n_points).
+        """
+        paths = np.zeros((self.n_trees, self.depth + 1, len(X)), dtype=np.int64)
+        node = paths[:, 0, :]
+        for level in range(self.depth):
+            dim = self.split_dim[self._tree_idx, node]
+            go_right = X[np.arange(len(X))[None, :], dim] > self.split_val[self._tree_idx, node]
+            node = 2 * node + 1 + go_right
+            paths[:, level + 1, :] = node
+        return paths
+
+    def score(self, X: np.ndarray, paths: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Anomaly score in [0, 1] per point (1 = isolated, 0 = as dense as a uniform stream or denser).
+        Returns zeros until the first reference window is complete.
+        """
+        if not self.has_reference:
+            return np.zeros(len(X))
+        if paths is None:
+            paths = self._paths(X)
+
+        mass = self.reference_mass[self._tree_idx[:, :, None], paths]
+        # Terminal level: first node whose reference mass is below size_limit, else the leaf
+        below = mass < self.size_limit * self.window_size
+        below[:, -1, :] = True
+        level = below.argmax(axis=1)
+        terminal_mass = np.take_along_axis(mass, level[:, None, :], axis=1)[:, 0, :]
+        hs_score = (terminal_mass * 2.0 ** level).sum(axis=0)
+
+        # A uniform stream of `window_size` points gives hs_score ~ n_trees * window_size
+        return 1.0 - np.minimum(hs_score / (self.n_trees * self.points_per_window), 1.0)
+
+    def update(self, X: np.ndarray, steps: int = 1) -> np.ndarray:
+        """
+        Scores X against the reference window, then adds X to the latest window.
+        
+        Args:
+            X: (n_points, n_features) points scaled to [0, 1].
+            steps: Window steps X accounts for. A call normally counts as one step (X then
+                holds one point per ticker); batch callers may pass several steps at once
+                as long as they do not cross a window boundary.
+        """
+        paths = self._paths(X)
+        scores = self.score(X, paths)
+
+        n_nodes = self.latest_mass.shape[1]
+        flat = (paths + self._tree_idx[:, :, None] * n_nodes).ravel()
+        self.latest_mass += np.bincount(flat, minlength=self.latest_mass.size).reshape(self.latest_mass.shape)
+        self.n_updates += steps
+        if self.n_updates % self.window_size == 0:
+            self.points_per_window = self.latest_mass[:, 0].mean()
+            self.reference_mass, self.latest_mass = self.latest_mass, np.zeros_like(self.latest_mass)
+            self.has_reference = True
+        return scores
+
+
+class StreamingAnomalyDetector:
+    """
+    Bar-by-bar anomaly detection for a fixed universe of tickers.
+
+    Per ticker, only a ring buffer of the last `window` bars of returns and log-volumes is
+    kept (constant memory; missing bars are stored as NaN), from which robust (median/MAD)
+    z-scores are computed. All state is held as (n_tickers, window) arrays, so one update
+    processes the whole universe at once.
+
+    Flags:
+        price_jump:   |return z-score| > jump_threshold
+        volume_spike: log-volume z-score > volume_threshold
+        stale_quote:  price unchanged (or zero volume) for stale_limit consecutive bars
+        isolated:     Half-Space Trees score > isolation_threshold
+    """
+    FLAGS = ['price_jump', 'volume_spike', 'stale_quote', 'isolated']
+
+    def __init__(self, tickers: List[str], window: int = 50, min_periods: int = 20,
+                 jump_threshold: float = 6.0, volume_threshold: float = 5.0, stale_limit: int = 5,
+                 isolation_threshold: float = 0.98, n_trees: int = 25, tree_depth: int = 8, seed: int = 42):
+        self.tickers = list(tickers)
+        self.window = window
+        self.min_periods = min_periods
+        self.jump_threshold = jump_threshold
+        self.volume_threshold = volume_threshold
+        self.stale_limit = stale_limit
+        self.isolation_threshold = isolation_threshold
+
+        n = len(self.tickers)
+        self.returns = np.full((n, window), np.nan)
+        self.log_volume = np.full((n, window), np.nan)
+        self.last_price = np.full(n, np.nan)
+        self.stale_count = np.zeros(n, dtype=np.int64)
+        self.count = np.zeros(n, dtype=np.int64)
+        self.pos = 0
+
+        # Isolation forest-style score over the (clipped, rescaled) robust z-scores
+        self.z_clip = 10.0
+        self.hs_trees = HalfSpaceTrees(n_features=2, n_trees=n_trees, depth=tree_depth, window_size=window, seed=seed)
+
+    @staticmethod
+    def _robust_z(buffer: np.ndarray, x: np.ndarray) -> np.ndarray:
+        """
+        Robust z-score of x against the trailing window(s) in buffer (window on the last axis).
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            median = _nanmedian(buffer)
+            mad = _nanmedian(np.abs(buffer - median[..., None])) * MAD_SCALE
+            z = (x - median) / mad
+            # Flat history: any move is infinitely surprising, no move is not
+            z = np.where(mad > 0, z, np.where(x == median, 0.0, np.sign(x - median) * np.inf))
+        return np.nan_to_num(z, nan=0.0)
+
+    def update_bar(self, prices: np.ndarray, volumes: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Processes one bar for every ticker (arrays aligned with self.tickers; NaN = no quote).
+
+        Returns:
+            Dict of per-ticker arrays: 'return_z', 'volume_z', 'isolation_score', one boolean
+            array per flag in FLAGS, and 'is_anomaly' (any flag).
+        """
+        prices = np.asarray(prices, dtype=float)
+        volumes = np.asarray(volumes, dtype=float)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ret = np.log(prices / self.last_price)
+            log_vol = np.log1p(volumes)
+        valid = np.isfinite(ret)
+
+        # 1. Robust z-scores against the history BEFORE this bar
+        ready = self.count >= self.min_periods
+        return_z = np.where(ready & valid, self._robust_z(self.returns, ret), 0.0)
+        volume_z = np.where(ready & np.isfinite(log_vol), self._robust_z(self.log_volume, log_vol), 0.0)
+
+        # 2. Stale quotes
+        unchanged = (ret == 0) | (volumes <= 0)
+        self.stale_count = np.where(unchanged, self.stale_count + 1, 0)
+
+        # 3. Isolation score on rescaled z-scores (one HS-tree window step per bar)
+        points = (np.clip(np.column_stack([return_z, volume_z]), -self.z_clip, self.z_clip) + self.z_clip) / (2 * self.z_clip)
+        isolation = np.where(ready, self.hs_trees.update(points), 0.0)
+
+        result = {
+            'return_z': return_z,
+            'volume_z': volume_z,
+            'isolation_score': isolation,
+            'price_jump': np.abs(return_z) > self.jump_threshold,
+            'volume_spike': volume_z > self.volume_threshold,
+            'stale_quote': self.stale_count >= self.stale_limit,
+            'isolated': isolation > self.isolation_threshold,
+        }
+        result['is_anomaly'] = np.logical_or.reduce([result[f] for f in self.FLAGS])
+
+        # 4. Push this bar into the ring buffers
+        self.returns[:, self.pos] = np.where(valid, ret, np.nan)
+        self.log_volume[:, self.pos] = np.where(np.isfinite(log_vol), log_vol, np.nan)
+        self.pos = (self.pos + 1) % self.window
+        self.count += valid
+        self.last_price = np.where(np.isfinite(prices), prices, self.last_price)
+
+        return result
+
+    def score_panel(self, prices: pd.DataFrame, volumes: pd.DataFrame, chunk_size: int = 256) -> Dict[str, pd.DataFrame]:
+        """
+        Vectorized batch scoring for backfills (T x N panels with columns = self.tickers).
+        Produces the same output as calling update_bar once per row, and leaves the
+        detector in the same state, so live streaming can continue afterwards.
+        
+        Args:
+            prices: (T x N) close prices.
+            volumes: (T x N) volumes.
+            chunk_size: Bars per vectorized block (bounds the (chunk, N, window) working set).
+
+        Returns:
+            Dict of (T x N) DataFrames with the same keys as update_bar.
+        """
+        P = prices[self.tickers].values.astype(float)
+        V = volumes[self.tickers].values.astype(float)
+        T, n = P.shape
+        W = self.window
+
+        # 1. Returns against the last valid price (as the streaming path does)
+        filled = pd.DataFrame(np.vstack([self.last_price, P])).ffill().values
+        with np.errstate(divide='ignore', invalid='ignore'):
+            R = np.log(P / filled[:-1])
+            LV = np.log1p(V)
+        valid = np.isfinite(R)
+
+        # 2. Robust z-scores: history = ring buffer (oldest first) followed by the new bars
+        order = (self.pos + np.arange(W)) % W
+        hist_R = np.vstack([self.returns[:, order].T, np.where(valid, R, np.nan)])
+        hist_V = np.vstack([self.log_volume[:, order].T, np.where(np.isfinite(LV), LV, np.nan)])
+        windows_R = np.lib.stride_tricks.sliding_window_view(hist_R, W, axis=0)
+        windows_V = np.lib.stride_tricks.sliding_window_view(hist_V, W, axis=0)
+        z_R = np.empty((T, n))
+        z_V = np.empty((T, n))
+        for start in range(0, T, chunk_size):
+            stop = min(start + chunk_size, T)
+            z_R[start:stop] = self._robust_z(windows_R[start:stop], R[start:stop])
+            z_V[start:stop] = self._robust_z(windows_V[start:stop], LV[start:stop])
+
+        count = self.count[None, :] + np.cumsum(valid, axis=0) - valid
+        ready = count >= self.min_periods
+        return_z = np.where(ready & valid, z_R, 0.0)
+        volume_z = np.where(ready & np.isfinite(LV), z_V, 0.0)
+
+        # 3. Stale run lengths
+        unchanged = (R == 0) | (V <= 0)
+        stale = np.zeros((T, n), dtype=np.int64)
+        run = self.stale_count
+        for t in range(T):
+            run = np.where(unchanged[t], run + 1, 0)
+            stale[t] = run
+
+        # 4. Isolation scores: within an HS-tree window, scores only depend on the reference
+        # mass, so each remaining part of a window is scored and added in one step.
+        points = (np.clip(np.stack([return_z, volume_z], axis=2), -self.z_clip, self.z_clip) + self.z_clip) / (2 * self.z_clip)
+        isolation = np.zeros((T, n))
+        hs = self.hs_trees
+        t = 0
+        while t < T:
+            steps = min(hs.window_size - hs.n_updates % hs.window_size, T - t)
+            isolation[t:t + steps] = hs.update(points[t:t + steps].reshape(-1, 2), steps=steps).reshape(steps, n)
+            t += steps
+        isolation = np.where(ready, isolation, 0.0)
+
+        # 5. Leave the streaming state as if update_bar had been called T times
+        self.pos = (self.pos + T) % W
+        self.returns = np.roll(hist_R[-W:].T, self.pos, axis=1)
+        self.log_volume = np.roll(hist_V[-W:].T, self.pos, axis=1)
+        self.count = self.count + valid.sum(axis=0)
+        self.stale_count = run
+        self.last_price = filled[-1]
+
+        arrays = {
+            'return_z': return_z,
+            'volume_z': volume_z,
+            'isolation_score': isolation,
+            'price_jump': np.abs(return_z) > self.jump_threshold,
+            'volume_spike': volume_z > self.volume_threshold,
+            'stale_quote': stale >= self.stale_limit,
+            'isolated': isolation > self.isolation_threshold,
+        }
+        arrays['is_anomaly'] = np.logical_or.reduce([arrays[f] for f in self.FLAGS])
+        return {k: pd.DataFrame(v, index=prices.index, columns=self.tickers) for k, v in arrays.items()}
+
+
+class AnomalyDetector:
+    """
+    Data-cleaning front end: batch-scores an OHLCV frame and repairs bad ticks.
+    """
+    def __init__(self, window: int = 50, jump_threshold: float = 6.0, reversal_tolerance: float = 0.25):
+        """
+        Args:
+            window: Rolling window for the robust statistics.
+            jump_threshold: Robust z-score above which a return is a price jump.
+            reversal_tolerance: A jump is treated as a bad tick (and removed) if the next
+                bar reverses it to within this fraction of its size.
+        """
+        self.window = window
+        self.jump_threshold = jump_threshold
+        self.reversal_tolerance = reversal_tolerance
+
+    def detect(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns a DataFrame of anomaly flags/scores (columns as StreamingAnomalyDetector output).
+        """
+        detector = StreamingAnomalyDetector(['X'], window=self.window, jump_threshold=self.jump_threshold)
+        scores = detector.score_panel(data[['Close']].set_axis(['X'], axis=1), data[['Volume']].set_axis(['X'], axis=1))
+        return pd.DataFrame({k: v['X'] for k, v in scores.items()})
+
+    def clean(self, data: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Removes bad ticks (price jumps immediately reversed) and zero-volume stale bars.
+        Genuine jumps that persist are kept.
+
+        Returns:
+            (cleaned OHLCV DataFrame, anomaly flags DataFrame for the original index)
+        """
+        flags = self.detect(data)
+        log_ret = np.log(data['Close'] / data['Close'].shift(1))
+        next_ret = log_ret.shift(-1)
+        reverted = (log_ret + next_ret).abs() <= self.reversal_tolerance * log_ret.abs()
+        bad_tick = flags['price_jump'] & reverted
+        dead_bar = flags['stale_quote'] & (data['Volume'] <= 0)
+
+        flags['bad_tick'] = bad_tick
+        return data[~(bad_tick | dead_bar)], flags
@@ -0,0 +1,149 @@
+import hashlib
+import pickle
+from collections import OrderedDict
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+import shap
+
+# Explainers (and the attributions they hold) are cached per (model, data) fingerprint
+# at module level, so repeated requests from the dashboard reuse earlier work.
+_EXPLAINER_CACHE: "OrderedDict[tuple, ModelExplainer]" = OrderedDict()
+_MAX_CACHED_EXPLAINERS = 16
+
+
+def fingerprint_model(model) -> str:
+    """
+    Content hash of a fitted model (refitting with new data changes the fingerprint).
+    """
+    return hashlib.sha1(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+
+
+def fingerprint_data(X: pd.DataFrame) -> str:
+    """
+    Content hash of a feature matrix, including its index and column names.
+    """
+    digest = hashlib.sha1(pd.util.hash_pandas_object(X, index=True).values.tobytes())
+    digest.update("|".join(map(str, X.columns)).encode())
+    return digest.hexdigest()
+
+
+class ModelExplainer:
+    """
+    Tree SHAP attributions for tree ensembles such as MLAlphaStrategy's random forest.
+
+    Uses interventional Tree SHAP against a subsampled background set, explains rows
+    in batches, and computes single-date attributions lazily on demand.
+    """
+    def __init__(self, model, X: pd.DataFrame, n_background: int = 50, batch_size: int = 512, random_state: int = 42):
+        """
+        Args:
+            model: Fitted tree model (sklearn RandomForest, XGBoost, ...).
+            X: Feature matrix the model is explained on (e.g. strategy.last_features).
+            n_background: Rows sampled from X as the SHAP background distribution.
+            batch_size: Rows explained per TreeExplainer call.
+            random_state: Seed for the background subsample.
+        """
+        self.model = model
+        self.X = X
+        self.batch_size = batch_size
+
+        background = X.sample(n=min(n_background, len(X)), random_state=random_state) if len(X) > 0 else X
+        self.explainer = shap.TreeExplainer(model, data=background, feature_perturbation="interventional")
+
+        self._full: Optional[pd.DataFrame] = None
+        self._by_date: Dict = {}
+
+    def _shap_values(self, rows: pd.DataFrame) -> np.ndarray:
+        """
+        SHAP values for the positive class (or the regression output), shape (rows, features).
+        """
+        values = self.explainer.shap_values(rows, check_additivity=False)
+        if isinstance(values, list):
+            values = values[-1]
+        values = np.asarray(values)
+        if values.ndim == 3:
+            values = values[:, :, -1]
+        return values
+
+    def explain(self) -> pd.DataFrame:
+        """
+        Attributions for every row of X, computed once in batches.
+
+        Returns:
+            DataFrame aligned with X (same index and columns) of SHAP values.
+        """
+        if self._full is None:
+            chunks = [self._shap_values(self.X.iloc[start:start + self.batch_size])
+                      for start in range(0, len(self.X), self.batch_size)]
+            values = np.vstack(chunks) if chunks else np.empty((0, self.X.shape[1]))
+            self._full = pd.DataFrame(values, index=self.X.index, columns=self.X.columns)
+        return self._full
+
+    def explain_date(self, date):
+        """
+        Attributions for a single date, computed on first request only.
+
+        Returns:
+            Series of SHAP values, or a DataFrame (one row per ticker) when X is a
+            pooled panel in which the date appears more than once.
+        """
+        if self._full is not None:
+            return self._full.loc[date]
+        if date not in self._by_date:
+            rows = self.X.loc[[date]]
+            values = pd.DataFrame(self._shap_values(rows), index=rows.index, columns=self.X.columns)
+            self._by_date[date] = values.iloc[0] if len(values) == 1 else values
+        return self._by_date[date]
+
+    def global_importance(self) -> pd.Series:
+        """
+        Mean absolute SHAP value per feature, sorted descending.
+        """
+        return self.explain().abs().mean().sort_values(ascending=False)
+
+    @property
+    def expected_value(self) -> float:
+        base = np.atleast_1d(self.explainer.expected_value)
+        return float(base[-1])
+
+
+def get_explainer(model, X: pd.DataFrame, **kwargs) -> ModelExplainer:
+    """
+    Returns the cached ModelExplainer for this (model, data) pair, creating it if needed.
+
+    Args:
+        model: Fitted tree model.
+        X: Feature matrix to explain.
+        **kwargs: Passed to ModelExplainer on creation.
+    """
+    key = (fingerprint_model(model), fingerprint_data(X), tuple(sorted(kwargs.items())))
+    if key in _EXPLAINER_CACHE:
+        _EXPLAINER_CACHE.move_to_end(key)
+        return _EXPLAINER_CACHE[key]
+
+    explainer = ModelExplainer(model, X, **kwargs)
+    _EXPLAINER_CACHE[key] = explainer
+    if len(_EXPLAINER_CACHE) > _MAX_CACHED_EXPLAINERS:
+        _EXPLAINER_CACHE.popitem(last=False)
+    return explainer
+
+
+def explain_strategy(strategy, ticker: Optional[str] = None, **kwargs) -> ModelExplainer:
+    """
+    Explainer for a fitted MLAlphaStrategy.
+
+    Args:
+        strategy: Fitted strategy.
+        ticker: Explain the model and features behind this ticker's signals (after
+                generate_panel_signals). None uses the last fit (strategy.model and
+                strategy.last_features), i.e. the whole panel when pooled.
+        **kwargs: Passed to get_explainer.
+    """
+    if ticker is not None:
+        if ticker not in strategy.ticker_features:
+            raise ValueError(f"No fitted model for {ticker!r}; run generate_panel_signals first.")
+        return get_explainer(strategy.models[ticker], strategy.ticker_features[ticker], **kwargs)
+    if strategy.last_features is None:
+        raise ValueError("Strategy has not been fitted yet; run generate_signals first.")
+    return get_explainer(strategy.model, strategy.last_features, **kwargs)
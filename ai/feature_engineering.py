@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from typing import Dict
 
 class FeatureEngineer:
     """
@@ -52,3 +53,27 @@ class FeatureEngineer:
         df.dropna(inplace=True)
         
         return df
+
+    def create_panel_features(self, data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Builds features for a whole universe and stacks them into one long DataFrame.
+        
+        Args:
+            data: Dictionary mapping ticker -> OHLCV DataFrame.
+            
+        Returns:
+            DataFrame indexed by date with the per-ticker feature columns plus
+            'Ticker' (symbol) and 'Ticker_ID' (integer code, stable in dict order).
+        """
+        frames = []
+        for ticker_id, (ticker, df) in enumerate(data.items()):
+            features = self.create_features(df)
+            if features.empty:
+                continue
+            features['Ticker'] = ticker
+            features['Ticker_ID'] = ticker_id
+            frames.append(features)
+            
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames)
@@ -0,0 +1,303 @@
+import math
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import log_loss
+from ai.feature_engineering import FeatureEngineer
+from backtesting.walk_forward import WalkForwardSplitter
+
+NON_FEATURE_COLS = ['Target', 'Open', 'High', 'Low', 'Close', 'Volume', 'Date', 'Ticker']
+
+# Per-process copy of the shared dataset. Set once by _init_worker when the pool starts,
+# so trials only ship their parameters, never the feature matrix.
+_SHARED: Dict = {}
+
+
+def _init_worker(X: np.ndarray, y: np.ndarray, folds: List[Tuple[np.ndarray, np.ndarray]],
+                 groups: Optional[np.ndarray] = None):
+    _SHARED['X'] = X
+    _SHARED['y'] = y
+    _SHARED['folds'] = folds
+    _SHARED['groups'] = groups
+
+
+def _run_fold(objective: Callable, trial_id: int, params: Dict, fold: int) -> Tuple[int, int, float, float, float]:
+    """
+    Evaluates one trial on one walk-forward fold inside a worker.
+
+    Returns:
+        (trial_id, fold, validation loss, CPU seconds, wall seconds)
+    """
+    X, y, groups = _SHARED['X'], _SHARED['y'], _SHARED['groups']
+    train_idx, val_idx = _SHARED['folds'][fold]
+    # Objectives that see one series at a time (e.g. sequence models) take the groups
+    kwargs = {} if groups is None else {'groups_train': groups[train_idx], 'groups_val': groups[val_idx]}
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    loss = objective(params, X[train_idx], y[train_idx], X[val_idx], y[val_idx], **kwargs)
+    return trial_id, fold, float(loss), time.process_time() - cpu_start, time.perf_counter() - wall_start
+
+
+def prepare_dataset(data: Union[pd.DataFrame, Dict[str, pd.DataFrame]]) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """
+    Computes features and next-day direction targets once, for sharing across all trials.
+
+    Args:
+        data: One OHLCV DataFrame, or a dict of them (stacked with a Ticker_ID feature and
+              sorted by date so walk-forward folds stay chronological across tickers;
+              pass X[:, feature_cols.index('Ticker_ID')] as HyperparameterSearch.run groups).
+
+    Returns:
+        (X float32 array, y int array, feature column names)
+    """
+    fe = FeatureEngineer()
+    if isinstance(data, dict):
+        df = fe.create_panel_features(data)
+        df['Target'] = np.where(df.groupby('Ticker', sort=False)['Close'].shift(-1) > df['Close'], 1, 0)
+        df = df.sort_index(kind='stable')
+    else:
+        df = fe.create_features(data)
+        df['Target'] = np.where(df['Close'].shift(-1) > df['Close'], 1, 0)
+    df = df.dropna()
+
+    feature_cols = [c for c in df.columns if c not in NON_FEATURE_COLS]
+    X = df[feature_cols].replace([np.inf, -np.inf], np.nan).fillna(0).values.astype(np.float32)
+    return X, df['Target'].values.astype(np.int64), feature_cols
+
+
+def random_forest_objective(params: Dict, X_train: np.ndarray, y_train: np.ndarray,
+                            X_val: np.ndarray, y_val: np.ndarray, groups_train: Optional[np.ndarray] = None,
+                            groups_val: Optional[np.ndarray] = None) -> float:
+    """
+    Validation log loss of MLAlphaStrategy's random forest with the given parameters
+    (rows are independent samples, so groups are ignored).
+    """
+    model = RandomForestClassifier(
+        n_estimators=params.get('n_estimators', 100),
+        max_depth=params.get('max_depth', 5),
+        min_samples_leaf=params.get('min_samples_leaf', 1),
+        random_state=42,
+        n_jobs=1,
+    )
+    model.fit(X_train, y_train)
+    proba = model.predict_proba(X_val)
+    return log_loss(y_val, proba, labels=model.classes_)
+
+
+def make_sequences(X: np.ndarray, y: np.ndarray, lookback: int,
+                   groups: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sliding windows of `lookback` rows and the target of the row after each window.
+    With groups, each group's rows (in order) are windowed on their own, so no window
+    mixes two series.
+
+    Returns:
+        (windows (n, lookback, features), targets (n,))
+    """
+    windows, targets = [], []
+    for rows in ([np.arange(len(X))] if groups is None else [np.flatnonzero(groups == g) for g in pd.unique(groups)]):
+        n = len(rows) - lookback
+        if n > 0:
+            windows.append(np.lib.stride_tricks.sliding_window_view(X[rows], lookback, axis=0)[:n].transpose(0, 2, 1))
+            targets.append(y[rows][lookback:lookback + n])
+    if not windows:
+        return np.empty((0, lookback, X.shape[1]), dtype=X.dtype), np.empty(0, dtype=y.dtype)
+    return np.ascontiguousarray(np.concatenate(windows)), np.concatenate(targets)
+
+
+def lstm_objective(params: Dict, X_train: np.ndarray, y_train: np.ndarray,
+                   X_val: np.ndarray, y_val: np.ndarray, groups_train: Optional[np.ndarray] = None,
+                   groups_val: Optional[np.ndarray] = None) -> float:
+    """
+    Validation BCE of LSTMAlphaStrategy's network (hidden_size, epochs, lr, lookback_window).
+
+    Windows never span two series: with groups (e.g. Ticker_ID of a stacked panel), each
+    group's rows are windowed on their own and the windows stacked.
+    """
+    import torch
+    import torch.nn as nn
+    from strategies.lstm_alpha import LSTMModel
+
+    torch.set_num_threads(1)  # one trial per core; avoid oversubscribing the pool
+    torch.manual_seed(42)
+    lookback = params.get('lookback_window', 60)
+
+    mean, std = X_train.mean(axis=0), X_train.std(axis=0) + 1e-8
+
+    def sequences(X, y, groups):
+        windows, targets = make_sequences((X - mean) / std, y, lookback, groups)
+        if not len(windows):
+            return None, None
+        return torch.FloatTensor(windows), torch.FloatTensor(targets.reshape(-1, 1).astype(np.float32))
+
+    seq_train, target_train = sequences(X_train, y_train, groups_train)
+    seq_val, target_val = sequences(X_val, y_val, groups_val)
+    if seq_train is None or seq_val is None:
+        return math.log(2)  # Too short to evaluate: score as a coin flip
+
+    model = LSTMModel(X_train.shape[1], hidden_size=params.get('hidden_size', 50))
+    criterion = nn.BCELoss()
+    optimizer = torch.optim.Adam(model.parameters(), lr=params.get('lr', 0.001))
+    model.train()
+    for _ in range(params.get('epochs', 50)):
+        optimizer.zero_grad()
+        loss = criterion(model(seq_train), target_train)
+        loss.backward()
+        optimizer.step()
+
+    model.eval()
+    with torch.no_grad():
+        return criterion(model(seq_val), target_val).item()
+
+
+class HyperparameterSearch:
+    """
+    Random or successive-halving search over strategy hyperparameters.
+
+    Trials are scored by walk-forward validation loss, one fold at a time, on a process
+    pool. The dataset is computed once and handed to each worker at pool start-up.
+    Losing trials are stopped early:
+        method='halving': at rungs of 1, eta, eta^2, ... folds only the best 1/eta survive.
+        method='random':  after every fold, trials worse than the prune_quantile of the
+                          running losses are stopped.
+    """
+    def __init__(self, objective: Callable, param_space: Dict[str, Union[list, tuple]], n_trials: int = 27,
+                 method: str = 'halving', eta: int = 3, prune_quantile: float = 0.75,
+                 splitter: Optional[WalkForwardSplitter] = None, max_workers: Optional[int] = None, seed: int = 42):
+        """
+        Args:
+            objective: Module-level function (params, X_train, y_train, X_val, y_val) -> loss,
+                       e.g. random_forest_objective or lstm_objective (also passed
+                       groups_train / groups_val when run() is given groups).
+            param_space: name -> list of choices, or (low, high) tuple sampled uniformly
+                         (integers if both bounds are ints).
+            n_trials: Number of distinct sampled configurations (fewer if the space is smaller).
+            method: 'halving' or 'random'.
+            eta: Halving rate for successive halving.
+            prune_quantile: Stopping quantile for random search.
+            splitter: Walk-forward fold definition (default WalkForwardSplitter()).
+            max_workers: Pool size (None = all cores, 0 = run serially in this process).
+            seed: Seed for parameter sampling.
+        """
+        if method not in ('halving', 'random'):
+            raise ValueError(f"Unknown search method: {method}")
+        self.objective = objective
+        self.param_space = param_space
+        self.n_trials = n_trials
+        self.method = method
+        self.eta = eta
+        self.prune_quantile = prune_quantile
+        self.splitter = splitter or WalkForwardSplitter()
+        self.max_workers = max_workers
+        self.rng = np.random.default_rng(seed)
+        self.leaderboard: Optional[pd.DataFrame] = None
+
+    def sample_params(self) -> List[Dict]:
+        """Draws up to n_trials distinct configurations (a repeat would only waste a trial)."""
+        trials, seen = [], set()
+        for _ in range(self.n_trials * 100):
+            if len(trials) == self.n_trials:
+                break
+            params = {}
+            for name, space in self.param_space.items():
+                if isinstance(space, list):
+                    params[name] = space[self.rng.integers(len(space))]
+                elif all(isinstance(b, (int, np.integer)) for b in space):
+                    params[name] = int(self.rng.integers(space[0], space[1] + 1))
+                else:
+                    params[name] = float(self.rng.uniform(space[0], space[1]))
+            key = tuple(params.items())
+            if key not in seen:
+                seen.add(key)
+                trials.append(params)
+        return trials
+
+    def _rungs(self, n_folds: int) -> List[int]:
+        """
+        Fold counts after which pruning happens (the last entry is the full budget).
+        """
+        if self.method == 'random':
+            return list(range(1, n_folds + 1))
+        rungs, r = [], 1
+        while r < n_folds:
+            rungs.append(r)
+            r *= self.eta
+        return rungs + [n_folds]
+
+    def run(self, X: np.ndarray, y: np.ndarray, groups: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """
+        Executes the search.
+
+        Args:
+            X, y: Features and targets in chronological order (e.g. from prepare_dataset).
+            groups: Optional series id per row (e.g. Ticker_ID), passed to the objective.
+
+        Returns:
+            Leaderboard DataFrame ranked by (folds evaluated desc, mean loss asc), with the
+            parameters, mean validation loss, folds evaluated, status and CPU/wall cost per trial.
+        """
+        folds = self.splitter.split(len(X))
+        if not folds:
+            raise ValueError("Not enough rows for walk-forward validation.")
+
+        params_list = self.sample_params()
+        losses = {i: [] for i in range(len(params_list))}
+        cpu = dict.fromkeys(losses, 0.0)
+        wall = dict.fromkeys(losses, 0.0)
+        active = list(losses)
+        start = time.perf_counter()
+
+        if self.max_workers == 0:
+            _init_worker(X, y, folds, groups)
+            pool = None
+        else:
+            pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                       initargs=(X, y, folds, groups))
+
+        try:
+            done_folds = 0
+            for rung in self._rungs(len(folds)):
+                # 1. Evaluate every surviving trial on the folds up to this rung, in parallel
+                tasks = [(self.objective, i, params_list[i], f) for i in active for f in range(done_folds, rung)]
+                if pool is None:
+                    results = [_run_fold(*task) for task in tasks]
+                else:
+                    results = [future.result() for future in [pool.submit(_run_fold, *task) for task in tasks]]
+                for trial_id, fold, loss, cpu_s, wall_s in results:
+                    losses[trial_id].append(loss)
+                    cpu[trial_id] += cpu_s
+                    wall[trial_id] += wall_s
+                done_folds = rung
+
+                # 2. Early stopping
+                if rung == len(folds) or len(active) <= 1:
+                    continue
+                mean_loss = np.array([np.mean(losses[i]) for i in active])
+                if self.method == 'halving':
+                    keep = max(1, math.ceil(len(active) / self.eta))
+                    active = [active[k] for k in np.argsort(mean_loss, kind='stable')[:keep]]
+                else:
+                    cutoff = np.quantile(mean_loss, self.prune_quantile)
+                    active = [i for i, loss in zip(active, mean_loss) if loss <= cutoff]
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        rows = []
+        for i, params in enumerate(params_list):
+            rows.append({
+                **params,
+                'Loss': float(np.mean(losses[i])),
+                'Folds': len(losses[i]),
+                'Status': 'completed' if len(losses[i]) == len(folds) else 'stopped',
+                'CPU Seconds': cpu[i],
+                'Wall Seconds': wall[i],
+            })
+        board = pd.DataFrame(rows).sort_values(['Folds', 'Loss'], ascending=[False, True]).reset_index(drop=True)
+        board.index.name = 'Rank'
+        board.attrs['Total CPU Seconds'] = float(sum(cpu.values()))
+        board.attrs['Elapsed Seconds'] = time.perf_counter() - start
+        self.leaderboard = board
+        return board
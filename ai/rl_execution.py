@@ -0,0 +1,200 @@
+import time
+import numpy as np
+from typing import Dict, Optional, Tuple
+from execution.latency_model import MS_PER_DAY, LatencyModel
+from execution.order_book import OrderBook
+
+
+class VectorizedExecutionEnv:
+    """
+    Gym-style optimal-execution environment that steps N environments at once.
+
+    Each environment works a parent order of `parent_qty` shares over `horizon` decision
+    steps of one trading day. At every step the agent chooses the fraction of the remaining
+    inventory to send as a marketable child order; whatever is left at the last step is
+    forced out. Prices follow a GBM mid, quotes come from OrderBook.get_market_price, the
+    child order arrives after a LatencyModel delay (during which the mid keeps moving), and
+    pays linear temporary impact against the step's share of daily volume.
+
+    All state is held in (n_envs,) arrays: reset() and step() contain no per-environment
+    Python loop. Episodes have a fixed length, so all environments finish together and are
+    reset automatically (the returned observation is the first one of the new episode).
+
+    Observation (n_envs, 5):
+        [time remaining fraction, inventory remaining fraction, mid vs arrival (bps),
+         spread (bps), step volume share]
+    Action (n_envs,): fraction of remaining inventory to trade now, clipped to [0, 1].
+    Reward (n_envs,): negative implementation shortfall of this step's fill, in bps of
+        the parent order's arrival notional.
+    """
+    observation_dim = 5
+
+    def __init__(self, n_envs: int = 1024, horizon: int = 20, parent_qty: float = 10000.0, side: int = 1,
+                 arrival_price: float = 100.0, volatility: float = 0.20, spread_bps: float = 5.0,
+                 daily_volume: float = 1e6, impact_coefficient: float = 0.1,
+                 latency_model: Optional[LatencyModel] = None, seed: Optional[int] = None):
+        """
+        Args:
+            n_envs: Number of environments stepped in lockstep.
+            horizon: Decision steps per episode (spread evenly over one trading day).
+            parent_qty: Shares to execute per episode.
+            side: 1 to buy, -1 to sell.
+            arrival_price: Mid price at the start of each episode.
+            volatility: Annualized volatility of the mid.
+            spread_bps: Quoted spread passed to OrderBook.get_market_price.
+            daily_volume: Market volume per day, distributed with an intraday U-shape.
+            impact_coefficient: Temporary impact in price fraction per unit of volume participation.
+            latency_model: Source of order-arrival latency; its own seeded stream is used
+                           (default LatencyModel(seed=seed)).
+            seed: Seed for the environment's random generator.
+        """
+        self.n_envs = n_envs
+        self.horizon = horizon
+        self.parent_qty = parent_qty
+        self.side = side
+        self.arrival_price = arrival_price
+        self.spread_bps = spread_bps
+        self.impact_coefficient = impact_coefficient
+        self.latency_model = latency_model or LatencyModel(seed=seed)
+        self.order_book = OrderBook()
+        self.rng = np.random.default_rng(seed)
+
+        self.daily_sigma = volatility / np.sqrt(252)
+        self.step_sigma = self.daily_sigma / np.sqrt(horizon)
+
+        # Intraday U-shaped volume profile (heavier at open and close)
+        u = np.linspace(-1, 1, horizon)
+        profile = 1 + 2 * u ** 2
+        self.volume_profile = profile / profile.sum()
+        self.step_volume = daily_volume * self.volume_profile
+
+        self.reset()
+
+    def reset(self, seed: Optional[int] = None) -> np.ndarray:
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self.t = 0
+        self.mid = np.full(self.n_envs, self.arrival_price)
+        self.remaining = np.full(self.n_envs, self.parent_qty)
+        self.cost = np.zeros(self.n_envs)
+        return self._observation()
+
+    def _observation(self) -> np.ndarray:
+        obs = np.empty((self.n_envs, self.observation_dim))
+        obs[:, 0] = (self.horizon - self.t) / self.horizon
+        obs[:, 1] = self.remaining / self.parent_qty
+        obs[:, 2] = (self.mid / self.arrival_price - 1) * 1e4
+        obs[:, 3] = self.spread_bps
+        obs[:, 4] = self.volume_profile[min(self.t, self.horizon - 1)]
+        return obs
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Returns:
+            (observations, rewards, dones, info). info['shortfall_bps'] holds each episode's
+            total implementation shortfall on the step where it finishes (NaN otherwise).
+        """
+        n = self.n_envs
+        last_step = self.t == self.horizon - 1
+        fraction = np.ones(n) if last_step else np.clip(np.asarray(actions, dtype=float), 0.0, 1.0)
+        qty = fraction * self.remaining
+
+        # 1. Latency: the mid drifts while the child order travels to the venue
+        latency_ms = self.latency_model.get_latencies(n)
+        shocks = self.rng.standard_normal((2, n))
+        arrival_mid = self.mid * (1 + self.daily_sigma * np.sqrt(latency_ms / MS_PER_DAY) * shocks[0])
+
+        # 2. Marketable child order crosses the quoted spread and pays temporary impact
+        bid, ask = self.order_book.get_market_price(arrival_mid, self.spread_bps)
+        touch = ask if self.side == 1 else bid
+        participation = qty / self.step_volume[self.t]
+        exec_price = touch * (1 + self.side * self.impact_coefficient * participation)
+
+        step_cost = self.side * (exec_price - self.arrival_price) * qty
+        rewards = -step_cost / (self.arrival_price * self.parent_qty) * 1e4
+        self.cost += step_cost
+        self.remaining = self.remaining - qty
+
+        # 3. Mid evolves to the next decision time
+        self.mid = arrival_mid * np.exp(self.step_sigma * shocks[1] - 0.5 * self.step_sigma ** 2)
+        self.t += 1
+
+        info = {'shortfall_bps': np.full(n, np.nan)}
+        if last_step:
+            info['shortfall_bps'] = self.cost / (self.arrival_price * self.parent_qty) * 1e4
+            obs = self.reset()
+            dones = np.ones(n, dtype=bool)
+        else:
+            obs = self._observation()
+            dones = np.zeros(n, dtype=bool)
+        return obs, rewards, dones, info
+
+
+class TWAPPolicy:
+    """
+    Time-weighted baseline: trade the remaining inventory evenly over the remaining steps.
+    """
+    def __init__(self, horizon: int):
+        self.horizon = horizon
+
+    def __call__(self, obs: np.ndarray) -> np.ndarray:
+        steps_left = np.rint(obs[:, 0] * self.horizon)
+        return 1.0 / np.maximum(steps_left, 1)
+
+
+class VWAPPolicy:
+    """
+    Volume-weighted baseline: trade in proportion to the expected intraday volume profile.
+    """
+    def __init__(self, volume_profile: np.ndarray):
+        self.volume_profile = np.asarray(volume_profile, dtype=float)
+        # Share of the remaining expected volume that falls in each step
+        remaining_volume = np.cumsum(self.volume_profile[::-1])[::-1]
+        self.fractions = self.volume_profile / remaining_volume
+
+    def __call__(self, obs: np.ndarray) -> np.ndarray:
+        horizon = len(self.volume_profile)
+        t = horizon - np.rint(obs[:, 0] * horizon).astype(int)
+        return self.fractions[np.clip(t, 0, horizon - 1)]
+
+
+def evaluate_policy(env: VectorizedExecutionEnv, policy, n_episodes: int = 1) -> Dict[str, float]:
+    """
+    Runs a policy for n_episodes rounds of all environments.
+
+    Returns:
+        Mean / std / 95th percentile of implementation shortfall (bps).
+    """
+    obs = env.reset()
+    shortfalls = []
+    while len(shortfalls) < n_episodes:
+        obs, _, dones, info = env.step(policy(obs))
+        if dones.any():
+            shortfalls.append(info['shortfall_bps'][dones])
+    shortfall = np.concatenate(shortfalls)
+    return {
+        "Mean Shortfall (bps)": float(shortfall.mean()),
+        "Std Shortfall (bps)": float(shortfall.std()),
+        "P95 Shortfall (bps)": float(np.percentile(shortfall, 95)),
+    }
+
+
+def benchmark_env(n_envs: int = 4096, n_steps: int = 1000, seed: int = 0) -> Dict[str, float]:
+    """
+    Measures raw environment throughput with a TWAP policy.
+
+    Returns:
+        Dict with total env-steps and env-steps per second.
+    """
+    env = VectorizedExecutionEnv(n_envs=n_envs, seed=seed)
+    policy = TWAPPolicy(env.horizon)
+    obs = env.reset()
+    start = time.perf_counter()
+    for _ in range(n_steps):
+        obs, _, _, _ = env.step(policy(obs))
+    elapsed = time.perf_counter() - start
+    return {
+        "Env Steps": n_envs * n_steps,
+        "Seconds": elapsed,
+        "Env Steps/sec": n_envs * n_steps / elapsed,
+    }
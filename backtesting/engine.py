@@ -1,17 +1,34 @@
+import warnings
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from typing import Any, Dict, Optional
 from strategies.base import Strategy
 from risk.manager import RiskManager
 from backtesting.metrics import calculate_metrics
 from execution.latency_model import LatencyModel
+from execution.cost_model import TransactionCostModel
+from ai.anomaly_detection import StreamingAnomalyDetector
 
 class BacktestEngine:
-    def __init__(self, strategy: Strategy, data: Dict[str, pd.DataFrame], initial_capital: float = 100000.0, use_latency: bool = False):
+    def __init__(self, strategy: Strategy, data: Dict[str, pd.DataFrame], initial_capital: float = 100000.0, use_latency: bool = False,
+                 use_anomaly_guard: bool = False, seed: Optional[int] = None,
+                 cost_model: Optional[TransactionCostModel] = None, vol_targeting: str = 'asset',
+                 resize_band: float = 0.25):
         """
         Args:
            ...
            use_latency: If True, enables latency and slippage simulation.
+           use_anomaly_guard: If True, streams each bar through an anomaly detector: a flagged
+                              ticker is not traded on that bar, and the risk manager
+                              pauses entries on bars where much of the universe is flagged.
+           seed: Seed for the latency/slippage draws (same seed -> identical backtest).
+           cost_model: Spread / market impact / commission model for fills. If None, a
+                       flat 1bp spread is charged when latency is enabled.
+           vol_targeting: 'asset' sizes each entry alone at target / asset vol;
+                          'portfolio' sizes the held book jointly on an EWMA covariance
+                          so correlated names share the 20% volatility target.
+           resize_band: In 'portfolio' mode, held positions are traded back to their
+                        joint target once they are off by more than this fraction.
         """
         self.strategy = strategy
         self.data = data
@@ -20,14 +37,22 @@ class BacktestEngine:
         self.positions = {} # Current holding quantity per ticker
         self.cash = initial_capital
         self.history = []
+        self.fills = [] # One record per executed trade, for transaction-cost analysis
         
         # Risk Manager
-        self.risk_manager = RiskManager(target_volatility=0.20, max_drawdown_limit=0.25)
-        self.peak_equity = initial_capital
+        self.vol_targeting = vol_targeting
+        self.resize_band = resize_band
+        self.risk_manager = RiskManager(target_volatility=0.20, max_drawdown_limit=0.25, vol_targeting=vol_targeting,
+                                        tickers=list(data.keys()))
+        self.risk_manager.drawdown_tracker.reset(initial_capital)
         
         # Execution
         self.use_latency = use_latency
-        self.latency_model = LatencyModel() if use_latency else None
+        self.latency_model = LatencyModel(seed=seed) if use_latency else None
+        self.cost_model = cost_model
+        
+        # Data Quality
+        self.use_anomaly_guard = use_anomaly_guard
         
     def run(self):
         # ... (same setup) ...
@@ -39,14 +64,29 @@ class BacktestEngine:
         # Union of all dates
         all_dates = sorted(list(set().union(*[df.index for df in self.data.values()])))
         
-        # Calculate Signals per ticker
-        all_signals = {}
-        for ticker in tickers:
-            ticker_data = self.data[ticker]
-            all_signals[ticker] = self.strategy.generate_signals(ticker_data)
+        # Calculate Signals for the universe (per ticker, or pooled if the strategy supports it)
+        all_signals = self.strategy.generate_panel_signals(self.data)
+        short = [t for t, s in all_signals.items()
+                 if (s['Signal'] < 0).any() or ('Weight' in s and (s['Weight'] < 0).any())]
+        if short:
+            warnings.warn(f"{self.strategy.name} wants short positions in {len(short)} tickers, but this engine is "
+                          "long/flat and treats them as flat; backtest long/short weights with "
+                          "backtesting.portfolio.PortfolioBacktestEngine.")
+        
+        # Cost inputs (ADV, volatility) for every date and ticker, computed once
+        if self.cost_model is not None:
+            self.cost_model.prepare(self.data)
             
+        anomaly_detector = StreamingAnomalyDetector(tickers) if self.use_anomaly_guard else None
+        
+        # Daily returns panel for the joint (covariance-aware) sizing, one row per bar
+        bar_returns = None
+        if self.vol_targeting == 'portfolio':
+            closes = pd.DataFrame({t: self.data[t]['Close'] for t in tickers}).reindex(all_dates)
+            bar_returns = closes.where(closes > 1e-8).ffill().pct_change(fill_method=None).values
+        
         # Iterating through time
-        for date in all_dates:
+        for bar, date in enumerate(all_dates):
             equity_from_positions = 0.0
             current_prices = {} 
             
@@ -69,10 +109,17 @@ class BacktestEngine:
             total_equity = self.cash + equity_from_positions
             
             # 2. Risk Checks
-            self.peak_equity = max(self.peak_equity, total_equity)
-            current_drawdown = (total_equity - self.peak_equity) / self.peak_equity
+            can_trade = self.risk_manager.check_equity(total_equity)
+            if bar_returns is not None:
+                self.risk_manager.update_market(bar_returns[bar])
             
-            can_trade = self.risk_manager.check_portfolio_health(current_drawdown)
+            anomalous = set()
+            if anomaly_detector is not None:
+                bar_prices = np.array([self.data[t]['Close'].get(date, np.nan) for t in tickers], dtype=float)
+                bar_volumes = np.array([self.data[t]['Volume'].get(date, np.nan) for t in tickers], dtype=float)
+                anomalies = anomaly_detector.update_bar(bar_prices, bar_volumes)
+                can_trade = self.risk_manager.check_market_anomalies(anomalies['is_anomaly']) and can_trade
+                anomalous = {t for t, flag in zip(tickers, anomalies['is_anomaly']) if flag}
             
             # 3. Execution Logic
             for ticker in tickers:
@@ -85,12 +132,14 @@ class BacktestEngine:
                 else:
                      target_position = -999 
                 
-                if current_price > 0 and target_position != -999:
+                if current_price > 0 and target_position != -999 and ticker not in anomalous:
                     current_qty = self.positions.get(ticker, 0)
                     
                     # Execution Price Logic
                     # If Latency is ON, we add slippage to the current_price before executing
                     execution_price = current_price
+                    latency_cost = 0.0
+                    spread_cost = 0.0
                     if self.use_latency:
                         # Assume 20% vol roughly for slippage calculation or calculate it
                         slippage = self.latency_model.simulate_slippage(current_price, volatility=0.20)
@@ -100,7 +149,9 @@ class BacktestEngine:
                         # We'll assume 'shock' is the random drift. 
                         # PLUS spread cost (e.g. 1bp)
                         
-                        spread_cost = current_price * 0.0001
+                        latency_cost = abs(slippage)
+                        if self.cost_model is None:
+                            spread_cost = current_price * 0.0001
                         
                         if target_position == 1 and current_qty == 0: # Buying
                              # Buying: we pay Price + Spread + Shock (if shock against us)
@@ -125,22 +176,44 @@ class BacktestEngine:
                             except:
                                 asset_vol = 0.20
                             
-                            allocation = self.risk_manager.get_allocation_amount(total_equity, asset_vol)
+                            allocation = self.risk_manager.get_allocation_amount(total_equity, asset_vol, ticker)
                             allocation = min(allocation, self.cash)
+                            shares_to_buy = 0
                             
                             if allocation > 0:
                                 shares_to_buy = int(allocation // execution_price) # Use execution price
                                 
+                                if shares_to_buy > 0 and self.cost_model is not None:
+                                    # Impact grows with size: resize once at the all-in price
+                                    fill_price = execution_price + self._model_cost_per_share(ticker, date, current_price, shares_to_buy)
+                                    commission = self.cost_model.commission_for(shares_to_buy, current_price)
+                                    shares_to_buy = int(max(allocation - commission, 0) // fill_price)
+                                
                                 if shares_to_buy > 0:
-                                    cost = shares_to_buy * execution_price
+                                    fill_price, commission = self._price_fill(ticker, date, current_price, execution_price, shares_to_buy, 1)
+                                    cost = shares_to_buy * fill_price + commission
                                     self.cash -= cost
                                     self.positions[ticker] = shares_to_buy
+                                    self._record_fill(date, ticker, 1, shares_to_buy, current_price, fill_price, commission,
+                                                      spread_cost, latency_cost)
+                            
+                            if shares_to_buy <= 0:
+                                # Nothing bought (no cash, or under one share): drop the unit
+                                # the sizer booked for it
+                                self.risk_manager.release_allocation(ticker)
 
                     elif target_position == 0 and current_qty > 0:
                         # Sell
-                        revenue = current_qty * execution_price # Use execution price
+                        fill_price, commission = self._price_fill(ticker, date, current_price, execution_price, current_qty, -1)
+                        revenue = current_qty * fill_price - commission # Use execution price
                         self.cash += revenue
                         self.positions[ticker] = 0
+                        self.risk_manager.release_allocation(ticker)
+                        self._record_fill(date, ticker, -1, current_qty, current_price, fill_price, commission,
+                                          spread_cost, latency_cost)
+            
+            if bar_returns is not None and can_trade:
+                self._resize_positions(date, current_prices, self.risk_manager.target_exposures(total_equity))
             
             # Recalculate generic portfolio value for the day
             # (Slightly redundant but clean)
@@ -153,6 +226,73 @@ class BacktestEngine:
         self.results = pd.DataFrame(self.portfolio_value).set_index('Date')
         self.results['Returns'] = self.results['PortfolioValue'].pct_change().fillna(0)
         
+    def _resize_positions(self, date, current_prices: Dict[str, float], targets: pd.Series):
+        """
+        Trades held positions back to their joint vol-target exposure when they have
+        drifted outside resize_band (at the close, without latency).
+        """
+        for ticker, exposure in targets.items():
+            qty = self.positions.get(ticker, 0)
+            price = current_prices[ticker]
+            if qty <= 0 or price <= 0:
+                continue
+            target_qty = int(exposure // price)
+            if abs(target_qty - qty) <= self.resize_band * qty:
+                continue
+            side = 1 if target_qty > qty else -1
+            shares = abs(target_qty - qty)
+            if side == 1:
+                shares = min(shares, int(self.cash // price))
+                if shares <= 0:
+                    continue
+            fill_price, commission = self._price_fill(ticker, date, price, price, shares, side)
+            self.cash -= side * shares * fill_price + commission
+            self.positions[ticker] = qty + side * shares
+            self._record_fill(date, ticker, side, shares, price, fill_price, commission, 0.0, 0.0)
+    
+    def _model_cost_per_share(self, ticker: str, date, price: float, shares: int) -> float:
+        """Spread + impact per share from the cost model, on the pre-latency price."""
+        return self.cost_model.execution_price(ticker, date, price, shares, 1) - price
+    
+    def _price_fill(self, ticker: str, date, price: float, execution_price: float, shares: int, side: int):
+        """
+        Final fill price and commission: the (latency-adjusted) execution price plus the
+        cost model's spread and impact in the trade direction.
+        """
+        if self.cost_model is None:
+            return execution_price, 0.0
+        fill_price = execution_price + side * self._model_cost_per_share(ticker, date, price, shares)
+        return fill_price, self.cost_model.commission_for(shares, price)
+    
+    def _record_fill(self, date, ticker: str, side: int, shares: int, price: float, fill_price: float,
+                     commission: float, flat_spread: float, latency_cost: float):
+        record = {
+            'Date': date, 'Ticker': ticker, 'Side': side, 'Quantity': shares,
+            'Price': price, 'Fill Price': fill_price, 'Notional': shares * price,
+            'Spread Cost': flat_spread * shares, 'Impact Cost': 0.0,
+            'Commission': commission, 'Latency Cost': latency_cost * shares,
+        }
+        self.fills.append(record)
+    
+    def get_fills(self) -> pd.DataFrame:
+        """
+        All fills of the run with their cost components. With a cost model, spread, impact
+        and commission are priced for every fill in one vectorized pass.
+        """
+        fills = pd.DataFrame(self.fills)
+        if self.cost_model is not None and not fills.empty:
+            fills = self.cost_model.compute_costs(fills.drop(columns=TransactionCostModel.COMPONENTS))
+        return fills
+    
+    def get_tca_report(self) -> pd.DataFrame:
+        """
+        Transaction-cost analysis of the run: spread, impact, commission and latency
+        costs per ticker, in currency and bps of traded notional.
+        """
+        if not self.fills:
+            return pd.DataFrame()
+        return (self.cost_model or TransactionCostModel()).tca_report(self.get_fills())
+    
     def get_performance_metrics(self) -> Dict[str, Any]:
         if not hasattr(self, 'results'):
             return {}
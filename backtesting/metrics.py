@@ -1,5 +1,6 @@
 import numpy as np
 import pandas as pd
+from risk.drawdown import drawdown_series, drawdown_stats, equity_from_returns
 
 def calculate_metrics(daily_returns: pd.Series, risk_free_rate: float = 0.0) -> dict:
     """
@@ -10,7 +11,7 @@ def calculate_metrics(daily_returns: pd.Series, risk_free_rate: float = 0.0) ->
         risk_free_rate: Annualized risk-free rate (default 0.0).
         
     Returns:
-        Dictionary containing Sharpe, Sortino, Max Drawdown, CAGR, Volatility.
+        Dictionary containing Sharpe, Sortino, Max Drawdown (and its duration in bars), CAGR, Volatility.
     """
     # Annualization factor (assuming 252 trading days)
     N = 252
@@ -33,10 +34,10 @@ def calculate_metrics(daily_returns: pd.Series, risk_free_rate: float = 0.0) ->
         sortino_ratio = (mean_return - risk_free_rate) / downside_std
         
     # Max Drawdown
-    cumulative_returns = (1 + daily_returns).cumprod()
-    peak = cumulative_returns.expanding(min_periods=1).max()
-    drawdown = (cumulative_returns - peak) / peak
+    cumulative_returns = equity_from_returns(daily_returns)
+    drawdown = drawdown_series(cumulative_returns)
     max_drawdown = drawdown.min()
+    max_drawdown_duration = drawdown_stats(cumulative_returns)['Max Duration'].iloc[0] if len(drawdown) else 0
     
     # Total Return
     total_return = cumulative_returns.iloc[-1] - 1 if not cumulative_returns.empty else 0
@@ -47,5 +48,6 @@ def calculate_metrics(daily_returns: pd.Series, risk_free_rate: float = 0.0) ->
         "Annualized Volatility": volatility,
         "Sharpe Ratio": sharpe_ratio,
         "Sortino Ratio": sortino_ratio,
-        "Max Drawdown": max_drawdown
+        "Max Drawdown": max_drawdown,
+        "Max Drawdown Duration": max_drawdown_duration
     }
@@ -0,0 +1,45 @@
+import numpy as np
+from typing import List, Optional, Tuple
+
+
+class WalkForwardSplitter:
+    """
+    Chronological train/validation folds for time series (no shuffling, no look-ahead).
+
+    The data after an initial training block is cut into n_splits consecutive validation
+    blocks. Each fold trains on everything before its block (expanding window), or on the
+    last `max_train_size` rows before it (rolling window).
+    """
+    def __init__(self, n_splits: int = 5, initial_train_fraction: float = 0.5,
+                 max_train_size: Optional[int] = None, gap: int = 1):
+        """
+        Args:
+            n_splits: Number of validation blocks.
+            initial_train_fraction: Share of rows reserved for the first training block.
+            max_train_size: If set, training windows roll with this many rows.
+            gap: Rows dropped between train and validation, at least the label horizon
+                 (default 1 for next-bar targets, whose last training label would
+                 otherwise look at the first validation bar's close). For a date-sorted
+                 panel, multiply by the number of tickers per date.
+        """
+        self.n_splits = n_splits
+        self.initial_train_fraction = initial_train_fraction
+        self.max_train_size = max_train_size
+        self.gap = gap
+
+    def split(self, n_samples: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Returns:
+            List of (train_indices, validation_indices) position arrays, oldest fold first.
+        """
+        first_test = int(n_samples * self.initial_train_fraction)
+        bounds = np.linspace(first_test, n_samples, self.n_splits + 1).astype(int)
+
+        folds = []
+        for test_start, test_end in zip(bounds[:-1], bounds[1:]):
+            train_end = test_start - self.gap
+            train_start = 0 if self.max_train_size is None else max(0, train_end - self.max_train_size)
+            if train_end <= train_start or test_end <= test_start:
+                continue
+            folds.append((np.arange(train_start, train_end), np.arange(test_start, test_end)))
+        return folds
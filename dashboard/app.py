@@ -13,9 +13,11 @@ from data.ingestion import DataIngestion
 from strategies.momentum import MomentumStrategy
 from strategies.ml_alpha import MLAlphaStrategy
 from backtesting.engine import BacktestEngine
+from backtesting.portfolio import PortfolioBacktestEngine
 import requests
 from strategies.lstm_alpha import LSTMAlphaStrategy
 from risk.optimizer import PortfolioOptimizer
+from ai.explainability import explain_strategy
 from dashboard.theme import get_custom_css, get_tradingview_template, COLORS
 
 # API Configuration
@@ -233,6 +235,13 @@ if run_btn:
                         legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
                     )
                     st.plotly_chart(fig, use_container_width=True)
+                    
+                    # Explainability (cached per model/data fingerprint across reruns)
+                    if isinstance(strategy, MLAlphaStrategy) and strategy.last_features is not None:
+                        st.write("### Feature Attribution (SHAP)")
+                        ticker = target_ticker if target_ticker in strategy.ticker_features else None
+                        importance = explain_strategy(strategy, ticker).global_importance()
+                        st.bar_chart(importance)
 
             # Tab 2: Portfolio Optimization
             with tabs[1]:
@@ -262,6 +271,17 @@ if run_btn:
                         st.write("### Optimal Weights Allocation")
                         st.dataframe(df_weights.style.format("{:.2%}"))
                         
+                        # Backtest the allocations, rebalanced monthly on a rolling window
+                        st.write("### Monthly Rebalanced Backtest")
+                        lookback = min(252, len(close_df) // 2)
+                        curves = {}
+                        for label, method in (("Max Sharpe", 'max_sharpe'), ("Risk Parity", 'risk_parity'),
+                                              ("Equal Weight", 'equal')):
+                            portfolio = PortfolioBacktestEngine(close_df, weights=method, lookback=lookback,
+                                                                initial_capital=initial_capital)
+                            curves[label] = portfolio.run()['PortfolioValue']
+                        st.line_chart(pd.DataFrame(curves).iloc[lookback:])
+                        
                         fig_corr.update_layout(
                             title="Asset Correlation Matrix",
                             template=get_tradingview_template()
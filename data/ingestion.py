@@ -1,6 +1,7 @@
 import yfinance as yf
 import pandas as pd
 from typing import List, Optional, Dict
+from ai.anomaly_detection import AnomalyDetector
 
 class DataIngestion:
     """
@@ -9,7 +10,7 @@ class DataIngestion:
     def __init__(self):
         pass
 
-    def fetch_data(self, tickers: List[str], start_date: str, end_date: str, interval: str = "1d") -> Dict[str, pd.DataFrame]:
+    def fetch_data(self, tickers: List[str], start_date: str, end_date: str, interval: str = "1d", clean: bool = False) -> Dict[str, pd.DataFrame]:
         """
         Fetches historical data for a list of tickers using yfinance.
         
@@ -18,6 +19,8 @@ class DataIngestion:
             start_date: Start date in 'YYYY-MM-DD' format
             end_date: End date in 'YYYY-MM-DD' format
             interval: Data interval (default '1d')
+            clean: If True, removes bad ticks and dead (zero-volume stale) bars
+                   flagged by ai.anomaly_detection.AnomalyDetector.
             
         Returns:
             Dict[str, pd.DataFrame]: Dictionary mapping ticker -> DataFrame with OHLCV columns.
@@ -45,6 +48,12 @@ class DataIngestion:
                              if df.columns.nlevels > 1:
                                  df.columns = df.columns.droplevel(1)
                      
+                     if clean:
+                         df, flags = AnomalyDetector().clean(df)
+                         removed = len(flags) - len(df)
+                         if removed:
+                             print(f"Cleaned {ticker}: removed {removed} anomalous bars")
+                     
                      data_dict[ticker] = df
                 else:
                     print(f"Warning: No data found for {ticker}")
@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
+@dataclass
+class CommissionSchedule:
+    """
+    Broker commission per order: per-share and/or notional (bps) charges, with a minimum
+    ticket charge and an optional cap as a fraction of notional.
+
+    Examples:
+        CommissionSchedule(per_share=0.005, minimum=1.0, maximum_pct=0.01)  # per-share broker
+        CommissionSchedule(bps=1.0)                                          # notional broker
+    """
+    per_share: float = 0.0
+    bps: float = 0.0
+    minimum: float = 0.0
+    maximum_pct: Optional[float] = None
+
+    def compute(self, shares, notional):
+        """
+        Commission for one or many orders (arrays broadcast). Zero-share orders cost nothing.
+        """
+        shares = np.abs(np.asarray(shares, dtype=float))
+        notional = np.abs(np.asarray(notional, dtype=float))
+        fee = np.maximum(shares * self.per_share + notional * self.bps / 10000.0, self.minimum)
+        if self.maximum_pct is not None:
+            fee = np.minimum(fee, notional * self.maximum_pct)
+        return np.where(shares > 0, fee, 0.0)
+
+
+class TransactionCostModel:
+    """
+    Spread + square-root market impact + commission cost model.
+
+    Per share, a fill pays (as a fraction of the reference price):
+        half spread:  spread_bps / 2 / 1e4
+        impact:       impact_coefficient * sigma_daily * sqrt(shares / ADV)
+    plus the commission schedule per order. ADV and daily volatility come from the OHLCV
+    'Volume' and 'Close' columns over a trailing window, lagged one bar so a fill never
+    uses same-day information.
+
+    prepare() computes the per-(date, ticker) half-spread and impact scale
+    (impact_coefficient * sigma / sqrt(ADV)) once for the whole run, so per-fill pricing
+    in the engine is a lookup, and compute_costs() prices all fills of a run at once.
+    """
+    COMPONENTS = ['Spread Cost', 'Impact Cost', 'Commission']
+
+    def __init__(self, spread_bps: float = 2.0, impact_coefficient: float = 0.1, adv_window: int = 20,
+                 volatility_window: int = 20, commission: Optional[CommissionSchedule] = None,
+                 default_volatility: float = 0.02):
+        """
+        Args:
+            spread_bps: Quoted bid-ask spread in bps (a market order crosses half of it).
+            impact_coefficient: Square-root impact coefficient (order of 0.1 - 1.0).
+            adv_window: Trailing bars for average daily volume.
+            volatility_window: Trailing bars for daily return volatility.
+            commission: Commission schedule (default: none).
+            default_volatility: Daily volatility used before enough history exists.
+        """
+        self.spread_bps = spread_bps
+        self.impact_coefficient = impact_coefficient
+        self.adv_window = adv_window
+        self.volatility_window = volatility_window
+        self.commission = commission or CommissionSchedule()
+        self.default_volatility = default_volatility
+        self.half_spread: Optional[pd.DataFrame] = None
+        self.impact_scale: Optional[pd.DataFrame] = None
+
+    def prepare(self, data: Dict[str, pd.DataFrame]) -> "TransactionCostModel":
+        """
+        Precomputes (dates x tickers) half-spread and impact-scale frames for a universe.
+        """
+        close = pd.DataFrame({t: df['Close'] for t, df in data.items()})
+        volume = pd.DataFrame({t: df['Volume'] for t, df in data.items()})
+
+        # Trailing ADV (zero-volume bars count as missing), lagged one bar
+        adv = volume.where(volume > 0).rolling(self.adv_window, min_periods=1).mean().shift(1)
+        adv = adv.fillna(adv.median())
+
+        returns = np.log(close.where(close > 0)).diff()
+        sigma = returns.rolling(self.volatility_window, min_periods=5).std().shift(1)
+        sigma = sigma.fillna(self.default_volatility)
+
+        self.impact_scale = self.impact_coefficient * sigma / np.sqrt(adv)
+        # No volume history at all: no impact estimate rather than an infinite one
+        self.impact_scale = self.impact_scale.fillna(0.0)
+        self.half_spread = pd.DataFrame(self.spread_bps / 2.0 / 10000.0, index=close.index, columns=close.columns)
+        return self
+
+    def unit_costs(self, half_spread, impact_scale, price, shares):
+        """
+        Per-share spread and impact cost in currency, vectorized: arrays of half spreads
+        and impact scales (e.g. rows of half_spread / impact_scale), prices and shares
+        are broadcast together.
+
+        Returns:
+            (spread, impact) per share.
+        """
+        shares = np.abs(shares)
+        return half_spread * price, impact_scale * np.sqrt(shares) * price
+
+    def execution_price(self, ticker: str, date, price: float, shares: float, side: int) -> float:
+        """
+        Price paid (side=1) or received (side=-1) per share for one fill, before commission.
+        """
+        half_spread = self.half_spread.at[date, ticker] if self.half_spread is not None else self.spread_bps / 2.0 / 10000.0
+        impact_scale = self.impact_scale.at[date, ticker] if self.impact_scale is not None else 0.0
+        spread, impact = self.unit_costs(half_spread, impact_scale, price, shares)
+        return price + side * (spread + impact)
+
+    def commission_for(self, shares: float, price: float) -> float:
+        return float(self.commission.compute(shares, shares * price))
+
+    def compute_costs(self, fills: pd.DataFrame) -> pd.DataFrame:
+        """
+        Prices every fill of a run in one vectorized pass.
+
+        Args:
+            fills: DataFrame with 'Date', 'Ticker', 'Side' (+1/-1), 'Quantity' and 'Price'
+                   (reference price before costs) columns.
+
+        Returns:
+            fills with 'Notional', 'Spread Cost', 'Impact Cost', 'Commission' and
+            'Total Cost' columns (currency, positive = cost) added.
+        """
+        if self.half_spread is None:
+            raise ValueError("Call prepare(data) before compute_costs().")
+        fills = fills.copy()
+        key = pd.MultiIndex.from_arrays([fills['Date'], fills['Ticker']])
+        half_spread = self.half_spread.stack().reindex(key).fillna(self.spread_bps / 2.0 / 10000.0).values
+        impact_scale = self.impact_scale.stack().reindex(key).fillna(0.0).values
+
+        qty = fills['Quantity'].abs().values.astype(float)
+        price = fills['Price'].values.astype(float)
+        spread, impact = self.unit_costs(half_spread, impact_scale, price, qty)
+
+        fills['Notional'] = qty * price
+        fills['Spread Cost'] = spread * qty
+        fills['Impact Cost'] = impact * qty
+        fills['Commission'] = self.commission.compute(qty, qty * price)
+        fills['Total Cost'] = fills[self.COMPONENTS].sum(axis=1)
+        return fills
+
+    def tca_report(self, fills: pd.DataFrame) -> pd.DataFrame:
+        """
+        Transaction-cost analysis: cost components per ticker (currency and bps of notional)
+        with a portfolio 'Total' row.
+
+        Any extra component columns already present on the fills (e.g. 'Latency Cost'
+        recorded by the engine) are reported alongside the model's components.
+        """
+        if not {'Spread Cost', 'Impact Cost', 'Commission'}.issubset(fills.columns):
+            fills = self.compute_costs(fills)
+        components = self.COMPONENTS + [c for c in fills.columns if c.endswith(' Cost') and c not in self.COMPONENTS + ['Total Cost']]
+        fills = fills.assign(**{'Total Cost': fills[components].sum(axis=1)})
+
+        grouped = fills.groupby('Ticker')
+        report = grouped[components + ['Total Cost', 'Notional']].sum()
+        report.insert(0, 'Trades', grouped.size())
+        report.insert(1, 'Shares', grouped['Quantity'].apply(lambda q: q.abs().sum()))
+        report.loc['Total'] = report.sum()
+
+        notional = report['Notional'].replace(0, np.nan)
+        for col in components + ['Total Cost']:
+            report[f"{col} (bps)"] = report[col] / notional * 10000.0
+        return report
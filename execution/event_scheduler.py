@@ -0,0 +1,382 @@
+import heapq
+import time
+from enum import IntEnum
+from itertools import count
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from execution.latency_model import LatencyModel
+from execution.matching_engine import BUY, SELL, SIDES, MatchingEngine
+
+
+class EventType(IntEnum):
+    ORDER_SEND = 0        # strategy hands an order to the gateway
+    EXCHANGE_ARRIVAL = 1  # order reaches the matching engine
+    ACK = 2               # exchange acknowledgement reaches the strategy
+    FILL = 3              # fill report reaches the strategy
+    CANCEL_SEND = 4
+    CANCEL_ARRIVAL = 5
+    CANCEL_ACK = 6
+    MARKET_ORDER = 7      # other participants' order flow, already at the exchange
+    TIMER = 8
+
+
+def to_us(timestamp) -> int:
+    """Microseconds since the epoch for a pandas/NumPy timestamp."""
+    return pd.Timestamp(timestamp).value // 1000
+
+
+_STREAM = -1  # internal kind for events pulled from add_stream() sources
+_event_time = itemgetter(0)
+
+
+class EventScheduler:
+    """
+    Discrete-event scheduler with a monotonic integer microsecond clock.
+
+    Events are (time_us, kind, payload) tuples and same-time events run in scheduling
+    order (deterministic replays). Handlers are registered per integer event kind and
+    called as handler(time_us, payload).
+
+    The queue is a calendar queue: events are appended to time buckets of 2**bucket_shift
+    microseconds, a small heap orders the bucket ids, and each bucket is sorted by time
+    once (stable, in C) when the clock reaches it. Scheduling is an append and popping is
+    an index increment, which is several times cheaper than one binary heap of tuples.
+    Events scheduled into (or before) the bucket currently being processed go to a small
+    'near' heap (with a sequence number for FIFO ties) that is merged on the fly;
+    everything in the bucket itself was scheduled earlier, so it wins ties against the
+    near heap.
+
+    Long replays should be fed through add_stream(): a stream contributes only its next
+    event to the queue, so memory stays bounded by the number of streams and in-flight
+    events rather than by the length of the replay.
+    """
+    def __init__(self, start_us: int = 0, bucket_shift: int = 12):
+        """
+        Args:
+            start_us: Initial clock value.
+            bucket_shift: log2 of the bucket width in microseconds (12 -> ~4ms buckets).
+        """
+        self.now_us = start_us
+        self.events_processed = 0
+        self.bucket_shift = bucket_shift
+        self._buckets: Dict[int, list] = {}
+        self._bucket_ids: List[int] = []  # min-heap of pending bucket ids
+        self._current: list = []          # sorted events of the bucket being processed
+        self._current_id = -1
+        self._pos = 0
+        self._near: List[tuple] = []      # heap of (time_us, seq, event) in the current bucket
+        self._seq = count()
+        self._handlers: Dict[int, Callable] = {_STREAM: self._dispatch_stream}
+
+    def __len__(self) -> int:
+        return len(self._current) - self._pos + len(self._near) + sum(map(len, self._buckets.values()))
+
+    def register(self, kind: int, handler: Callable[[int, object], None]):
+        self._handlers[int(kind)] = handler
+
+    def schedule(self, time_us: int, kind: int, payload=None):
+        if time_us < self.now_us:
+            raise ValueError(f"Cannot schedule in the past: {time_us} < {self.now_us}")
+        bucket_id = time_us >> self.bucket_shift
+        try:
+            self._buckets[bucket_id].append((time_us, kind, payload))
+        except KeyError:
+            # A bucket at or before the loaded one (e.g. left loaded by run(until_us)) has
+            # already been popped: merge through the near heap so time order holds
+            if bucket_id <= self._current_id:
+                heapq.heappush(self._near, (time_us, next(self._seq), (time_us, kind, payload)))
+            else:
+                self._buckets[bucket_id] = [(time_us, kind, payload)]
+                heapq.heappush(self._bucket_ids, bucket_id)
+
+    def schedule_in(self, delay_us: int, kind: int, payload=None):
+        time_us = self.now_us + (delay_us if delay_us > 0 else 0)
+        bucket_id = time_us >> self.bucket_shift
+        try:
+            self._buckets[bucket_id].append((time_us, kind, payload))
+        except KeyError:
+            self.schedule(time_us, kind, payload)
+
+    def schedule_many(self, times_us: Iterable[int], kind: int, payloads: Iterable):
+        schedule = self.schedule
+        for t, payload in zip(times_us, payloads):
+            schedule(int(t), kind, payload)
+
+    def add_stream(self, events: Iterable[Tuple[int, int, object]]):
+        """
+        Lazily merges a time-ordered iterable of (time_us, kind, payload) into the schedule.
+        """
+        self._push_next(iter(events))
+
+    def _push_next(self, source: Iterator):
+        nxt = next(source, None)
+        if nxt is not None:
+            time_us, kind, payload = nxt
+            self.schedule(time_us, _STREAM, (source, kind, payload))
+
+    def _dispatch_stream(self, time_us: int, item):
+        source, kind, payload = item
+        self._handlers[kind](time_us, payload)
+        self._push_next(source)
+
+    def _next_bucket(self) -> bool:
+        """
+        Makes the earliest pending bucket current. Returns False if the queue is empty.
+        """
+        if not self._bucket_ids:
+            return False
+        bucket_id = heapq.heappop(self._bucket_ids)
+        self._current = self._buckets.pop(bucket_id)
+        self._current.sort(key=_event_time)
+        self._current_id = bucket_id
+        self._pos = 0
+        return True
+
+    def run(self, until_us: Optional[int] = None, max_events: Optional[int] = None) -> int:
+        """
+        Processes events in time order until the queue is empty, the clock would pass
+        until_us, or max_events have run. Returns the number of events processed.
+        """
+        handlers, near = self._handlers, self._near
+        heappop = heapq.heappop
+        limit = float('inf') if until_us is None else until_us
+        budget = -1 if max_events is None else max_events
+        current, pos = self._current, self._pos
+        end = len(current)
+        n = 0
+        while n != budget:
+            # Next event: the earlier of the current bucket's head and the near heap's head
+            if pos < end:
+                event = current[pos]
+                from_near = bool(near) and near[0][0] < event[0]
+                if from_near:
+                    event = near[0][2]
+            elif near:
+                event = near[0][2]
+                from_near = True
+            else:
+                self._pos = pos
+                if not self._next_bucket():
+                    break
+                current, pos = self._current, 0
+                end = len(current)
+                continue
+
+            time_us = event[0]
+            if time_us > limit:
+                break
+            if from_near:
+                heappop(near)
+            else:
+                pos += 1
+            self.now_us = time_us
+            handlers[event[1]](time_us, event[2])
+            n += 1
+        self._pos = pos
+        if until_us is not None and self.now_us < until_us and n != budget:
+            self.now_us = until_us
+        self.events_processed += n
+        return n
+
+
+class OrderLifecycleSimulator:
+    """
+    Event-driven order lifecycle against a MatchingEngine with real latency.
+
+    Strategy orders travel send -> (one-way latency) -> exchange arrival -> match ->
+    (latency) -> ack / fill reports, and cancels follow the same path. Background order
+    flow (MARKET_ORDER events) is applied at the exchange with no delay, so the book can
+    move while a strategy order is in flight: latency decides which fills happen, not
+    just the fill price.
+
+    Each one-way hop draws a latency from the LatencyModel (milliseconds, converted to
+    integer microseconds).
+    """
+    def __init__(self, matching_engine: Optional[MatchingEngine] = None,
+                 latency_model: Optional[LatencyModel] = None, start_us: int = 0):
+        self.engine = matching_engine or MatchingEngine()
+        self.latency_model = latency_model or LatencyModel()
+        self.scheduler = EventScheduler(start_us)
+        self.orders: Dict[object, Dict] = {}  # strategy order id -> lifecycle record
+        self.fills: List[Tuple[int, object, float, int]] = []  # (report time_us, order_id, price, qty)
+        self.callbacks: Dict[int, List[Callable]] = {}
+
+        s = self.scheduler
+        s.register(EventType.ORDER_SEND, self._on_send)
+        s.register(EventType.EXCHANGE_ARRIVAL, self._on_arrival)
+        s.register(EventType.ACK, self._on_ack)
+        s.register(EventType.FILL, self._on_fill)
+        s.register(EventType.CANCEL_SEND, self._on_cancel_send)
+        s.register(EventType.CANCEL_ARRIVAL, self._on_cancel_arrival)
+        s.register(EventType.CANCEL_ACK, self._on_cancel_ack)
+        s.register(EventType.MARKET_ORDER, self._on_market_order)
+        s.register(EventType.TIMER, self._on_timer)
+
+    @property
+    def now_us(self) -> int:
+        return self.scheduler.now_us
+
+    def _latency_us(self) -> int:
+        return int(self.latency_model.get_latency() * 1000.0)
+
+    def on(self, kind: int, callback: Callable[[int, object], None]):
+        """
+        Strategy hook called after the simulator handles an event of this kind
+        (ACK, FILL, CANCEL_ACK or TIMER).
+        """
+        self.callbacks.setdefault(int(kind), []).append(callback)
+
+    def _notify(self, kind: int, time_us: int, payload):
+        for callback in self.callbacks.get(kind, ()):
+            callback(time_us, payload)
+
+    # --- Strategy API ---
+    def send_order(self, order_id, side, price: Optional[float], quantity: int, time_in_force: str = 'GTC',
+                   time_us: Optional[int] = None):
+        """
+        Sends a strategy order at time_us (default: now). price=None sends a market order.
+        """
+        t = self.now_us if time_us is None else time_us
+        self.orders[order_id] = {'side': SIDES[side], 'price': price, 'quantity': quantity, 'tif': time_in_force,
+                                 'filled': 0, 'status': 'PENDING', 'sent_us': t}
+        self.scheduler.schedule(t, EventType.ORDER_SEND, order_id)
+
+    def cancel_order(self, order_id, time_us: Optional[int] = None):
+        self.scheduler.schedule(self.now_us if time_us is None else time_us, EventType.CANCEL_SEND, order_id)
+
+    def set_timer(self, time_us: int, payload=None):
+        self.scheduler.schedule(time_us, EventType.TIMER, payload)
+
+    def add_market_flow(self, events: Iterable[Tuple[int, tuple]]):
+        """
+        Background order flow as a time-ordered iterable of (time_us, message), where a
+        message is ('limit', order_id, side, price, qty), ('market', order_id, side, qty)
+        or ('cancel', order_id). Streamed lazily, so multi-day replays need not fit in memory.
+        """
+        self.scheduler.add_stream((t, EventType.MARKET_ORDER, msg) for t, msg in events)
+
+    def run(self, until_us: Optional[int] = None, max_events: Optional[int] = None) -> int:
+        return self.scheduler.run(until_us, max_events)
+
+    # --- Handlers ---
+    def _on_send(self, t: int, order_id):
+        self.scheduler.schedule(t + self._latency_us(), EventType.EXCHANGE_ARRIVAL, order_id)
+
+    def _on_arrival(self, t: int, order_id):
+        order = self.orders[order_id]
+        order['arrival_us'] = t
+        if order['price'] is None:
+            trades = self.engine.submit_market(order_id, order['side'], order['quantity'])
+        else:
+            trades = self.engine.submit_limit(order_id, order['side'], order['price'], order['quantity'], order['tif'])
+        self.scheduler.schedule(t + self._latency_us(), EventType.ACK, order_id)
+        self._report_trades(t, trades)
+
+    def _report_trades(self, t: int, trades):
+        orders = self.orders
+        for trade in trades:
+            for order_id in (trade.maker_id, trade.taker_id):
+                if order_id in orders:
+                    self.scheduler.schedule(t + self._latency_us(), EventType.FILL, (order_id, trade.price, trade.quantity))
+
+    def _on_ack(self, t: int, order_id):
+        order = self.orders[order_id]
+        order['ack_us'] = t
+        if order['status'] == 'PENDING':
+            order['status'] = 'OPEN' if order_id in self.engine else 'DONE'
+        self._notify(EventType.ACK, t, order_id)
+
+    def _on_fill(self, t: int, fill):
+        order_id, price, qty = fill
+        order = self.orders[order_id]
+        order['filled'] += qty
+        if order['filled'] >= order['quantity']:
+            order['status'] = 'FILLED'
+        self.fills.append((t, order_id, price, qty))
+        self._notify(EventType.FILL, t, fill)
+
+    def _on_cancel_send(self, t: int, order_id):
+        self.scheduler.schedule(t + self._latency_us(), EventType.CANCEL_ARRIVAL, order_id)
+
+    def _on_cancel_arrival(self, t: int, order_id):
+        cancelled = self.engine.cancel(order_id)
+        self.scheduler.schedule(t + self._latency_us(), EventType.CANCEL_ACK, (order_id, cancelled))
+
+    def _on_cancel_ack(self, t: int, result):
+        order_id, cancelled = result
+        if cancelled:
+            self.orders[order_id]['status'] = 'CANCELLED'
+        self._notify(EventType.CANCEL_ACK, t, result)
+
+    def _on_market_order(self, t: int, msg):
+        kind = msg[0]
+        if kind == 'limit':
+            self._report_trades(t, self.engine.submit_limit(*msg[1:]))
+        elif kind == 'market':
+            self._report_trades(t, self.engine.submit_market(*msg[1:]))
+        else:
+            self.engine.cancel(msg[1])
+
+    def _on_timer(self, t: int, payload):
+        self._notify(EventType.TIMER, t, payload)
+
+    def fills_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.fills, columns=['Time (us)', 'Order ID', 'Price', 'Quantity'])
+
+
+def benchmark_event_scheduler(n_events: int = 2_000_000, pending: int = 10_000, seed: int = 42) -> Dict[str, float]:
+    """
+    Classic 'hold' benchmark: keeps `pending` events in the heap, and every processed event
+    schedules one successor at a random future time, so the heap size stays constant.
+
+    Returns:
+        Dict with events processed, seconds and events/sec.
+    """
+    rng = np.random.default_rng(seed)
+    delays = rng.integers(1, 1_000_000, size=n_events + pending).tolist()
+    scheduler = EventScheduler()
+    remaining = [n_events - pending]
+    schedule_in = scheduler.schedule_in
+    next_delay = iter(delays[pending:]).__next__
+
+    def handler(t, payload):
+        if remaining[0] > 0:
+            remaining[0] -= 1
+            schedule_in(next_delay(), 0)
+
+    scheduler.register(0, handler)
+    scheduler.schedule_many(delays[:pending], 0, [None] * pending)
+
+    start = time.perf_counter()
+    processed = scheduler.run()
+    elapsed = time.perf_counter() - start
+    return {"Events": processed, "Seconds": elapsed, "Events/sec": processed / elapsed}
+
+
+def benchmark_order_lifecycle(n_messages: int = 200_000, strategy_every: int = 20, seed: int = 42) -> Dict[str, float]:
+    """
+    Replays synthetic background flow (one message every 100us) through an
+    OrderLifecycleSimulator while a strategy sends an IOC-style limit order every
+    `strategy_every` messages, and reports simulated-event throughput.
+    """
+    rng = np.random.default_rng(seed)
+    sides = np.where(rng.random(n_messages) < 0.5, BUY, SELL).tolist()
+    offsets = rng.integers(-10, 11, size=n_messages).tolist()
+    quantities = (rng.integers(1, 10, size=n_messages) * 100).tolist()
+
+    def flow():
+        for i in range(n_messages):
+            side = sides[i]
+            yield i * 100, ('limit', ('mkt', i), side, 100.0 - side * 0.01 * abs(offsets[i]), quantities[i])
+
+    sim = OrderLifecycleSimulator(latency_model=LatencyModel(mean_latency_ms=0.5, std_latency_ms=0.1, seed=seed))
+    sim.add_market_flow(flow())
+    for i in range(0, n_messages, strategy_every):
+        sim.send_order(('strat', i), sides[i], 100.0 + sides[i] * 0.02, 100, time_in_force='IOC', time_us=i * 100)
+
+    start = time.perf_counter()
+    processed = sim.run()
+    elapsed = time.perf_counter() - start
+    return {"Events": processed, "Fills": len(sim.fills), "Seconds": elapsed, "Events/sec": processed / elapsed}
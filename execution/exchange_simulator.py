@@ -0,0 +1,209 @@
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+from execution.matching_engine import MatchingEngine
+
+# Wire protocol: newline-delimited JSON over TCP.
+#   client -> exchange  {"type": "new", "id": str, "symbol": str, "side": "BUY"|"SELL",
+#                        "qty": int, "price": float|null, "tif": "GTC"|"IOC"}
+#                       {"type": "cancel", "id": str}
+#                       {"type": "ping"}
+#   exchange -> client  {"type": "ack", "id": str, "status": "accepted"|"rejected"|"duplicate",
+#                        "reason": str?, "expired_qty": int?, "ts_us": int}
+#                       (expired_qty: the unfilled remainder of an IOC / market order; a
+#                       duplicate ack repeats the original ack's fields)
+#                       {"type": "fill", "id": str, "price": float, "qty": int, "ts_us": int}
+#                       {"type": "cancel_ack", "id": str, "cancelled": bool, "ts_us": int}
+#                       {"type": "pong", "ts_us": int}
+
+
+def _now_us() -> int:
+    return time.time_ns() // 1000
+
+
+class ExchangeSimulator:
+    """
+    Local exchange for paper trading: one price-time MatchingEngine per symbol behind an
+    asyncio TCP server.
+
+    A synthetic market maker keeps `levels` price levels of `level_size` on each side around
+    a reference mid (`mids[symbol]`, default `default_mid`), replenishing after every match,
+    so client orders always have liquidity to trade against. Order ids are idempotent: a
+    resent id (e.g. after a reconnect) is acknowledged as 'duplicate' and not re-entered.
+    """
+    def __init__(self, host: str = '127.0.0.1', port: int = 9100, mids: Optional[Dict[str, float]] = None,
+                 default_mid: float = 100.0, tick_size: float = 0.01, levels: int = 5, level_size: int = 1000,
+                 processing_delay_us: int = 0):
+        """
+        Args:
+            host, port: Listen address (port 0 picks a free port).
+            mids: Reference mid price per symbol.
+            default_mid: Mid for symbols not in mids.
+            tick_size: Price increment.
+            levels: Market-maker levels per side.
+            level_size: Market-maker size per level.
+            processing_delay_us: Artificial per-message matching delay.
+        """
+        self.host = host
+        self.port = port
+        self.mids = dict(mids or {})
+        self.default_mid = default_mid
+        self.tick_size = tick_size
+        self.levels = levels
+        self.level_size = level_size
+        self.processing_delay_us = processing_delay_us
+        self.engines: Dict[str, MatchingEngine] = {}
+        self.owners: Dict[str, asyncio.StreamWriter] = {}  # client order id -> connection
+        self.acks: Dict[str, Dict] = {}  # client order id -> original ack, repeated on duplicates
+        self.messages = 0
+        self._mm_seq = 0
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    def _engine(self, symbol: str) -> MatchingEngine:
+        engine = self.engines.get(symbol)
+        if engine is None:
+            engine = self.engines[symbol] = MatchingEngine(self.tick_size)
+            self._replenish(symbol, engine)
+        return engine
+
+    def _replenish(self, symbol: str, engine: MatchingEngine):
+        """Tops the market maker's ladder back up to `levels` on each side."""
+        mid = self.mids.get(symbol, self.default_mid)
+        book = engine.depth(self.levels)
+        for side, sign, quoted in (('BUY', -1, book['bids']), ('SELL', 1, book['asks'])):
+            have = {engine.to_ticks(p) for p, _ in quoted}
+            for level in range(1, self.levels + 1):
+                price = mid + sign * level * self.tick_size
+                if engine.to_ticks(price) not in have:
+                    self._mm_seq += 1
+                    engine.submit_limit(f"mm-{self._mm_seq}", side, price, self.level_size)
+
+    def _handle(self, msg: Dict, writer: asyncio.StreamWriter) -> List[Dict]:
+        kind = msg.get('type')
+        ts = _now_us()
+        if kind == 'ping':
+            return [{'type': 'pong', 'ts_us': ts}]
+        if kind == 'cancel':
+            order_id = msg['id']
+            engine = self.engines.get(msg.get('symbol', ''))
+            cancelled = any(e.cancel(order_id) for e in ([engine] if engine else self.engines.values()))
+            return [{'type': 'cancel_ack', 'id': order_id, 'cancelled': cancelled, 'ts_us': ts}]
+        if kind != 'new':
+            return [{'type': 'error', 'reason': f"unknown message type {kind!r}", 'ts_us': ts}]
+
+        order_id = msg['id']
+        if order_id in self.acks:
+            # The client may have lost the original ack: repeat it (expired_qty included)
+            return [dict(self.acks[order_id], status='duplicate', ts_us=ts)]
+        qty = int(msg.get('qty', 0))
+        if qty <= 0 or msg.get('side') not in ('BUY', 'SELL'):
+            return [{'type': 'ack', 'id': order_id, 'status': 'rejected', 'reason': 'invalid order', 'ts_us': ts}]
+        self.owners[order_id] = writer
+
+        engine = self._engine(msg['symbol'])
+        if msg.get('price') is None:
+            trades = engine.submit_market(order_id, msg['side'], qty)
+        else:
+            trades = engine.submit_limit(order_id, msg['side'], float(msg['price']), qty, msg.get('tif', 'GTC'))
+
+        out = [{'type': 'ack', 'id': order_id, 'status': 'accepted', 'ts_us': ts}]
+        if msg.get('price') is None or msg.get('tif') == 'IOC':
+            out[0]['expired_qty'] = qty - sum(trade.quantity for trade in trades)
+        self.acks[order_id] = out[0]
+        for trade in trades:
+            # The taker is this client; a resting client order may be the maker
+            out.append({'type': 'fill', 'id': order_id, 'price': trade.price, 'qty': trade.quantity, 'ts_us': ts})
+            maker_writer = self.owners.get(trade.maker_id)
+            if maker_writer is not None:
+                self._send(maker_writer, [{'type': 'fill', 'id': trade.maker_id, 'price': trade.price,
+                                           'qty': trade.quantity, 'ts_us': ts}])
+        if trades:
+            self._replenish(msg['symbol'], engine)
+        return out
+
+    @staticmethod
+    def _send(writer: asyncio.StreamWriter, messages: List[Dict]):
+        if not writer.is_closing():
+            writer.write(b''.join(json.dumps(m).encode() + b'\n' for m in messages))
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        pending = b''
+        try:
+            while True:
+                data = await reader.read(1 << 16)
+                if not data:
+                    break
+                # Everything that arrived together (e.g. a client batch) is answered in one write
+                *lines, pending = (pending + data).split(b'\n')
+                lines = [line for line in lines if line]
+                self.messages += len(lines)
+                if self.processing_delay_us:
+                    await asyncio.sleep(self.processing_delay_us * len(lines) / 1e6)
+                out = []
+                for line in lines:
+                    out.extend(self._handle(json.loads(line), writer))
+                self._send(writer, out)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"Exchange simulator listening on {self.host}:{self.port}", flush=True)
+        async with self._server:
+            await self._server.serve_forever()
+
+
+def start_exchange_process(port: int = 9100, host: str = '127.0.0.1', startup_timeout: float = 10.0,
+                           extra_args: Optional[List[str]] = None) -> subprocess.Popen:
+    """
+    Launches the simulator as a separate process and waits until it is listening.
+    """
+    process = subprocess.Popen([sys.executable, '-m', 'execution.exchange_simulator', '--host', host,
+                                '--port', str(port)] + list(extra_args or []),
+                               stdout=subprocess.PIPE, text=True)
+    deadline = time.time() + startup_timeout
+    while time.time() < deadline:
+        line = process.stdout.readline()
+        if 'listening' in line:
+            return process
+        if process.poll() is not None:
+            break
+    process.kill()
+    raise RuntimeError("Exchange simulator failed to start.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local exchange simulator (newline-delimited JSON over TCP).")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9100)
+    parser.add_argument('--mid', type=float, default=100.0)
+    parser.add_argument('--levels', type=int, default=5)
+    parser.add_argument('--level-size', type=int, default=1000)
+    parser.add_argument('--processing-delay-us', type=int, default=0)
+    args = parser.parse_args()
+    exchange = ExchangeSimulator(args.host, args.port, default_mid=args.mid, levels=args.levels,
+                                 level_size=args.level_size, processing_delay_us=args.processing_delay_us)
+    try:
+        asyncio.run(exchange.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+import numpy as np
+from typing import Dict, Optional
+from execution.order import OrderStatus, OrderStore, Side, TimeInForce
+
+
+class FillSimulator:
+    """
+    Vectorized fill simulation of resting limit orders against OHLCV bars.
+
+    Batched counterpart of OrderBook.check_execution: every order is matched against its
+    whole lifetime of bars at once, in chunks of a (orders x bars) matrix, with no Python
+    loop over orders.
+
+    Queue models (whether touching the limit price is enough to fill):
+        'touch':         fill as soon as the bar trades at the limit (optimistic, same as
+                         OrderBook.check_execution)
+        'trade_through': the bar must trade strictly through the limit (back of the queue)
+        'probabilistic': trade-through always fills; a touch fills with touch_fill_probability
+
+    Partial fills: with participation_rate set, each bar fills at most that fraction of the
+    bar's volume, and an order accumulates fills across bars until done or expired.
+    """
+    def __init__(self, queue_model: str = 'touch', touch_fill_probability: float = 0.5,
+                 participation_rate: Optional[float] = None, seed: Optional[int] = None, max_cells: int = 4_000_000):
+        """
+        Args:
+            queue_model: 'touch', 'trade_through' or 'probabilistic'.
+            touch_fill_probability: Fill probability on an exact touch ('probabilistic').
+            participation_rate: Max share of bar volume an order can take (None = unlimited).
+            seed: Seed for the probabilistic queue model.
+            max_cells: Upper bound on the (orders x bars) working matrix per chunk.
+        """
+        if queue_model not in ('touch', 'trade_through', 'probabilistic'):
+            raise ValueError(f"Unknown queue model: {queue_model}")
+        if participation_rate is not None and not 0 < participation_rate <= 1:
+            raise ValueError("participation_rate must be in (0, 1].")
+        self.queue_model = queue_model
+        self.touch_fill_probability = touch_fill_probability
+        self.participation_rate = participation_rate
+        self.rng = np.random.default_rng(seed)
+        self.max_cells = max_cells
+
+    @staticmethod
+    def lifetime_from_tif(time_in_force: np.ndarray, n_bars: int) -> np.ndarray:
+        """
+        Bars an order stays live: DAY/IOC orders get one bar, GTC orders run to the end.
+        """
+        time_in_force = np.asarray(time_in_force)
+        return np.where(time_in_force == TimeInForce.GTC, n_bars, 1)
+
+    def simulate(self, prices: np.ndarray, sides: np.ndarray, quantities: np.ndarray, submit_bars: np.ndarray,
+                 high: np.ndarray, low: np.ndarray, open_: Optional[np.ndarray] = None, volume: Optional[np.ndarray] = None,
+                 symbols: Optional[np.ndarray] = None, lifetimes: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Args:
+            prices, sides, quantities: Per-order limit price, Side (+1/-1) and size.
+            submit_bars: First bar (row index) on which each order is live.
+            high, low, open_, volume: Bar arrays of shape (T,) or (T, n_symbols) (volume is
+                                      required with a participation_rate).
+            symbols: Column index into the bar arrays per order (default 0).
+            lifetimes: Bars each order stays live (default: until the last bar).
+
+        Returns:
+            Dict of per-order arrays:
+                'filled':          True if any quantity filled
+                'fill_bar':        first bar with a fill (-1 if none)
+                'complete_bar':    bar on which the order became fully filled (-1 if never)
+                'filled_quantity': total filled quantity
+                'fill_price':      volume-weighted fill price (NaN if none); the open if the
+                                   bar gaps through the limit, else the limit price
+        """
+        if self.participation_rate is not None and volume is None:
+            raise ValueError("participation_rate needs bar volume: pass volume (e.g. a 'Volume' column).")
+        high = np.asarray(high, dtype=float)
+        low = np.asarray(low, dtype=float)
+        if high.ndim == 1:
+            high, low = high[:, None], low[:, None]
+            open_ = None if open_ is None else np.asarray(open_, dtype=float)[:, None]
+            volume = None if volume is None else np.asarray(volume, dtype=float)[:, None]
+        T = high.shape[0]
+
+        prices = np.asarray(prices, dtype=float)
+        n = len(prices)
+        sides = np.broadcast_to(np.asarray(sides), n)
+        quantities = np.broadcast_to(np.asarray(quantities, dtype=float), n)
+        submit_bars = np.broadcast_to(np.asarray(submit_bars, dtype=np.int64), n)
+        symbols = np.zeros(n, dtype=np.int64) if symbols is None else np.broadcast_to(np.asarray(symbols, dtype=np.int64), n)
+        lifetimes = np.full(n, T, dtype=np.int64) if lifetimes is None else np.broadcast_to(np.asarray(lifetimes, dtype=np.int64), n)
+        end_bars = np.minimum(submit_bars + lifetimes, T)
+
+        result = {
+            'filled': np.zeros(n, dtype=bool),
+            'fill_bar': np.full(n, -1, dtype=np.int64),
+            'complete_bar': np.full(n, -1, dtype=np.int64),
+            'filled_quantity': np.zeros(n),
+            'fill_price': np.full(n, np.nan),
+        }
+
+        # Orders with the same lifetime share a window length; chunk each group so the
+        # (orders x window) matrix stays within the cell budget
+        windows = np.clip(lifetimes, 1, T)
+        for window in np.unique(windows):
+            group = np.flatnonzero(windows == window)
+            rows_per_chunk = max(1, self.max_cells // int(window))
+            for start in range(0, len(group), rows_per_chunk):
+                self._simulate_chunk(group[start:start + rows_per_chunk], int(window), prices, sides, quantities,
+                                     submit_bars, end_bars, symbols, high, low, open_, volume, result)
+        return result
+
+    def _simulate_chunk(self, idx, window, prices, sides, quantities, submit_bars, end_bars, symbols,
+                        high, low, open_, volume, result):
+        bars = submit_bars[idx, None] + np.arange(window)[None, :]
+        live = bars < end_bars[idx, None]
+        bars = np.minimum(bars, high.shape[0] - 1)
+        cols = symbols[idx, None]
+
+        price = prices[idx, None]
+        is_buy = (sides[idx] == Side.BUY)[:, None]
+        bar_low, bar_high = low[bars, cols], high[bars, cols]
+
+        # 1. Touch / trade-through per (order, bar)
+        touched = np.where(is_buy, bar_low <= price, bar_high >= price)
+        through = np.where(is_buy, bar_low < price, bar_high > price)
+        if self.queue_model == 'touch':
+            eligible = touched
+        elif self.queue_model == 'trade_through':
+            eligible = through
+        else:
+            lucky = self.rng.random(touched.shape) < self.touch_fill_probability
+            eligible = through | (touched & lucky)
+        eligible &= live
+
+        # 2. Quantity filled per bar (participation cap, accumulated until done)
+        qty = quantities[idx, None]
+        if self.participation_rate is None:
+            capacity = np.where(eligible, np.inf, 0.0)
+        else:
+            capacity = np.where(eligible, self.participation_rate * volume[bars, cols], 0.0)
+        cumulative = np.minimum(np.cumsum(capacity, axis=1), qty)
+        per_bar = np.diff(cumulative, axis=1, prepend=0.0)
+
+        # 3. Fill price: price improvement if the bar opens through the limit
+        fill_px = np.broadcast_to(price, per_bar.shape)
+        if open_ is not None:
+            bar_open = open_[bars, cols]
+            gapped = np.where(is_buy, bar_open < price, bar_open > price)
+            fill_px = np.where(gapped, bar_open, fill_px)
+
+        filled_qty = cumulative[:, -1]
+        any_fill = filled_qty > 0
+        first = np.argmax(per_bar > 0, axis=1)
+        complete = cumulative >= qty
+        first_complete = np.argmax(complete, axis=1)
+
+        result['filled'][idx] = any_fill
+        result['filled_quantity'][idx] = filled_qty
+        result['fill_bar'][idx] = np.where(any_fill, submit_bars[idx] + first, -1)
+        result['complete_bar'][idx] = np.where(complete.any(axis=1), submit_bars[idx] + first_complete, -1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            vwap = (per_bar * fill_px).sum(axis=1) / filled_qty
+        result['fill_price'][idx] = np.where(any_fill, vwap, np.nan)
+
+    def simulate_store(self, store: OrderStore, order_ids: np.ndarray, tick_size: float, submit_bars: np.ndarray,
+                       high: np.ndarray, low: np.ndarray, open_: Optional[np.ndarray] = None,
+                       volume: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Runs simulate() for orders held in an OrderStore and writes fills and statuses back.
+        Lifetimes come from each order's time in force; unfilled DAY/IOC orders are cancelled.
+        """
+        order_ids = np.asarray(order_ids)
+        T = np.asarray(high).shape[0]
+        remaining = store.remaining(order_ids)
+        result = self.simulate(
+            prices=store.price_ticks[order_ids] * tick_size,
+            sides=store.side[order_ids],
+            quantities=remaining,
+            submit_bars=submit_bars,
+            high=high, low=low, open_=open_, volume=volume,
+            symbols=store.symbol_id[order_ids],
+            lifetimes=self.lifetime_from_tif(store.time_in_force[order_ids], T),
+        )
+        fill_qty = np.floor(result['filled_quantity']).astype(np.int64)
+        has_fill = fill_qty > 0
+        store.record_fills(order_ids[has_fill], fill_qty[has_fill])
+        expired = (fill_qty < remaining) & (store.time_in_force[order_ids] != TimeInForce.GTC)
+        store.update_status(order_ids[expired], OrderStatus.CANCELLED)
+        return result
@@ -0,0 +1,439 @@
+import asyncio
+import itertools
+import json
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from risk.manager import RiskManager
+
+
+@dataclass
+class OrderRequest:
+    """
+    One order produced from a strategy signal, as seen by risk checks and venue adapters.
+    """
+    order_id: str
+    symbol: str
+    side: str                      # 'BUY' or 'SELL'
+    quantity: int
+    price: Optional[float] = None  # None = market order
+    time_in_force: str = 'GTC'
+    signal_ns: int = 0             # perf_counter_ns when the signal entered the gateway
+    status: str = 'NEW'            # NEW -> SENT -> ACKED / REJECTED, FILLED / CANCELLED
+    filled: int = 0
+    reject_reason: Optional[str] = None
+    ack: Optional[asyncio.Future] = field(default=None, repr=False)
+
+    def to_message(self) -> Dict:
+        return {'type': 'new', 'id': self.order_id, 'symbol': self.symbol, 'side': self.side,
+                'qty': self.quantity, 'price': self.price, 'tif': self.time_in_force}
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram (microsecond resolution, ~4% relative bucket width), so
+    recording is O(log buckets) and memory is fixed regardless of sample count.
+    """
+    def __init__(self, max_us: float = 60_000_000, buckets_per_doubling: int = 16):
+        n = int(np.ceil(np.log2(max_us) * buckets_per_doubling)) + 1
+        self.bounds = np.concatenate([[0.0], 2.0 ** (np.arange(n) / buckets_per_doubling)]).tolist()
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total_us = 0.0
+        self.max_us = 0.0
+
+    def record(self, latency_ns: int):
+        us = latency_ns / 1000.0
+        self.counts[bisect_right(self.bounds, us)] += 1
+        self.count += 1
+        self.total_us += us
+        if us > self.max_us:
+            self.max_us = us
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket containing the q-th percentile (microseconds)."""
+        if self.count == 0:
+            return float('nan')
+        rank = q / 100.0 * self.count
+        cumulative = np.cumsum(self.counts)
+        i = int(np.searchsorted(cumulative, rank))
+        return min(self.bounds[i] if i < len(self.bounds) else self.max_us, self.max_us)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'Count': self.count,
+            'Mean (us)': self.total_us / self.count if self.count else float('nan'),
+            'p50 (us)': self.percentile(50),
+            'p90 (us)': self.percentile(90),
+            'p99 (us)': self.percentile(99),
+            'p99.9 (us)': self.percentile(99.9),
+            'Max (us)': self.max_us,
+        }
+
+
+class VenueAdapter(ABC):
+    """
+    Transport to a trading venue. send() writes a batch of protocol messages; receive()
+    returns the next venue message and raises ConnectionError when the link drops.
+    """
+    @abstractmethod
+    async def connect(self):
+        pass
+
+    @abstractmethod
+    async def send(self, messages: List[Dict]):
+        pass
+
+    @abstractmethod
+    async def receive(self) -> Dict:
+        pass
+
+    async def close(self):
+        pass
+
+
+class TcpJsonAdapter(VenueAdapter):
+    """
+    Newline-delimited JSON over TCP (the protocol of execution.exchange_simulator).
+    A batch is written with a single write + drain, so drain() applies socket backpressure.
+    """
+    def __init__(self, host: str = '127.0.0.1', port: int = 9100):
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+    async def send(self, messages: List[Dict]):
+        if self._writer is None or self._writer.is_closing():
+            raise ConnectionError("Not connected.")
+        self._writer.write(b''.join(json.dumps(m).encode() + b'\n' for m in messages))
+        await self._writer.drain()
+
+    async def receive(self) -> Dict:
+        if self._reader is None:
+            raise ConnectionError("Not connected.")
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("Venue closed the connection.")
+        return json.loads(line)
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+            self._writer = None
+
+
+class OrderGateway:
+    """
+    Asyncio order gateway: strategy signal -> pre-trade risk checks -> batched venue send.
+
+    - Backpressure: submit_signal() awaits while the outbound queue holds max_queue orders
+      or max_in_flight orders are awaiting their ack.
+    - Batching: the sender drains up to batch_size queued orders (optionally waiting up
+      to batch_interval_ms for more) into a single adapter write, so bursts are coalesced
+      while a lone order goes out at once.
+    - Reconnects: on a dropped link the gateway reconnects with exponential backoff and
+      resends every un-acked order; the venue treats order ids as idempotent.
+    - Latency: signal -> ack and signal -> first fill histograms, timed from the moment a
+      signal enters the gateway (risk checks included).
+    - Exposure: checks with a release(order, quantity=None) method (e.g. a
+      PreTradeRiskChecker) get back whatever will never fill: a venue reject, a local
+      reject by a later check, an IOC / market remainder and a cancelled order.
+    """
+    def __init__(self, adapter: VenueAdapter, risk_manager: Optional[RiskManager] = None,
+                 risk_checks: Optional[List[Callable[[OrderRequest], Optional[str]]]] = None,
+                 max_queue: int = 10_000, max_in_flight: int = 1_000, batch_size: int = 64,
+                 batch_interval_ms: float = 0.0, reconnect_delay_s: float = 0.05, max_reconnect_delay_s: float = 2.0):
+        """
+        Args:
+            adapter: Venue transport (e.g. TcpJsonAdapter to the exchange simulator).
+            risk_manager: Orders are rejected while its kill switch is active.
+            risk_checks: Callables returning a rejection reason, or None to pass.
+            max_queue: Outbound queue capacity.
+            max_in_flight: Max orders sent but not yet acknowledged.
+            batch_size: Max orders per venue write.
+            batch_interval_ms: Max wait to fill a batch once one order is queued (0 = send
+                               whatever is queued immediately, adding no latency).
+            reconnect_delay_s, max_reconnect_delay_s: Backoff bounds for reconnects.
+        """
+        self.adapter = adapter
+        self.risk_manager = risk_manager
+        self.risk_checks = list(risk_checks or [])
+        self.max_queue = max_queue
+        self.max_in_flight = max_in_flight
+        self.batch_size = batch_size
+        self.batch_interval_ms = batch_interval_ms
+        self.reconnect_delay_s = reconnect_delay_s
+        self.max_reconnect_delay_s = max_reconnect_delay_s
+
+        self.orders: Dict[str, OrderRequest] = {}
+        self.ack_latency = LatencyHistogram()
+        self.fill_latency = LatencyHistogram()
+        self.stats = {'signals': 0, 'risk_rejects': 0, 'sent': 0, 'acked': 0, 'venue_rejects': 0,
+                      'fills': 0, 'cancels': 0, 'batches': 0, 'reconnects': 0, 'resent': 0, 'max_queue_depth': 0}
+        self.on_fill: Optional[Callable[[OrderRequest, float, int], None]] = None
+        self._ids = itertools.count(1)
+        self._queue: Optional[asyncio.Queue] = None
+        self._in_flight: Optional[asyncio.Semaphore] = None
+        self._unacked: Dict[str, OrderRequest] = {}
+        self._connected: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._running = False
+
+    # --- Lifecycle ---
+    async def start(self):
+        self._queue = asyncio.Queue(self.max_queue)
+        self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        self._connected = asyncio.Event()
+        self._running = True
+        await self._connect()
+        self._tasks = [asyncio.create_task(self._sender()), asyncio.create_task(self._receiver())]
+
+    async def stop(self, timeout: float = 5.0):
+        """Waits (up to timeout) for queued and in-flight orders to be acknowledged, then closes."""
+        deadline = time.perf_counter() + timeout
+        while (not self._queue.empty() or self._unacked) and time.perf_counter() < deadline:
+            await asyncio.sleep(0.001)
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.adapter.close()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _connect(self):
+        delay = self.reconnect_delay_s
+        while True:
+            try:
+                await self.adapter.connect()
+                self._connected.set()
+                return
+            except OSError:
+                if not self._running:
+                    raise
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay_s)
+
+    async def _reconnect(self):
+        if not self._connected.is_set():
+            return  # another task is already reconnecting
+        self._connected.clear()
+        self.stats['reconnects'] += 1
+        await self.adapter.close()
+        await self._connect()
+        # Resend everything not yet acknowledged (the venue de-duplicates by order id)
+        pending = list(self._unacked.values())
+        if pending:
+            self.stats['resent'] += len(pending)
+            await self.adapter.send([o.to_message() for o in pending])
+
+    # --- Strategy API ---
+    async def submit_signal(self, symbol: str, side: str, quantity: int, price: Optional[float] = None,
+                            time_in_force: str = 'GTC') -> OrderRequest:
+        """
+        Turns a strategy signal into an order. Returns once the order is queued for the
+        venue (or rejected by risk); await `order.ack` for the venue acknowledgement.
+        """
+        signal_ns = time.perf_counter_ns()
+        self.stats['signals'] += 1
+        order = OrderRequest(f"GW{next(self._ids)}", symbol, side, int(quantity), price, time_in_force, signal_ns)
+        order.ack = asyncio.get_running_loop().create_future()
+        self.orders[order.order_id] = order
+
+        reason = self._pre_trade(order)
+        if reason is not None:
+            order.status, order.reject_reason = 'REJECTED', reason
+            self.stats['risk_rejects'] += 1
+            order.ack.set_result(order)
+            return order
+
+        await self._in_flight.acquire()
+        await self._queue.put(order)
+        self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], self._queue.qsize())
+        return order
+
+    def _checks(self) -> List[Callable[[OrderRequest], Optional[str]]]:
+        checks = list(self.risk_checks)
+        if self.risk_manager is not None and self.risk_manager.pre_trade is not None:
+            checks.append(self.risk_manager.pre_trade)
+        return checks
+
+    def _pre_trade(self, order: OrderRequest) -> Optional[str]:
+        if self.risk_manager is not None and self.risk_manager.kill_switch_active:
+            return 'kill switch active'
+        # The risk manager's pre-trade check commits exposure on accept, so it runs last;
+        # any check that accepted before a later reject is still released
+        passed = []
+        for check in self._checks():
+            reason = check(order)
+            if reason is not None:
+                self._release(order, passed)
+                return reason
+            passed.append(check)
+        return None
+
+    def _release(self, order: OrderRequest, checks: Optional[List[Callable]] = None,
+                 quantity: Optional[int] = None):
+        """
+        Returns quantity that will never fill (default: the order's unfilled quantity) to
+        the checks that commit exposure on acceptance.
+        """
+        for check in (self._checks() if checks is None else checks):
+            release = getattr(check, 'release', None)
+            if release is not None:
+                release(order, quantity)
+
+    async def cancel(self, order: OrderRequest):
+        """
+        Asks the venue to cancel a resting order. On the venue's confirmation the order is
+        marked CANCELLED and its unfilled quantity is released.
+        """
+        if order.status not in ('SENT', 'ACKED'):
+            return
+        while True:
+            await self._connected.wait()
+            try:
+                await self.adapter.send([{'type': 'cancel', 'id': order.order_id, 'symbol': order.symbol}])
+                return
+            except ConnectionError:
+                await self._reconnect()
+
+    # --- Venue I/O ---
+    async def _sender(self):
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            deadline = time.perf_counter() + self.batch_interval_ms / 1000.0
+            while len(batch) < self.batch_size:
+                if queue.empty():
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    batch.append(queue.get_nowait())
+
+            for order in batch:
+                order.status = 'SENT'
+                self._unacked[order.order_id] = order
+            while True:
+                await self._connected.wait()
+                try:
+                    await self.adapter.send([o.to_message() for o in batch])
+                    break
+                except ConnectionError:
+                    # Retry after reconnecting; a copy already resent is acked as a duplicate
+                    await self._reconnect()
+            self.stats['sent'] += len(batch)
+            self.stats['batches'] += 1
+
+    async def _receiver(self):
+        while True:
+            try:
+                await self._connected.wait()
+                msg = await self.adapter.receive()
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await self._reconnect()
+                continue
+            self._on_message(msg)
+
+    def _on_message(self, msg: Dict):
+        kind = msg.get('type')
+        order = self.orders.get(msg.get('id'))
+        if order is None:
+            return
+        now = time.perf_counter_ns()
+        if kind == 'ack':
+            if self._unacked.pop(order.order_id, None) is None:
+                return  # duplicate ack after a resend
+            # From here this is the first ack received: a 'duplicate' (the original was lost
+            # with the link) repeats the original's fields, expired_qty included
+            self._in_flight.release()
+            self.ack_latency.record(now - order.signal_ns)
+            if msg['status'] == 'rejected':
+                order.status, order.reject_reason = 'REJECTED', msg.get('reason')
+                self.stats['venue_rejects'] += 1
+                self._release(order)
+            else:
+                if order.status == 'SENT':
+                    order.status = 'ACKED'
+                if msg.get('expired_qty'):
+                    # IOC / market remainder: the fills for the rest follow this ack
+                    self._release(order, quantity=msg['expired_qty'])
+            self.stats['acked'] += 1
+            if not order.ack.done():
+                order.ack.set_result(order)
+        elif kind == 'fill':
+            if order.filled == 0:
+                self.fill_latency.record(now - order.signal_ns)
+            order.filled += msg['qty']
+            if order.filled >= order.quantity:
+                order.status = 'FILLED'
+            self.stats['fills'] += 1
+            if self.on_fill is not None:
+                self.on_fill(order, msg['price'], msg['qty'])
+        elif kind == 'cancel_ack':
+            # Fills ahead of the cancel arrive first on the same link, so `filled` is final
+            if msg.get('cancelled') and order.status != 'CANCELLED':
+                order.status = 'CANCELLED'
+                self.stats['cancels'] += 1
+                self._release(order)
+
+    # --- Reporting ---
+    def latency_report(self) -> pd.DataFrame:
+        return pd.DataFrame({'Signal -> Ack': self.ack_latency.summary(),
+                             'Signal -> First Fill': self.fill_latency.summary()}).T
+
+
+async def benchmark_gateway(host: str = '127.0.0.1', port: int = 9100, n_orders: int = 20_000,
+                            n_round_trips: int = 1_000, batch_size: int = 64, seed: int = 42) -> Dict[str, float]:
+    """
+    Against a running exchange simulator, measures:
+        - unloaded round trip: one marketable IOC order at a time, signal -> ack
+        - burst throughput: n_orders submitted as fast as backpressure allows
+
+    Returns:
+        Dict with round-trip percentiles (us), orders/sec and batches used for the burst.
+    """
+    rng = np.random.default_rng(seed)
+    sides = np.where(rng.random(n_orders + n_round_trips) < 0.5, 'BUY', 'SELL').tolist()
+
+    def price(side):
+        return 100.05 if side == 'BUY' else 99.95
+
+    gateway = OrderGateway(TcpJsonAdapter(host, port), batch_size=batch_size)
+    async with gateway:
+        for side in sides[:n_round_trips]:
+            order = await gateway.submit_signal('SYN', side, 100, price(side), 'IOC')
+            await order.ack
+        round_trip = gateway.ack_latency.summary()
+        batches = gateway.stats['batches']
+
+        start = time.perf_counter()
+        orders = [await gateway.submit_signal('SYN', side, 100, price(side), 'IOC') for side in sides[n_round_trips:]]
+        await asyncio.gather(*(o.ack for o in orders))
+        elapsed = time.perf_counter() - start
+
+    return {"Round Trips": n_round_trips, "p50 RTT (us)": round_trip['p50 (us)'], "p99 RTT (us)": round_trip['p99 (us)'],
+            "Burst Orders": n_orders, "Orders/sec": n_orders / elapsed,
+            "Burst Batches": gateway.stats['batches'] - batches}
@@ -0,0 +1,363 @@
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+
+# Columns of a recorded L2 file (CSV or Parquet), one row per price level message:
+#   timestamp_us  int    exchange time in microseconds
+#   symbol        str
+#   type          'S' = snapshot level (replaces the whole book of that symbol), 'D' = delta
+#   side          'B' = bid, 'A' = ask
+#   price         float
+#   size          float  (0 in a delta removes the level)
+# Rows sharing (timestamp_us, symbol) form one atomic update.
+L2_COLUMNS = ['timestamp_us', 'symbol', 'type', 'side', 'price', 'size']
+
+
+class _BookSide:
+    """
+    One side of a bounded-depth book: best-first sorted level keys with sizes, plus running
+    size and notional sums over the top max_depth levels.
+
+    Up to max_depth + buffer_depth levels are kept, so a delete near the top pulls the next
+    real level up from the buffer band instead of leaving a hole. Once a level has been
+    dropped off the end (`truncated`), levels beyond the kept ones are unknown: inserts
+    past the worst kept level are ignored, and if deletes shrink the side below max_depth
+    the side is stale until the next snapshot clears it.
+    """
+    __slots__ = ('keys', 'sizes', 'total_size', 'total_notional', 'sign', 'max_depth', 'capacity', 'truncated')
+
+    def __init__(self, sign: int, max_depth: int, buffer_depth: int = 0):
+        self.sign = sign  # bids are keyed by -ticks so that ascending order is best first
+        self.max_depth = max_depth
+        self.capacity = max_depth + buffer_depth
+        self.clear()
+
+    def clear(self):
+        self.keys: List[int] = []
+        self.sizes: List[float] = []
+        self.total_size = 0.0
+        self.total_notional = 0.0
+        self.truncated = False
+
+    @property
+    def stale(self) -> bool:
+        return self.truncated and len(self.keys) < self.max_depth
+
+    def _add(self, i: int, sign: float):
+        """Adds (sign=1) or removes (sign=-1) level i in the top-depth running sums."""
+        size = self.sizes[i] * sign
+        self.total_size += size
+        self.total_notional += size * self.sign * self.keys[i]
+
+    def update(self, ticks: int, size: float):
+        keys, sizes, depth = self.keys, self.sizes, self.max_depth
+        key = self.sign * ticks
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            if i < depth:
+                self._add(i, -1)
+            if size > 0:
+                sizes[i] = size
+                if i < depth:
+                    self._add(i, 1)
+            else:
+                del keys[i], sizes[i]
+                if i < depth and len(keys) >= depth:
+                    self._add(depth - 1, 1)  # next level moves up into the top depth
+        elif size > 0 and (i < len(keys) or not self.truncated):
+            if i >= self.capacity:
+                self.truncated = True  # a real level beyond the band is not held
+                return
+            keys.insert(i, key)
+            sizes.insert(i, size)
+            if i < depth:
+                self._add(i, 1)
+                if len(keys) > depth:
+                    self._add(depth, -1)  # level pushed out of the top depth
+            if len(keys) > self.capacity:
+                keys.pop()
+                sizes.pop()
+                self.truncated = True
+
+
+class L2Book:
+    """
+    Level-2 book for one symbol, exposing the top max_depth price levels per side.
+
+    Prices are held in integer ticks. Each side keeps a buffer band of buffer_depth extra
+    levels (default max_depth) so deletes at the top are refilled from real levels. Each
+    update touches at most max_depth + buffer_depth levels (a bounded list insert), and
+    the best quote, depth-weighted prices and imbalance over the top max_depth levels are
+    maintained from running sums, so all queries are O(1) and memory is fixed per symbol.
+    If deletes exhaust the band, is_stale() is True until the next snapshot.
+    """
+    def __init__(self, max_depth: int = 10, tick_size: float = 0.01, buffer_depth: Optional[int] = None):
+        self.max_depth = max_depth
+        self.tick_size = tick_size
+        buffer_depth = max_depth if buffer_depth is None else buffer_depth
+        self.bids = _BookSide(-1, max_depth, buffer_depth)
+        self.asks = _BookSide(1, max_depth, buffer_depth)
+        self.timestamp_us = 0
+
+    def clear(self):
+        self.bids.clear()
+        self.asks.clear()
+
+    def update(self, side: str, price: float, size: float):
+        """Sets the size of one level ('B' or 'A'); size 0 removes it."""
+        book_side = self.bids if side == 'B' else self.asks
+        book_side.update(int(round(price / self.tick_size)), size)
+
+    # --- O(1) queries ---
+    def best_bid(self) -> Optional[float]:
+        return -self.bids.keys[0] * self.tick_size if self.bids.keys else None
+
+    def best_ask(self) -> Optional[float]:
+        return self.asks.keys[0] * self.tick_size if self.asks.keys else None
+
+    def best_bid_size(self) -> float:
+        return self.bids.sizes[0] if self.bids.sizes else 0.0
+
+    def best_ask_size(self) -> float:
+        return self.asks.sizes[0] if self.asks.sizes else 0.0
+
+    def is_stale(self) -> bool:
+        """True if the top max_depth levels may be missing real levels (band exhausted)."""
+        return self.bids.stale or self.asks.stale
+
+    def is_valid(self) -> bool:
+        """Both sides quoted and not crossed."""
+        return bool(self.bids.keys and self.asks.keys) and -self.bids.keys[0] < self.asks.keys[0]
+
+    def mid(self) -> Optional[float]:
+        if not self.is_valid():
+            return None
+        return (self.asks.keys[0] - self.bids.keys[0]) * self.tick_size / 2.0
+
+    def spread(self) -> Optional[float]:
+        if not self.is_valid():
+            return None
+        return (self.asks.keys[0] + self.bids.keys[0]) * self.tick_size
+
+    def microprice(self) -> Optional[float]:
+        """Top-of-book size-weighted mid: leans toward the side with less size."""
+        if not self.is_valid():
+            return None
+        bid_size, ask_size = self.bids.sizes[0], self.asks.sizes[0]
+        bid, ask = -self.bids.keys[0], self.asks.keys[0]
+        return (bid * ask_size + ask * bid_size) / (bid_size + ask_size) * self.tick_size
+
+    def depth_weighted_price(self, side: str) -> Optional[float]:
+        """Size-weighted average price of the top max_depth levels on one side."""
+        book_side = self.bids if side == 'B' else self.asks
+        if book_side.total_size <= 0:
+            return None
+        return book_side.total_notional / book_side.total_size * self.tick_size
+
+    def top_imbalance(self) -> float:
+        """(bid size - ask size) / (bid size + ask size) at the touch, in [-1, 1]."""
+        bid_size, ask_size = self.best_bid_size(), self.best_ask_size()
+        total = bid_size + ask_size
+        return (bid_size - ask_size) / total if total > 0 else 0.0
+
+    def depth_imbalance(self) -> float:
+        """Size imbalance over the top max_depth levels, in [-1, 1]."""
+        total = self.bids.total_size + self.asks.total_size
+        return (self.bids.total_size - self.asks.total_size) / total if total > 0 else 0.0
+
+    def levels(self) -> Dict[str, List[Tuple[float, float]]]:
+        n = self.max_depth
+        return {
+            'bids': [(-k * self.tick_size, s) for k, s in zip(self.bids.keys[:n], self.bids.sizes[:n])],
+            'asks': [(k * self.tick_size, s) for k, s in zip(self.asks.keys[:n], self.asks.sizes[:n])],
+        }
+
+
+class L2Replay:
+    """
+    Streams recorded L2 snapshot/delta files (see L2_COLUMNS) into per-symbol L2Books.
+
+    Files are read in chunks (CSV via pandas, Parquet via pyarrow record batches), so a
+    replay never holds more than one chunk of messages plus the bounded books in memory.
+    Files are replayed in the order given and are expected to be time-ordered.
+    """
+    def __init__(self, paths: Union[str, Path, Sequence[Union[str, Path]]], max_depth: int = 10,
+                 tick_size: float = 0.01, chunksize: int = 500_000, symbols: Optional[Sequence[str]] = None,
+                 buffer_depth: Optional[int] = None):
+        """
+        Args:
+            paths: One file or a list of files (.csv, .csv.gz or .parquet).
+            max_depth: Levels kept per side.
+            tick_size: Price increment used to key levels.
+            chunksize: Rows read per chunk.
+            symbols: Only replay these symbols (default: all).
+            buffer_depth: Extra levels kept below max_depth (default max_depth).
+        """
+        self.paths = [paths] if isinstance(paths, (str, Path)) else list(paths)
+        self.max_depth = max_depth
+        self.tick_size = tick_size
+        self.chunksize = chunksize
+        self.symbols = None if symbols is None else set(symbols)
+        self.buffer_depth = buffer_depth
+        self.books: Dict[str, L2Book] = {}
+        self.messages_processed = 0
+
+    def book(self, symbol: str) -> L2Book:
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = L2Book(self.max_depth, self.tick_size, self.buffer_depth)
+        return book
+
+    def _read_chunks(self, path: Path) -> Iterator[pd.DataFrame]:
+        if path.suffix == '.parquet':
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=self.chunksize, columns=L2_COLUMNS):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(path, usecols=L2_COLUMNS, chunksize=self.chunksize,
+                                   dtype={'symbol': str, 'type': str, 'side': str})
+
+    def _chunks(self) -> Iterator[pd.DataFrame]:
+        """
+        Chunks cut on update boundaries: the trailing (timestamp, symbol) group of each chunk
+        is carried into the next one so an update is never split.
+        """
+        carry = None
+        for path in self.paths:
+            for chunk in self._read_chunks(Path(path)):
+                if self.symbols is not None:
+                    chunk = chunk[chunk['symbol'].isin(self.symbols)]
+                if carry is not None:
+                    chunk = pd.concat([carry, chunk], ignore_index=True)
+                if chunk.empty:
+                    continue
+                ts, sym = chunk['timestamp_us'].values, chunk['symbol'].values
+                tail = len(chunk) - 1
+                while tail > 0 and ts[tail - 1] == ts[-1] and sym[tail - 1] == sym[-1]:
+                    tail -= 1
+                carry = chunk.iloc[tail:]
+                if tail > 0:
+                    yield chunk.iloc[:tail]
+        if carry is not None and not carry.empty:
+            yield carry
+
+    def replay(self) -> Iterator[Tuple[int, str, L2Book]]:
+        """
+        Applies every update in order, yielding (timestamp_us, symbol, book) after each one.
+        A snapshot update clears the symbol's book before its levels are applied.
+        """
+        tick = self.tick_size
+        for chunk in self._chunks():
+            ts = chunk['timestamp_us'].values
+            sym = chunk['symbol'].values
+            is_snapshot = (chunk['type'].values == 'S')
+            is_bid = (chunk['side'].values == 'B')
+            ticks = np.rint(chunk['price'].values / tick).astype(np.int64)
+            sizes = chunk['size'].values.astype(float)
+
+            # Update boundaries (vectorized): a row ends an update if the next row differs
+            n = len(chunk)
+            ends = np.ones(n, dtype=bool)
+            ends[:-1] = (ts[1:] != ts[:-1]) | (sym[1:] != sym[:-1])
+            starts = np.ones(n, dtype=bool)
+            starts[1:] = ends[:-1]
+
+            ts_l, sym_l, snap_l, bid_l = ts.tolist(), sym.tolist(), is_snapshot.tolist(), is_bid.tolist()
+            ticks_l, sizes_l, ends_l, starts_l = ticks.tolist(), sizes.tolist(), ends.tolist(), starts.tolist()
+            book = None
+            for i in range(n):
+                if starts_l[i]:
+                    book = self.book(sym_l[i])
+                    if snap_l[i]:
+                        book.clear()
+                (book.bids if bid_l[i] else book.asks).update(ticks_l[i], sizes_l[i])
+                if ends_l[i]:
+                    book.timestamp_us = ts_l[i]
+                    yield ts_l[i], sym_l[i], book
+            self.messages_processed += n
+
+    def run(self, every_us: int = 0) -> pd.DataFrame:
+        """
+        Replays everything and returns top-of-book quotes per update (or the last quote in
+        each every_us interval per symbol): bid, ask, sizes, spread in bps, microprice,
+        depth-weighted prices and imbalances. Invalid books are skipped; while a book is
+        stale its top of book is still exact, but the depth fields are NaN.
+        """
+        rows = []
+        nan = float('nan')
+        for t, symbol, book in self.replay():
+            if not book.is_valid():
+                continue
+            bid, ask = book.best_bid(), book.best_ask()
+            if book.is_stale():
+                depth = (nan, nan, nan)
+            else:
+                depth = (book.depth_weighted_price('B'), book.depth_weighted_price('A'), book.depth_imbalance())
+            rows.append((t, symbol, bid, ask, book.best_bid_size(), book.best_ask_size(),
+                         (ask - bid) / ((ask + bid) / 2) * 10000.0, book.microprice(),
+                         depth[0], depth[1], book.top_imbalance(), depth[2]))
+        quotes = pd.DataFrame(rows, columns=['timestamp_us', 'symbol', 'bid', 'ask', 'bid_size', 'ask_size',
+                                             'spread_bps', 'microprice', 'bid_dwp', 'ask_dwp',
+                                             'top_imbalance', 'depth_imbalance'])
+        if every_us:
+            bucket = quotes['timestamp_us'] // every_us
+            quotes = quotes[~pd.DataFrame({'s': quotes['symbol'], 'b': bucket}).duplicated(keep='last')]
+        return quotes.reset_index(drop=True)
+
+
+def synthetic_l2_messages(n_updates: int = 100_000, symbols: Sequence[str] = ('SYN',), depth: int = 10,
+                          snapshot_every: int = 2_000, tick_size: float = 0.01, seed: int = 42) -> pd.DataFrame:
+    """
+    Random-walk L2 feed in the L2_COLUMNS layout (for tests and benchmarks): a full snapshot
+    (re-centred on a new mid) every snapshot_every updates, otherwise one level delta per
+    update, roughly a quarter of them removals.
+    """
+    rng = np.random.default_rng(seed)
+    n_symbols = len(symbols)
+    u = np.arange(n_updates)
+    sym_idx = u % n_symbols
+    is_snapshot = (u % snapshot_every) < n_symbols
+    # Per-symbol random walk of the mid (in ticks), moving at snapshots so deltas never cross
+    steps = np.where(is_snapshot, rng.integers(-3, 4, n_updates), 0)
+    mids = np.empty(n_updates, dtype=np.int64)
+    for k in range(n_symbols):
+        mids[sym_idx == k] = 10000 + np.cumsum(steps[sym_idx == k])
+
+    is_bid = rng.random(n_updates) < 0.5
+    level = rng.integers(0, depth + 3, n_updates)
+    delta_ticks = np.where(is_bid, mids - 1 - level, mids + 1 + level)
+    delta_size = np.where(rng.random(n_updates) < 0.25, 0.0, rng.integers(1, 50, n_updates) * 100.0)
+    deltas = pd.DataFrame({'timestamp_us': u * 50, 'sym': sym_idx, 'type': 'D',
+                           'side': np.where(is_bid, 'B', 'A'), 'ticks': delta_ticks, 'size': delta_size})[~is_snapshot]
+
+    snap_u = u[is_snapshot]
+    lv = np.arange(depth)
+    n_snap = len(snap_u)
+    snap_mid = np.repeat(mids[snap_u], 2 * depth)
+    snap_levels = np.tile(np.concatenate([lv, lv]), n_snap)
+    snap_bid = np.tile(np.repeat([True, False], depth), n_snap)
+    snapshots = pd.DataFrame({
+        'timestamp_us': np.repeat(snap_u * 50, 2 * depth), 'sym': np.repeat(sym_idx[snap_u], 2 * depth), 'type': 'S',
+        'side': np.where(snap_bid, 'B', 'A'),
+        'ticks': np.where(snap_bid, snap_mid - 1 - snap_levels, snap_mid + 1 + snap_levels),
+        'size': rng.integers(1, 50, n_snap * 2 * depth) * 100.0,
+    })
+    messages = pd.concat([snapshots, deltas]).sort_values('timestamp_us', kind='stable', ignore_index=True)
+    messages['symbol'] = np.asarray(symbols, dtype=object)[messages['sym'].values]
+    messages['price'] = messages['ticks'] * tick_size
+    return messages[L2_COLUMNS]
+
+
+def benchmark_l2_replay(path: Union[str, Path], max_depth: int = 10) -> Dict[str, float]:
+    """
+    Replays an L2 file end to end and reports message throughput.
+    """
+    replay = L2Replay(path, max_depth=max_depth)
+    start = time.perf_counter()
+    updates = sum(1 for _ in replay.replay())
+    elapsed = time.perf_counter() - start
+    return {"Messages": replay.messages_processed, "Updates": updates, "Seconds": elapsed,
+            "Messages/sec": replay.messages_processed / elapsed}
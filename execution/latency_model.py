@@ -1,56 +1,133 @@
+import math
 import numpy as np
 import pandas as pd
+from typing import List, Optional, Union
+
+# Trading day length in ms (6.5 hours): 6.5 * 3600 * 1000
+MS_PER_DAY = 23400000
+
+_SCALAR_TYPES = (int, float)
+
+SeedLike = Union[None, int, np.random.SeedSequence, np.random.Generator]
+
+
+class _NormalBuffer:
+    """
+    Standard normal draws pre-generated in blocks from one Generator.
+
+    Each scalar request is served from the current block, so per-fill calls cost an index
+    increment instead of an RNG call. Because values are consumed strictly in order, the
+    sequence handed out is the same whatever the block size or mix of scalar/batch calls.
+    """
+    def __init__(self, rng: np.random.Generator, block_size: int):
+        self.rng = rng
+        self.block_size = block_size
+        self._block = np.empty(block_size)
+        self._values: List[float] = []  # same block as Python floats for scalar access
+        self._pos = block_size  # empty: first request refills
+
+    def _refill(self):
+        self._block = self.rng.standard_normal(self.block_size)
+        self._values = self._block.tolist()
+        self._pos = 0
+
+    def next(self) -> float:
+        pos = self._pos
+        if pos >= self.block_size:
+            self._refill()
+            pos = 0
+        self._pos = pos + 1
+        return self._values[pos]
+
+    def take(self, n: int) -> np.ndarray:
+        out = np.empty(n)
+        filled = 0
+        while filled < n:
+            if self._pos >= self.block_size:
+                self._refill()
+            k = min(n - filled, len(self._block) - self._pos)
+            out[filled:filled + k] = self._block[self._pos:self._pos + k]
+            self._pos += k
+            filled += k
+        return out
+
 
 class LatencyModel:
-    def __init__(self, mean_latency_ms: float = 100.0, std_latency_ms: float = 20.0):
+    def __init__(self, mean_latency_ms: float = 100.0, std_latency_ms: float = 20.0,
+                 seed: SeedLike = None, block_size: int = 65536):
         """
         Simulates execution latency.
-        
+
         Args:
             mean_latency_ms: Average delay in milliseconds.
             std_latency_ms: Standard deviation of delay.
+            seed: int, SeedSequence or Generator. Runs with the same seed are bit-for-bit
+                  identical; None draws fresh OS entropy.
+            block_size: Number of latency / shock draws generated per refill.
         """
         self.mean_latency = mean_latency_ms
         self.std_latency = std_latency_ms
-        
+        self.block_size = block_size
+
+        if isinstance(seed, np.random.Generator):
+            latency_rng, shock_rng = seed.spawn(2)
+            self.seed_sequence = None
+        else:
+            self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+            latency_rng, shock_rng = (np.random.default_rng(s) for s in self.seed_sequence.spawn(2))
+
+        # Independent streams, so the latency path does not shift when shocks are drawn differently
+        self._latency_draws = _NormalBuffer(latency_rng, block_size)
+        self._shock_draws = _NormalBuffer(shock_rng, block_size)
+
+    def spawn(self, n: int) -> List["LatencyModel"]:
+        """
+        Independent, reproducible child models (e.g. one per worker in a parameter sweep).
+        Child i depends only on this model's seed and i, not on scheduling or draws made so far.
+        """
+        if self.seed_sequence is None:
+            raise ValueError("spawn() needs a model seeded with an int or SeedSequence.")
+        return [LatencyModel(self.mean_latency, self.std_latency, seed=child, block_size=self.block_size)
+                for child in self.seed_sequence.spawn(n)]
+
     def get_latency(self) -> float:
         """Returns a random latency in milliseconds."""
-        return max(0, np.random.normal(self.mean_latency, self.std_latency))
-    
-    def simulate_slippage(self, current_price: float, volatility: float, volume: float = 1.0) -> float:
+        latency = self.mean_latency + self.std_latency * self._latency_draws.next()
+        return latency if latency > 0.0 else 0.0
+
+    def get_latencies(self, n: int) -> np.ndarray:
+        """Returns n random latencies in milliseconds (same stream as get_latency)."""
+        return np.maximum(0.0, self.mean_latency + self.std_latency * self._latency_draws.take(n))
+
+    def simulate_slippage(self, current_price, volatility, volume=1.0):
         """
         Estimates price slippage based on volatility and latency.
         Simple model: Higher volatility + latency = larger potential slippage.
-        
+
+        Accepts scalars (one fill) or arrays (a batch of fills, broadcast together); a batch
+        consumes the same draws as the equivalent sequence of scalar calls.
+
         Args:
-            current_price: Asset price.
+            current_price: Asset price(s).
             volatility: Annualized volatility (scaling factor).
-            volume: Trade size (impact model - placeholder).
-            
+            volume: Trade size (unused here; market impact is priced by execution.cost_model).
+
         Returns:
-            Executed price (adjusted for slippage).
+            Price delta(s) caused by the market moving during the latency.
         """
-        # Time-based slippage: Price moves during latency
-        # approximated by random walk drift proportional to volatility
-        
-        # 100ms latency as fraction of trading day (6.5 hours)
-        # 6.5 * 3600 * 1000 = 23,400,000 ms
-        ms_per_day = 23400000
-        latency_ms = self.get_latency()
-        
-        time_fraction = latency_ms / ms_per_day
-        
-        # Expected move ~ Vol * Price * sqrt(t)
-        # Random shock +/-
-        shock = np.random.normal(0, 1) * volatility * current_price * np.sqrt(time_fraction)
-        
-        # Bid-Ask spread impact (fixed cost approximation + shock)
-        # Assume 1bp fixed spread cost + shock
-        spread_cost = current_price * 0.0001
-        
-        # If buying, we pay more (add cost, add/sub shock)
-        # But this method returns "executed price" generic deviation.
-        # We'll assume this wraps the 'execution price' logic.
-        
-        # Let's return the Price Delta
-        return shock
+        scalar = (isinstance(current_price, _SCALAR_TYPES) and isinstance(volatility, _SCALAR_TYPES)
+                  and isinstance(volume, _SCALAR_TYPES))
+        if scalar or (np.ndim(current_price) == 0 and np.ndim(volatility) == 0 and np.ndim(volume) == 0):
+            # Time-based slippage: Price moves during latency
+            # approximated by random walk drift proportional to volatility
+            time_fraction = self.get_latency() / MS_PER_DAY
+
+            # Expected move ~ Vol * Price * sqrt(t), random shock +/-
+            return self._shock_draws.next() * volatility * current_price * math.sqrt(time_fraction)
+
+        current_price, volatility, _ = np.broadcast_arrays(np.asarray(current_price, dtype=float),
+                                                           np.asarray(volatility, dtype=float), volume)
+        n = current_price.size
+        time_fraction = self.get_latencies(n).reshape(current_price.shape) / MS_PER_DAY
+        shocks = self._shock_draws.take(n).reshape(current_price.shape)
+        return shocks * volatility * current_price * np.sqrt(time_fraction)
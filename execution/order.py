@@ -0,0 +1,315 @@
+from enum import IntEnum
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+
+class Side(IntEnum):
+    BUY = 1
+    SELL = -1
+
+
+class OrderType(IntEnum):
+    LIMIT = 0
+    MARKET = 1
+
+
+class TimeInForce(IntEnum):
+    GTC = 0
+    IOC = 1
+    DAY = 2
+
+
+class OrderStatus(IntEnum):
+    NEW = 0
+    PARTIALLY_FILLED = 1
+    FILLED = 2
+    CANCELLED = 3
+    REJECTED = 4
+
+
+class _ColumnStore:
+    """
+    Growable struct-of-arrays table. Row index == record id.
+    """
+    COLUMNS = {}
+
+    def __init__(self, capacity: int = 1024):
+        self._size = 0
+        self._capacity = max(capacity, 1)
+        for name, dtype in self.COLUMNS.items():
+            setattr(self, name, np.zeros(self._capacity, dtype=dtype))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _reserve(self, n: int) -> int:
+        """
+        Makes room for n more rows (amortized doubling) and returns the first new id.
+        """
+        start = self._size
+        needed = start + n
+        if needed > self._capacity:
+            new_capacity = max(needed, 2 * self._capacity)
+            for name in self.COLUMNS:
+                old = getattr(self, name)
+                grown = np.zeros(new_capacity, dtype=old.dtype)
+                grown[:start] = old[:start]
+                setattr(self, name, grown)
+            self._capacity = new_capacity
+        self._size = needed
+        return start
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({name: getattr(self, name)[:self._size] for name in self.COLUMNS})
+
+
+class OrderStore(_ColumnStore):
+    """
+    Compact order table for simulations with millions of orders.
+
+    Orders are rows of fixed-width NumPy columns (int64 price ticks, int8 enums) addressed
+    by integer id, so bulk creation, lookup and status updates are array operations with
+    no per-order Python object or dict.
+
+    timestamp_us is when an order was created; arrival_us is when it reaches the venue
+    (the same until stamp_latency adds a simulated delay). MatchingEngine.submit_order
+    stamps fills with the arrival time.
+    """
+    COLUMNS = {
+        'symbol_id': np.int32,
+        'side': np.int8,
+        'order_type': np.int8,
+        'time_in_force': np.int8,
+        'status': np.int8,
+        'price_ticks': np.int64,
+        'quantity': np.int64,
+        'filled': np.int64,
+        'timestamp_us': np.int64,
+        'arrival_us': np.int64,
+    }
+
+    def add(self, side: int, price_ticks: int, quantity: int, symbol_id: int = 0,
+            order_type: int = OrderType.LIMIT, time_in_force: int = TimeInForce.GTC, timestamp_us: int = 0) -> int:
+        """
+        Appends one order and returns its id.
+        """
+        i = self._reserve(1)
+        self.symbol_id[i] = symbol_id
+        self.side[i] = side
+        self.order_type[i] = order_type
+        self.time_in_force[i] = time_in_force
+        self.status[i] = OrderStatus.NEW
+        self.price_ticks[i] = price_ticks
+        self.quantity[i] = quantity
+        self.filled[i] = 0
+        self.timestamp_us[i] = timestamp_us
+        self.arrival_us[i] = timestamp_us
+        return i
+
+    def add_many(self, sides, price_ticks, quantities, symbol_ids=0, order_types=OrderType.LIMIT,
+                 time_in_force=TimeInForce.GTC, timestamps_us=0) -> np.ndarray:
+        """
+        Appends a batch of orders (array arguments, scalars broadcast) and returns their ids.
+        """
+        n = np.broadcast(*(np.asarray(a) for a in (sides, price_ticks, quantities, symbol_ids, order_types,
+                                                     time_in_force, timestamps_us))).size
+        start = self._reserve(n)
+        rows = slice(start, start + n)
+        self.symbol_id[rows] = symbol_ids
+        self.side[rows] = sides
+        self.order_type[rows] = order_types
+        self.time_in_force[rows] = time_in_force
+        self.status[rows] = OrderStatus.NEW
+        self.price_ticks[rows] = price_ticks
+        self.quantity[rows] = quantities
+        self.filled[rows] = 0
+        self.timestamp_us[rows] = timestamps_us
+        self.arrival_us[rows] = timestamps_us
+        return np.arange(start, start + n)
+
+    def stamp_latency(self, order_ids, latency_us=None, latency_model=None):
+        """
+        Sets arrival_us = timestamp_us + latency for the given orders, from explicit
+        latencies (microseconds, scalar or per order) or draws of an
+        execution.latency_model.LatencyModel (milliseconds, one per order).
+        """
+        order_ids = np.asarray(order_ids)
+        if latency_us is None:
+            if latency_model is None:
+                raise ValueError("Pass latency_us or a latency_model.")
+            latency_us = np.rint(latency_model.get_latencies(len(order_ids)) * 1000.0)
+        self.arrival_us[order_ids] = self.timestamp_us[order_ids] + np.asarray(latency_us, dtype=np.int64)
+
+    def by_arrival(self, order_ids=None) -> np.ndarray:
+        """
+        Order ids sorted by venue arrival (ties keep id order), i.e. the sequence in
+        which an event-driven simulation should submit them.
+        """
+        order_ids = np.arange(self._size) if order_ids is None else np.asarray(order_ids)
+        return order_ids[np.argsort(self.arrival_us[order_ids], kind='stable')]
+
+    def get(self, order_id: int) -> "Order":
+        if not 0 <= order_id < self._size:
+            raise KeyError(order_id)
+        return Order(self, order_id)
+
+    def remaining(self, order_ids=None) -> np.ndarray:
+        if order_ids is None:
+            order_ids = slice(0, self._size)
+        return self.quantity[order_ids] - self.filled[order_ids]
+
+    def update_status(self, order_ids, status: int):
+        self.status[order_ids] = status
+
+    def record_fill(self, order_id: int, quantity: int):
+        """
+        Adds a fill to one order and moves it to PARTIALLY_FILLED / FILLED.
+        """
+        self.filled[order_id] += quantity
+        self.status[order_id] = OrderStatus.FILLED if self.filled[order_id] >= self.quantity[order_id] else OrderStatus.PARTIALLY_FILLED
+
+    def record_fills(self, order_ids, quantities):
+        """
+        Vectorized record_fill (repeated ids accumulate).
+        """
+        order_ids = np.asarray(order_ids)
+        np.add.at(self.filled, order_ids, quantities)
+        done = self.filled[order_ids] >= self.quantity[order_ids]
+        self.status[order_ids] = np.where(done, OrderStatus.FILLED, OrderStatus.PARTIALLY_FILLED)
+
+    def open_mask(self) -> np.ndarray:
+        status = self.status[:self._size]
+        return (status == OrderStatus.NEW) | (status == OrderStatus.PARTIALLY_FILLED)
+
+
+class Order:
+    """
+    Lightweight view of one row of an OrderStore (no per-order data is copied).
+    """
+    __slots__ = ('store', 'order_id')
+
+    def __init__(self, store: OrderStore, order_id: int):
+        self.store = store
+        self.order_id = order_id
+
+    @property
+    def side(self) -> Side:
+        return Side(int(self.store.side[self.order_id]))
+
+    @property
+    def order_type(self) -> OrderType:
+        return OrderType(int(self.store.order_type[self.order_id]))
+
+    @property
+    def time_in_force(self) -> TimeInForce:
+        return TimeInForce(int(self.store.time_in_force[self.order_id]))
+
+    @property
+    def status(self) -> OrderStatus:
+        return OrderStatus(int(self.store.status[self.order_id]))
+
+    @property
+    def symbol_id(self) -> int:
+        return int(self.store.symbol_id[self.order_id])
+
+    @property
+    def price_ticks(self) -> int:
+        return int(self.store.price_ticks[self.order_id])
+
+    @property
+    def quantity(self) -> int:
+        return int(self.store.quantity[self.order_id])
+
+    @property
+    def filled(self) -> int:
+        return int(self.store.filled[self.order_id])
+
+    @property
+    def remaining(self) -> int:
+        return self.quantity - self.filled
+
+    @property
+    def timestamp_us(self) -> int:
+        return int(self.store.timestamp_us[self.order_id])
+
+    @property
+    def arrival_us(self) -> int:
+        return int(self.store.arrival_us[self.order_id])
+
+    def __repr__(self) -> str:
+        return (f"Order(id={self.order_id}, {self.side.name}, {self.order_type.name}, "
+                f"{self.remaining}/{self.quantity} @ {self.price_ticks} ticks, {self.status.name})")
+
+
+class FillStore(_ColumnStore):
+    """
+    Append-only trade ledger in struct-of-arrays form.
+    """
+    COLUMNS = {
+        'maker_id': np.int64,
+        'taker_id': np.int64,
+        'side': np.int8,          # taker side
+        'price_ticks': np.int64,
+        'quantity': np.int64,
+        'timestamp_us': np.int64,
+    }
+
+    def append(self, maker_id: int, taker_id: int, side: int, price_ticks: int, quantity: int, timestamp_us: int = 0) -> int:
+        i = self._reserve(1)
+        self.maker_id[i] = maker_id
+        self.taker_id[i] = taker_id
+        self.side[i] = side
+        self.price_ticks[i] = price_ticks
+        self.quantity[i] = quantity
+        self.timestamp_us[i] = timestamp_us
+        return i
+
+    def get(self, fill_id: int) -> "Fill":
+        if not 0 <= fill_id < self._size:
+            raise KeyError(fill_id)
+        return Fill(self, fill_id)
+
+    def to_frame(self, tick_size: Optional[float] = None) -> pd.DataFrame:
+        df = super().to_frame()
+        if tick_size is not None:
+            df['price'] = df['price_ticks'] * tick_size
+        return df
+
+
+class Fill:
+    """
+    Lightweight view of one row of a FillStore.
+    """
+    __slots__ = ('store', 'fill_id')
+
+    def __init__(self, store: FillStore, fill_id: int):
+        self.store = store
+        self.fill_id = fill_id
+
+    @property
+    def maker_id(self) -> int:
+        return int(self.store.maker_id[self.fill_id])
+
+    @property
+    def taker_id(self) -> int:
+        return int(self.store.taker_id[self.fill_id])
+
+    @property
+    def side(self) -> Side:
+        return Side(int(self.store.side[self.fill_id]))
+
+    @property
+    def price_ticks(self) -> int:
+        return int(self.store.price_ticks[self.fill_id])
+
+    @property
+    def quantity(self) -> int:
+        return int(self.store.quantity[self.fill_id])
+
+    @property
+    def timestamp_us(self) -> int:
+        return int(self.store.timestamp_us[self.fill_id])
+
+    def __repr__(self) -> str:
+        return f"Fill(id={self.fill_id}, maker={self.maker_id}, taker={self.taker_id}, {self.quantity} @ {self.price_ticks} ticks)"
@@ -1,8 +1,15 @@
 from dataclasses import dataclass
-from typing import Literal
+from typing import Dict, List, Literal, Optional
+import numpy as np
+import pandas as pd
+from execution.fill_simulator import FillSimulator
+from execution.l2_book import L2Book
 
 @dataclass
 class LimitOrder:
+    """
+    Convenience single-order record. Large simulations should use execution.order.OrderStore.
+    """
     price: float
     quantity: int
     side: Literal['BUY', 'SELL']
@@ -12,14 +19,22 @@ class OrderBook:
     """
     Simulates a simplified Limit Order Book.
     """
-    def __init__(self):
+    def __init__(self, l2_book: Optional[L2Book] = None):
+        """
+        Args:
+            l2_book: Optional replayed Level-2 book (execution.l2_book). When set and quoted,
+                     get_market_price returns its real bid/ask instead of a synthetic spread.
+        """
         self.bids = [] # Buyers (Higher is better)
         self.asks = [] # Sellers (Lower is better)
+        self.l2_book = l2_book
         
     def get_market_price(self, mid_price: float, spread_bps: float = 5.0): # 5 bps spread
         """
         Simulates current Bid/Ask based on a mid-price and spread.
         """
+        if self.l2_book is not None and self.l2_book.is_valid():
+            return self.l2_book.best_bid(), self.l2_book.best_ask()
         half_spread = spread_bps / 10000.0 / 2.0
         bid = mid_price * (1 - half_spread)
         ask = mid_price * (1 + half_spread)
@@ -42,3 +57,29 @@ class OrderBook:
                 return True
                 
         return False
+
+    def check_executions(self, orders: List[LimitOrder], bars: pd.DataFrame, submit_bars=0,
+                         simulator: FillSimulator = None) -> Dict[str, np.ndarray]:
+        """
+        Batched check_execution: simulates many limit orders against an OHLCV frame at once.
+        
+        Args:
+            orders: Limit orders to simulate.
+            bars: DataFrame with 'High', 'Low' (and optionally 'Open', 'Volume') columns.
+            submit_bars: Bar position at which each order becomes live (scalar or per order).
+            simulator: FillSimulator to use (default: touch fills, no participation cap).
+            
+        Returns:
+            Per-order arrays from FillSimulator.simulate.
+        """
+        simulator = simulator or FillSimulator()
+        return simulator.simulate(
+            prices=np.array([o.price for o in orders], dtype=float),
+            sides=np.array([1 if o.side == 'BUY' else -1 for o in orders]),
+            quantities=np.array([o.quantity for o in orders], dtype=float),
+            submit_bars=submit_bars,
+            high=bars['High'].values,
+            low=bars['Low'].values,
+            open_=bars['Open'].values if 'Open' in bars else None,
+            volume=bars['Volume'].values if 'Volume' in bars else None,
+        )
@@ -0,0 +1,212 @@
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+
+class DrawdownTracker:
+    """
+    Streaming drawdown of an equity curve, O(1) per update (for live trading and the
+    backtest loop).
+
+    Drawdown is (equity - peak) / peak, so it is 0 at a new high and negative below it.
+    """
+    def __init__(self, initial_equity: Optional[float] = None):
+        """
+        Args:
+            initial_equity: Starting peak (e.g. initial capital). If None, the first update
+                            sets it.
+        """
+        self.reset(initial_equity)
+
+    def reset(self, initial_equity: Optional[float] = None):
+        self.peak = initial_equity
+        self.equity = initial_equity
+        self.drawdown = 0.0
+        self.max_drawdown = 0.0
+        self.duration = 0  # bars since the last peak while under water
+        self.max_duration = 0
+        self.bars = 0
+        self.peak_bar = 0
+        self.trough_bar = 0
+
+    def update(self, equity: float) -> float:
+        """Adds one equity observation and returns the current drawdown."""
+        self.bars += 1
+        self.equity = equity
+        if self.peak is None or equity >= self.peak:
+            if self.drawdown < 0:
+                # Recovered: the episode lasted from the old peak to this bar
+                self.max_duration = max(self.max_duration, self.bars - self.peak_bar)
+            self.peak = equity
+            self.peak_bar = self.bars
+            self.drawdown = 0.0
+            self.duration = 0
+            return 0.0
+        self.drawdown = (equity - self.peak) / self.peak
+        self.duration = self.bars - self.peak_bar
+        if self.drawdown < self.max_drawdown:
+            self.max_drawdown = self.drawdown
+            self.trough_bar = self.bars
+        if self.duration > self.max_duration:
+            self.max_duration = self.duration
+        return self.drawdown
+
+    @property
+    def in_drawdown(self) -> bool:
+        return self.drawdown < 0
+
+
+def _as_2d(equity):
+    """(T, K) float array, index and column labels for a curve or a panel of curves."""
+    if isinstance(equity, pd.Series):
+        return equity.values.astype(float)[:, None], equity.index, [equity.name if equity.name is not None else 0]
+    if isinstance(equity, pd.DataFrame):
+        return equity.values.astype(float), equity.index, list(equity.columns)
+    values = np.asarray(equity, dtype=float)
+    values = values[:, None] if values.ndim == 1 else values
+    return values, pd.RangeIndex(len(values)), list(range(values.shape[1]))
+
+
+def drawdown_series(equity, initial=None, axis: int = 0):
+    """
+    Drawdown of every equity curve along `axis` (vectorized over all other axes).
+
+    Args:
+        equity: Equity curve(s): Series, DataFrame (one curve per column) or array.
+        initial: Optional starting equity counted as the first peak (broadcasts against
+                 the curves, e.g. one value per column).
+
+    Returns:
+        Drawdowns in the same shape (and type, for pandas input); 0 at highs, negative below.
+    """
+    values = np.asarray(equity, dtype=float)
+    peak = np.maximum.accumulate(values, axis=axis)
+    if initial is not None:
+        peak = np.maximum(peak, initial)
+    drawdown = (values - peak) / peak
+    if isinstance(equity, pd.Series):
+        return pd.Series(drawdown, index=equity.index, name=equity.name)
+    if isinstance(equity, pd.DataFrame):
+        return pd.DataFrame(drawdown, index=equity.index, columns=equity.columns)
+    return drawdown
+
+
+def equity_from_returns(returns):
+    """Growth of 1 from periodic returns (Series, DataFrame or array; time along axis 0)."""
+    if isinstance(returns, (pd.Series, pd.DataFrame)):
+        return (1 + returns).cumprod()
+    return np.cumprod(1 + np.asarray(returns, dtype=float), axis=0)
+
+
+def max_drawdown(equity) -> float:
+    """Deepest drawdown of a single equity curve (0.0 if empty)."""
+    values = np.asarray(equity, dtype=float)
+    if not len(values):
+        return 0.0
+    return float(drawdown_series(values).min())
+
+
+def _episodes(drawdown: np.ndarray):
+    """
+    Every underwater run of every curve, from a (T, K) drawdown array.
+
+    Runs are found for all curves at once: the curve-major flattening of the underwater
+    points keeps each run contiguous, so per-run depth, trough and length come from
+    reduceat over run boundaries.
+    """
+    T, K = drawdown.shape
+    under = drawdown.T < 0  # (K, T)
+    starts = under & ~np.concatenate([np.zeros((K, 1), dtype=bool), under[:, :-1]], axis=1)
+    run_id = np.cumsum(starts.reshape(-1))[under.reshape(-1)] - 1
+    flat_dd = drawdown.T[under]
+    flat_curve, flat_t = np.nonzero(under)
+    if not len(flat_dd):
+        empty = np.array([], dtype=np.int64)
+        return empty, empty, empty, empty, np.array([]), empty
+    bounds = np.flatnonzero(np.r_[True, run_id[1:] != run_id[:-1]])
+    depth = np.minimum.reduceat(flat_dd, bounds)
+    lengths = np.diff(np.r_[bounds, len(flat_dd)])
+    group = np.repeat(np.arange(len(bounds)), lengths)
+    at_min = np.flatnonzero(flat_dd == depth[group])
+    _, first_min = np.unique(group[at_min], return_index=True)
+    trough = flat_t[at_min[first_min]]
+    start = flat_t[bounds]
+    end = start + lengths  # first bar back at the peak (== T if not recovered)
+    return flat_curve[bounds], start, trough, end, depth, lengths
+
+
+def _label(index: pd.Index, positions: np.ndarray) -> np.ndarray:
+    """Index labels at positions, NaN/NaT where the position is out of range."""
+    positions = np.asarray(positions)
+    valid = (positions >= 0) & (positions < len(index))
+    labels = np.full(len(positions), None, dtype=object)
+    labels[valid] = np.asarray(index, dtype=object)[positions[valid]]
+    if isinstance(index, pd.DatetimeIndex):
+        return pd.to_datetime(labels)
+    return labels
+
+
+def drawdown_episodes(equity, top_n: int = 5) -> pd.DataFrame:
+    """
+    The `top_n` deepest drawdown episodes of every equity curve.
+
+    Returns:
+        One row per (curve, rank) with Peak, Trough and Recovery labels (Recovery is
+        missing if the curve has not regained its peak), Depth, and lengths in bars:
+        Decline (peak to trough), Recovery Time (trough to recovery, NaN if open) and
+        Duration (peak to recovery, or to the last bar).
+    """
+    values, index, names = _as_2d(equity)
+    curve, start, trough, end, depth, _ = _episodes(drawdown_series(values))
+    order = np.lexsort((start, depth, curve))
+    curve, start, trough, end, depth = curve[order], start[order], trough[order], end[order], depth[order]
+    first_of_curve = np.searchsorted(curve, curve)
+    rank = np.arange(len(curve)) - first_of_curve
+    keep = rank < top_n
+    curve, start, trough, end, depth, rank = (a[keep] for a in (curve, start, trough, end, depth, rank))
+    T = len(values)
+    recovered = end < T
+    peak = start - 1
+    frame = pd.DataFrame({
+        'Peak': _label(index, peak),
+        'Trough': _label(index, trough),
+        'Recovery': _label(index, np.where(recovered, end, -1)),
+        'Depth': depth,
+        'Decline': trough - peak,
+        'Recovery Time': np.where(recovered, end - trough, np.nan),
+        'Duration': np.where(recovered, end, T - 1) - peak,
+    }, index=pd.MultiIndex.from_arrays([np.asarray(names, dtype=object)[curve], rank + 1], names=['Curve', 'Rank']))
+    return frame
+
+
+def drawdown_stats(equity) -> pd.DataFrame:
+    """
+    Summary per equity curve: max drawdown with its peak / trough / recovery, time to
+    recovery, the longest time under water and the current drawdown.
+    """
+    values, index, names = _as_2d(equity)
+    drawdown = drawdown_series(values)
+    T, K = values.shape
+    curve, start, trough, end, depth, lengths = _episodes(drawdown)
+
+    # Deepest episode per curve (first one on ties)
+    order = np.lexsort((start, depth, curve))
+    deepest = order[np.r_[True, curve[order][1:] != curve[order][:-1]]] if len(order) else order
+    longest = np.zeros(K, dtype=np.int64)
+    np.maximum.at(longest, curve, np.where(end < T, lengths, lengths - 1) + 1)
+
+    stats = pd.DataFrame(index=pd.Index(names, name='Curve'))
+    stats['Max Drawdown'] = np.nan_to_num(np.nanmin(drawdown, axis=0)) if T else 0.0
+    stats['Current Drawdown'] = drawdown[-1] if T else 0.0
+    peak_at = np.full(K, -1)
+    trough_at = np.full(K, -1)
+    end_at = np.full(K, T)
+    c = curve[deepest]
+    peak_at[c], trough_at[c], end_at[c] = start[deepest] - 1, trough[deepest], end[deepest]
+    recovered = end_at < T
+    stats['Peak'] = _label(index, peak_at)
+    stats['Trough'] = _label(index, trough_at)
+    stats['Recovery'] = _label(index, np.where(recovered & (trough_at >= 0), end_at, -1))
+    stats['Time to Recovery'] = np.where(recovered & (trough_at >= 0), end_at - trough_at, np.nan)
+    stats['Max Duration'] = longest
+    return stats
@@ -1,10 +1,42 @@
-from risk.position_sizing import VolatilitySizing
+from risk.position_sizing import VolatilitySizing, PortfolioVolatilitySizing
+from risk.drawdown import DrawdownTracker
+from risk.covariance import CovarianceEstimator
+
+import numpy as np
+import pandas as pd
+from typing import Callable, Optional, Sequence
 
 class RiskManager:
-    def __init__(self, target_volatility: float = 0.20, max_drawdown_limit: float = 0.20):
+    def __init__(self, target_volatility: float = 0.20, max_drawdown_limit: float = 0.20, max_anomaly_fraction: float = 0.5,
+                 covariance_estimator: Optional[CovarianceEstimator] = None,
+                 pre_trade: Optional[Callable[..., Optional[str]]] = None, vol_targeting: str = 'asset',
+                 tickers: Optional[Sequence[str]] = None, max_leverage: float = 1.0):
+        """
+        Args:
+            covariance_estimator: Shared covariance estimates (default Ledoit-Wolf).
+            pre_trade: Per-order limit checks (e.g. risk.pre_trade.PreTradeRiskChecker),
+                       applied by the order gateway after the kill switch.
+            vol_targeting: 'asset' sizes each ticker alone (target / asset vol);
+                           'portfolio' sizes the held book jointly so its covariance-
+                           implied volatility meets the target (needs `tickers`).
+            tickers: Universe for portfolio vol targeting, in update_market() order.
+            max_leverage: Gross exposure cap for portfolio vol targeting.
+        """
+        if vol_targeting not in ('asset', 'portfolio'):
+            raise ValueError(f"Unknown vol_targeting {vol_targeting!r}; use 'asset' or 'portfolio'.")
+        if vol_targeting == 'portfolio' and tickers is None:
+            raise ValueError("Portfolio vol targeting needs the ticker universe.")
         self.vol_sizer = VolatilitySizing(target_volatility)
         self.max_drawdown_limit = max_drawdown_limit
+        self.max_anomaly_fraction = max_anomaly_fraction
         self.kill_switch_active = False
+        self.anomaly_halt = False
+        self.drawdown_tracker = DrawdownTracker()
+        self.covariance_estimator = covariance_estimator or CovarianceEstimator()
+        self.pre_trade = pre_trade
+        self.vol_targeting = vol_targeting
+        self.portfolio_sizer = (PortfolioVolatilitySizing(tickers, target_volatility, max_leverage)
+                                if vol_targeting == 'portfolio' else None)
 
     def check_portfolio_health(self, current_drawdown: float) -> bool:
         """
@@ -16,11 +48,74 @@ class RiskManager:
             return False # Unhealthy
         return True # Healthy
 
-    def get_allocation_amount(self, capital: float, asset_volatility: float) -> float:
+    def check_equity(self, equity: float) -> bool:
+        """
+        Streams the latest portfolio equity through the drawdown tracker and applies the
+        drawdown kill switch.
+        """
+        return self.check_portfolio_health(self.drawdown_tracker.update(equity))
+
+    def check_market_anomalies(self, anomaly_flags: np.ndarray) -> bool:
+        """
+        Halts new entries for the current bar if too much of the universe looks anomalous
+        (e.g. a feed outage or market-wide dislocation flagged by ai.anomaly_detection).
+        Unlike the drawdown kill switch this does not latch: the next clean bar resumes.
+        
+        Args:
+            anomaly_flags: Boolean array, one entry per ticker for the current bar.
+        """
+        flags = np.asarray(anomaly_flags, dtype=bool)
+        halt = bool(flags.size) and flags.mean() >= self.max_anomaly_fraction
+        if halt and not self.anomaly_halt:
+            print(f"RISK ALERT: {flags.mean():.0%} of universe anomalous. Pausing entries.")
+        self.anomaly_halt = halt
+        return not halt
+
+    def portfolio_volatility(self, weights: pd.Series, returns: pd.DataFrame, date=None) -> float:
+        """
+        Annualized volatility of a portfolio under the shared covariance estimate for `date`.
+
+        Args:
+            weights: Weights by ticker (missing tickers count as 0).
+            returns: Daily returns (dates x tickers).
+        """
+        cov = self.covariance_estimator.estimate(returns, date)
+        w = pd.Series(weights, dtype=float).reindex(cov.index).fillna(0.0).values
+        return float(np.sqrt(max(w @ cov.values @ w, 0.0)))
+
+    def update_market(self, returns) -> None:
+        """
+        Feeds one bar of returns (one per ticker, NaN = no move) to the portfolio vol
+        targeting covariance. No-op in 'asset' mode.
+        """
+        if self.portfolio_sizer is not None:
+            self.portfolio_sizer.update(returns)
+
+    def get_allocation_amount(self, capital: float, asset_volatility: float, ticker: Optional[str] = None) -> float:
         """
         Determines dollar amount to allocate based on volatility targeting.
+
+        In 'portfolio' mode, passing `ticker` adds it to the book and returns its share
+        of the jointly scaled allocation (see target_exposures()); call
+        release_allocation() if nothing is bought.
         """
         if self.kill_switch_active:
             return 0.0
-            
+
+        if self.portfolio_sizer is not None and ticker is not None:
+            return self.portfolio_sizer.allocation(ticker, capital, asset_volatility)
         return self.vol_sizer.get_position_size(asset_volatility, capital)
+
+    def release_allocation(self, ticker: str) -> None:
+        """Removes a closed position from the portfolio vol targeting book."""
+        if self.portfolio_sizer is not None:
+            self.portfolio_sizer.remove(ticker)
+
+    def target_exposures(self, capital: float) -> pd.Series:
+        """
+        Dollar exposure per held ticker that puts the book at the target volatility
+        ('portfolio' mode; empty otherwise or with the kill switch on).
+        """
+        if self.portfolio_sizer is None or self.kill_switch_active:
+            return pd.Series(dtype=float)
+        return self.portfolio_sizer.target_exposures(capital)
@@ -0,0 +1,423 @@
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from execution.gateway import LatencyHistogram, OrderRequest
+
+INF = float('inf')
+CHECKS = ('Order Size', 'Price Band', 'Position', 'Exposure', 'Rate Limit')
+
+
+@dataclass
+class PreTradeLimits:
+    """
+    Hard limits for the pre-trade layer (inf / None disables a check).
+
+    Positions and exposures are "committed": fills plus every accepted order still open,
+    so a burst of orders cannot jointly breach a limit before any of them fills. Exposure
+    is marked at the reference price; a symbol has none until its first update_price().
+    """
+    max_order_quantity: float = INF
+    max_order_notional: float = INF
+    max_position: float = INF                       # |shares| per symbol
+    position_limits: Dict[str, float] = field(default_factory=dict)  # per-symbol overrides
+    max_gross_exposure: float = INF                 # sum |shares * price|
+    max_net_exposure: float = INF                   # |sum shares * price|
+    max_orders_per_second: float = INF
+    burst: Optional[float] = None                   # rate-limit bucket size (default: one second's worth)
+    price_band: float = INF                         # max |limit / reference - 1| (fat-finger guard)
+
+
+class PreTradeRiskChecker:
+    """
+    Per-order pre-trade risk checks in O(1): order size and notional, fat-finger price band
+    against the last reference price, per-symbol position, gross / net exposure and a
+    token-bucket order rate limit.
+
+    Exposure state (committed shares, reference prices, gross and net exposure) is kept
+    incrementally: an accepted order or a price update adjusts the totals by its own
+    contribution, so no check ever scans the book. Scalar state lives in plain lists
+    indexed by a symbol id (Python floats are faster than numpy scalars on this path);
+    check_batch() evaluates vectors of orders against the same state.
+
+    Instances are callables returning a rejection reason or None, so they plug straight
+    into OrderGateway(risk_checks=[...]) or RiskManager.pre_trade.
+    """
+    def __init__(self, limits: Optional[PreTradeLimits] = None, profile_checks: bool = False):
+        """
+        Args:
+            limits: Limits to enforce (default: none).
+            profile_checks: Also time every individual check (adds a few hundred ns each);
+                            the total per order is always recorded.
+        """
+        self.limits = limits or PreTradeLimits()
+        self.profile_checks = profile_checks
+        self._ids: Dict[str, int] = {}
+        self.symbols: List[str] = []
+        self._position: List[float] = []
+        self._price: List[float] = []
+        self._limit: List[float] = []
+        self.gross_exposure = 0.0
+        self.net_exposure = 0.0
+        rate = self.limits.max_orders_per_second
+        self._capacity = self.limits.burst if self.limits.burst is not None else max(rate, 1.0)
+        self._tokens = self._capacity
+        self._refilled_ns = time.perf_counter_ns()
+        self.latency = LatencyHistogram()
+        self.batch_latency = LatencyHistogram()
+        self.check_latency = {name: LatencyHistogram() for name in CHECKS}
+        self.stats = {'checked': 0, 'accepted': 0, 'rejected': 0}
+        self.rejects: Dict[str, int] = {name: 0 for name in CHECKS}
+
+    # --- State ---
+    def _id(self, symbol: str) -> int:
+        i = self._ids.get(symbol)
+        if i is None:
+            i = self._ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            self._position.append(0.0)
+            self._price.append(float('nan'))
+            self._limit.append(self.limits.position_limits.get(symbol, self.limits.max_position))
+        return i
+
+    def _move(self, i: int, delta: float):
+        """Adds delta shares to symbol i's committed position, updating exposures in O(1)."""
+        old = self._position[i]
+        new = old + delta
+        self._position[i] = new
+        price = self._price[i]
+        if price == price:  # not NaN
+            self.gross_exposure += (abs(new) - abs(old)) * price
+            self.net_exposure += delta * price
+
+    def update_price(self, symbol: str, price: float):
+        """New reference price (last trade / mid); re-marks the symbol's exposure in O(1)."""
+        i = self._id(symbol)
+        old = self._price[i]
+        position = self._position[i]
+        if old == old:
+            self.gross_exposure += abs(position) * (price - old)
+            self.net_exposure += position * (price - old)
+        else:
+            self.gross_exposure += abs(position) * price
+            self.net_exposure += position * price
+        self._price[i] = float(price)
+
+    def set_position(self, symbol: str, shares: float):
+        """Sets a committed position directly (e.g. start-of-day positions)."""
+        i = self._id(symbol)
+        self._move(i, shares - self._position[i])
+
+    def release(self, order: OrderRequest, quantity: Optional[int] = None):
+        """
+        Backs out an accepted order's unfilled quantity (venue reject, cancel, IOC
+        remainder) from the committed position.
+        """
+        quantity = order.quantity - order.filled if quantity is None else quantity
+        i = self._ids.get(order.symbol)
+        if i is not None and quantity:
+            self._move(i, -quantity if order.side == 'BUY' else quantity)
+
+    def position(self, symbol: str) -> float:
+        i = self._ids.get(symbol)
+        return 0.0 if i is None else self._position[i]
+
+    # --- Single order ---
+    def _take_token(self, now_ns: int) -> bool:
+        rate = self.limits.max_orders_per_second
+        if rate == INF:
+            return True
+        self._tokens = min(self._capacity, self._tokens + (now_ns - self._refilled_ns) * 1e-9 * rate)
+        self._refilled_ns = now_ns
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+    def _order_size(self, quantity, notional) -> Optional[str]:
+        if quantity > self.limits.max_order_quantity:
+            return 'max order quantity'
+        if notional > self.limits.max_order_notional:
+            return 'max order notional'
+        return None
+
+    def _price_band(self, price, reference) -> Optional[str]:
+        if price is None:
+            return None if reference == reference else 'no reference price'
+        if reference == reference and abs(price / reference - 1.0) > self.limits.price_band:
+            return 'price band'
+        return None
+
+    def _position_limit(self, i, delta) -> Optional[str]:
+        new = self._position[i] + delta
+        if abs(new) > self._limit[i] and abs(new) > abs(self._position[i]):
+            return 'max position'
+        return None
+
+    def _exposure(self, i, delta, mark) -> Optional[str]:
+        old = self._position[i]
+        gross = self.gross_exposure + (abs(old + delta) - abs(old)) * mark
+        net = self.net_exposure + delta * mark
+        # Orders that reduce an exposure over its limit are still allowed
+        if gross > self.limits.max_gross_exposure and gross > self.gross_exposure:
+            return 'max gross exposure'
+        if abs(net) > self.limits.max_net_exposure and abs(net) > abs(self.net_exposure):
+            return 'max net exposure'
+        return None
+
+    def check(self, symbol: str, side: str, quantity: float, price: Optional[float] = None,
+              now_ns: Optional[int] = None) -> Optional[str]:
+        """
+        Runs every check for one order; on acceptance its quantity is committed.
+
+        Returns:
+            The first failing check's reason, or None if the order may be sent.
+        """
+        start = time.perf_counter_ns()
+        i = self._id(symbol)
+        reference = self._price[i]
+        mark = price if price is not None else reference
+        delta = quantity if side == 'BUY' else -quantity
+        if self.profile_checks:
+            reason = self._profiled(i, quantity, price, reference, mark, delta, now_ns)
+        else:
+            reason = (self._order_size(quantity, quantity * mark if mark == mark else 0.0)
+                      or self._price_band(price, reference)
+                      or self._position_limit(i, delta))
+            if reason is None and reference == reference:
+                reason = self._exposure(i, delta, reference)
+            if reason is None and not self._take_token(now_ns or start):
+                reason = 'rate limit'
+        self._finish(i, delta, reason)
+        self.latency.record(time.perf_counter_ns() - start)
+        return reason
+
+    def _profiled(self, i, quantity, price, reference, mark, delta, now_ns) -> Optional[str]:
+        """Same checks as check(), timing each one into check_latency."""
+        clock = time.perf_counter_ns
+        steps = (
+            ('Order Size', lambda: self._order_size(quantity, quantity * mark if mark == mark else 0.0)),
+            ('Price Band', lambda: self._price_band(price, reference)),
+            ('Position', lambda: self._position_limit(i, delta)),
+            ('Exposure', lambda: self._exposure(i, delta, reference) if reference == reference else None),
+            ('Rate Limit', lambda: None if self._take_token(now_ns or clock()) else 'rate limit'),
+        )
+        for name, step in steps:
+            t0 = clock()
+            reason = step()
+            self.check_latency[name].record(clock() - t0)
+            if reason is not None:
+                return reason
+        return None
+
+    def _finish(self, i: int, delta: float, reason: Optional[str]):
+        self.stats['checked'] += 1
+        if reason is None:
+            self._move(i, delta)
+            self.stats['accepted'] += 1
+        else:
+            self.stats['rejected'] += 1
+            self.rejects[_CHECK_OF[reason]] += 1
+
+    def __call__(self, order: OrderRequest) -> Optional[str]:
+        """OrderGateway risk-check hook."""
+        return self.check(order.symbol, order.side, order.quantity, order.price)
+
+    # --- Batch ---
+    def check_batch(self, symbols: Sequence[str], sides, quantities, prices=None,
+                    now_ns: Optional[int] = None, chunk_size: int = 1024, scalar_run: int = 64) -> np.ndarray:
+        """
+        Checks a vector of orders, in order, with the same results as calling check() on
+        each one.
+
+        Stateless checks (size, notional, price band) are evaluated for all orders at
+        once. For the stateful ones, each chunk of orders is accepted optimistically: the
+        position and exposure paths come from per-symbol cumulative sums, and the chunk is
+        accepted up to its first breach. From a breach, the next `scalar_run` orders
+        are checked one at a time, since a limit that has just bound usually keeps
+        binding, and then the vectorized passes resume.
+
+        Args:
+            symbols: Symbol per order.
+            sides: 'BUY' / 'SELL' per order.
+            quantities: Shares per order.
+            prices: Limit prices (NaN = market order); default all market orders.
+
+        Returns:
+            Object array of rejection reasons (None = accepted).
+        """
+        start = time.perf_counter_ns()
+        n = len(symbols)
+        reasons = np.full(n, None, dtype=object)
+        if n == 0:
+            return reasons
+        unique, inverse = np.unique(np.asarray(symbols, dtype=str), return_inverse=True)
+        ids = [self._id(s) for s in unique]
+        position = np.array([self._position[i] for i in ids])
+        reference = np.array([self._price[i] for i in ids])
+        limit = np.array([self._limit[i] for i in ids])
+        quantity = np.asarray(quantities, dtype=float)
+        delta = np.where(np.asarray(sides) == 'BUY', quantity, -quantity)
+        limit_price = np.full(n, np.nan) if prices is None else np.asarray(prices, dtype=float)
+        ref = reference[inverse]
+        market = np.isnan(limit_price)
+        mark = np.where(market, ref, limit_price)
+        exposure_mark = np.nan_to_num(ref)  # no reference price yet: no exposure until one arrives
+        L = self.limits
+
+        # Stateless checks, vectorized (first failing check wins, as in check())
+        stateless = (
+            ('max order quantity', quantity > L.max_order_quantity),
+            ('max order notional', quantity * np.nan_to_num(mark) > L.max_order_notional),
+            ('no reference price', market & np.isnan(ref)),
+            ('price band', ~market & (np.abs(limit_price / ref - 1.0) > L.price_band)),
+        )
+        for reason, failed in reversed(stateless):
+            reasons[failed] = reason
+
+        # Stateful checks on the survivors, in submission order
+        candidates = np.flatnonzero(reasons == None)  # noqa: E711 (element-wise)
+        tokens = self._tokens_available(now_ns or start)
+        gross, net = self.gross_exposure, self.net_exposure
+        taken = 0
+        k = 0
+        while k < len(candidates):
+            chunk = candidates[k:k + chunk_size]
+            sym, d, m = inverse[chunk], delta[chunk], exposure_mark[chunk]
+            order = np.argsort(sym, kind='stable')
+            new = np.empty(len(d))
+            new[order] = _grouped_cumsum(d[order], sym[order])
+            new += position[sym]
+            old = new - d
+            gross_path = gross + np.cumsum((np.abs(new) - np.abs(old)) * m)
+            net_path = net + np.cumsum(d * m)
+            prev_gross = np.r_[gross, gross_path[:-1]]
+            prev_net = np.r_[net, net_path[:-1]]
+            breach = (((np.abs(new) > limit[sym]) & (np.abs(new) > np.abs(old)))
+                      | ((gross_path > L.max_gross_exposure) & (gross_path > prev_gross))
+                      | ((np.abs(net_path) > L.max_net_exposure) & (np.abs(net_path) > np.abs(prev_net))))
+            if tokens - taken < len(d):
+                breach[max(int(tokens - taken), 0):] = True
+            failed = np.flatnonzero(breach)
+            stop = failed[0] if len(failed) else len(d)
+            if stop:
+                np.add.at(position, sym[:stop], d[:stop])
+                gross, net = gross_path[stop - 1], net_path[stop - 1]
+                taken += stop
+            k += stop
+            if stop == len(d):
+                continue
+            # One order at a time through the region where a limit binds
+            for j in candidates[k:k + scalar_run]:
+                s, dj, mj = inverse[j], delta[j], exposure_mark[j]
+                old_j = position[s]
+                new_j = old_j + dj
+                gross_j = gross + (abs(new_j) - abs(old_j)) * mj
+                net_j = net + dj * mj
+                if abs(new_j) > limit[s] and abs(new_j) > abs(old_j):
+                    reasons[j] = 'max position'
+                elif gross_j > L.max_gross_exposure and gross_j > gross:
+                    reasons[j] = 'max gross exposure'
+                elif abs(net_j) > L.max_net_exposure and abs(net_j) > abs(net):
+                    reasons[j] = 'max net exposure'
+                elif tokens - taken < 1:
+                    reasons[j] = 'rate limit'
+                else:
+                    position[s], gross, net = new_j, gross_j, net_j
+                    taken += 1
+            k += scalar_run
+
+        # Commit
+        for j, i in enumerate(ids):
+            self._position[i] = float(position[j])
+        self.gross_exposure, self.net_exposure = float(gross), float(net)
+        self._spend_tokens(taken)
+        rejected = reasons != None  # noqa: E711
+        self.stats['checked'] += n
+        self.stats['accepted'] += n - int(rejected.sum())
+        self.stats['rejected'] += int(rejected.sum())
+        for reason, count in zip(*np.unique(reasons[rejected].astype(str), return_counts=True)):
+            self.rejects[_CHECK_OF[reason]] += int(count)
+        self.batch_latency.record(time.perf_counter_ns() - start)
+        return reasons
+
+    def _tokens_available(self, now_ns: int) -> float:
+        if self.limits.max_orders_per_second == INF:
+            return INF
+        return min(self._capacity, self._tokens + (now_ns - self._refilled_ns) * 1e-9 * self.limits.max_orders_per_second)
+
+    def _spend_tokens(self, count: int):
+        if self.limits.max_orders_per_second != INF:
+            now = time.perf_counter_ns()
+            self._tokens = self._tokens_available(now) - count
+            self._refilled_ns = now
+
+    # --- Reporting ---
+    def latency_report(self) -> pd.DataFrame:
+        """Latency percentiles (us) per order and, if profiled, per check."""
+        rows = {'Total': self.latency.summary()}
+        for name, histogram in self.check_latency.items():
+            if histogram.count:
+                rows[name] = histogram.summary()
+        return pd.DataFrame(rows).T
+
+    def exposure_report(self) -> pd.DataFrame:
+        """Committed shares, reference price and exposure per symbol."""
+        frame = pd.DataFrame({'Position': self._position, 'Price': self._price, 'Limit': self._limit},
+                             index=pd.Index(self.symbols, name='Symbol'))
+        frame['Exposure'] = frame['Position'] * frame['Price']
+        return frame
+
+
+_CHECK_OF = {'max order quantity': 'Order Size', 'max order notional': 'Order Size',
+             'no reference price': 'Price Band', 'price band': 'Price Band', 'max position': 'Position',
+             'max gross exposure': 'Exposure', 'max net exposure': 'Exposure', 'rate limit': 'Rate Limit'}
+
+
+def _grouped_cumsum(values: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """Cumulative sum restarting at every new group (groups sorted)."""
+    total = np.cumsum(values)
+    starts = np.r_[True, groups[1:] != groups[:-1]]
+    first = np.maximum.accumulate(np.where(starts, np.arange(len(values)), 0))
+    return total - (total - values)[first]
+
+
+def benchmark_pre_trade(n_orders: int = 200_000, n_symbols: int = 500, batch_size: int = 10_000,
+                        seed: int = 0) -> Dict[str, float]:
+    """
+    Per-order latency of the scalar path (all checks enabled) and throughput of the batch
+    path on random orders around a reference price.
+    """
+    rng = np.random.default_rng(seed)
+    symbols = np.array([f"S{i}" for i in range(n_symbols)])[rng.integers(0, n_symbols, n_orders)]
+    sides = np.where(rng.random(n_orders) < 0.5, 'BUY', 'SELL')
+    quantities = rng.integers(1, 500, n_orders).astype(float)
+    prices = 100.0 * (1 + rng.normal(0, 0.01, n_orders))
+    prices[rng.random(n_orders) < 0.001] *= 1.5  # fat fingers
+    limits = PreTradeLimits(max_order_quantity=450, max_order_notional=45_000, max_position=20_000,
+                            max_gross_exposure=500_000_000, max_net_exposure=5_000_000,
+                            max_orders_per_second=1e7, price_band=0.05)
+
+    checker = PreTradeRiskChecker(limits)
+    for i in range(n_symbols):
+        checker.update_price(f"S{i}", 100.0)
+    symbol_list, side_list, qty_list, price_list = symbols.tolist(), sides.tolist(), quantities.tolist(), prices.tolist()
+    start = time.perf_counter()
+    scalar_reasons = [checker.check(symbol_list[k], side_list[k], qty_list[k], price_list[k]) for k in range(n_orders)]
+    scalar_time = time.perf_counter() - start
+    summary = checker.latency.summary()
+
+    batch = PreTradeRiskChecker(limits)
+    for i in range(n_symbols):
+        batch.update_price(f"S{i}", 100.0)
+    start = time.perf_counter()
+    batch_reasons = []
+    for lo in range(0, n_orders, batch_size):
+        batch_reasons.append(batch.check_batch(symbols[lo:lo + batch_size], sides[lo:lo + batch_size],
+                                               quantities[lo:lo + batch_size], prices[lo:lo + batch_size]))
+    batch_time = time.perf_counter() - start
+    return {'Orders': n_orders, 'Scalar p50 (us)': summary['p50 (us)'], 'Scalar p99 (us)': summary['p99 (us)'],
+            'Scalar p99.9 (us)': summary['p99.9 (us)'], 'Scalar Orders/sec': n_orders / scalar_time,
+            'Batch Orders/sec': n_orders / batch_time, 'Rejected': checker.stats['rejected'],
+            'Batch Matches Scalar': list(np.concatenate(batch_reasons)) == scalar_reasons}
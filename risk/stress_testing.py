@@ -0,0 +1,353 @@
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+from scipy import stats
+from risk.manager import RiskManager
+from risk.drawdown import drawdown_series
+
+# Named crisis windows for historical replay (only those covered by the data are usable)
+CRISIS_WINDOWS: Dict[str, Tuple[str, str]] = {
+    'GFC 2008': ('2008-09-12', '2008-11-20'),
+    'Flash Crash 2010': ('2010-05-03', '2010-05-07'),
+    'US Downgrade 2011': ('2011-07-22', '2011-08-10'),
+    'China Deval 2015': ('2015-08-17', '2015-08-25'),
+    'Volmageddon 2018': ('2018-01-26', '2018-02-08'),
+    'COVID 2020': ('2020-02-19', '2020-03-23'),
+    'Rate Shock 2022': ('2022-08-16', '2022-10-12'),
+}
+
+
+# --- Scenario definitions ---------------------------------------------------------------
+# Scenarios are frozen dataclasses: equal definitions hash equally, which is what the
+# StressTester caches on.
+
+@dataclass(frozen=True)
+class IndexShock:
+    """Market index moves by `index_return`; each asset moves by beta x index_return,
+    spread evenly (compounded) over `days` for path revaluation."""
+    index_return: float
+    days: int = 1
+
+    @property
+    def label(self) -> str:
+        return f"Index {self.index_return:+.0%}" + (f" / {self.days}d" if self.days > 1 else '')
+
+
+@dataclass(frozen=True)
+class AssetShock:
+    """Hypothetical per-ticker returns, e.g. (('AAPL', -0.3),); unlisted tickers are flat."""
+    shocks: Tuple[Tuple[str, float], ...]
+    days: int = 1
+    name: str = ''
+
+    @property
+    def label(self) -> str:
+        return self.name or ', '.join(f"{t} {r:+.0%}" for t, r in self.shocks)
+
+
+@dataclass(frozen=True)
+class HistoricalReplay:
+    """Replays the assets' actual daily returns between `start` and `end` (inclusive)."""
+    start: str
+    end: str
+    name: str = ''
+
+    @property
+    def label(self) -> str:
+        return self.name or f"Replay {self.start}..{self.end}"
+
+
+@dataclass(frozen=True)
+class VolSpike:
+    """
+    Volatilities scale by `vol_multiplier`, and correlations are blended toward
+    `correlation` with weight `blend` (blend=0 keeps today's correlations, so the
+    scenario is a pure vol spike). The P&L is the (1 - confidence) quantile of the
+    stressed normal distribution over `days`.
+    """
+    vol_multiplier: float = 1.0
+    correlation: float = 1.0
+    blend: float = 0.0
+    confidence: float = 0.99
+    days: int = 1
+
+    @property
+    def label(self) -> str:
+        label = f"Vol x{self.vol_multiplier:g}"
+        if self.blend:
+            label += f", Corr->{self.correlation:g} ({self.blend:.0%})"
+        return label + f" @{self.confidence:.0%}" + (f" / {self.days}d" if self.days > 1 else '')
+
+
+def CorrelationBreakdown(correlation: float = 1.0, blend: float = 1.0, vol_multiplier: float = 1.0,
+                         confidence: float = 0.99, days: int = 1) -> VolSpike:
+    """Correlations jump toward `correlation` (diversification fails), optionally with a vol spike."""
+    return VolSpike(vol_multiplier, correlation, blend, confidence, days)
+
+
+PathScenario = Union[IndexShock, AssetShock, HistoricalReplay]
+Scenario = Union[IndexShock, AssetShock, HistoricalReplay, VolSpike]
+
+
+def scenario_grid(index_returns: Sequence[float] = (-0.05, -0.10, -0.20, -0.35),
+                  vol_multipliers: Sequence[float] = (1.5, 2.0, 3.0),
+                  correlations: Sequence[float] = (0.6, 0.9, 1.0),
+                  crisis_windows: Optional[Dict[str, Tuple[str, str]]] = None,
+                  confidence: float = 0.99, days: int = 1, dates: Optional[pd.Index] = None) -> List[Scenario]:
+    """
+    Standard grid: index shocks, vol spikes, vol spikes with correlation breakdowns, and
+    crisis replays (only windows with data in `dates`, if given).
+    """
+    scenarios: List[Scenario] = [IndexShock(r, days) for r in index_returns]
+    scenarios += [VolSpike(m, confidence=confidence, days=days) for m in vol_multipliers]
+    scenarios += [CorrelationBreakdown(c, 1.0, m, confidence, days) for m in vol_multipliers for c in correlations]
+    windows = CRISIS_WINDOWS if crisis_windows is None else crisis_windows
+    if dates is not None:
+        dates = pd.DatetimeIndex(dates)
+        windows = {name: (start, end) for name, (start, end) in windows.items()
+                   if ((dates >= start) & (dates <= end)).any()}
+    scenarios += [HistoricalReplay(start, end, name) for name, (start, end) in windows.items()]
+    return scenarios
+
+
+# --- Portfolios ---------------------------------------------------------------------------
+
+def engine_portfolio(engine) -> Tuple[pd.Series, float]:
+    """
+    Dollar exposure per ticker (shares x last close) and total equity of a finished
+    BacktestEngine run.
+    """
+    exposures = {}
+    for ticker, shares in engine.positions.items():
+        if shares:
+            exposures[ticker] = shares * engine.data[ticker]['Close'].iloc[-1]
+    equity = engine.results['PortfolioValue'].iloc[-1] if hasattr(engine, 'results') else engine.initial_capital
+    return pd.Series(exposures, dtype=float), float(equity)
+
+
+def engine_portfolios(engines: Dict[str, object]) -> Tuple[pd.DataFrame, pd.Series]:
+    """Exposures (tickers x engines) and equity per engine, to stress several backtests in one pass."""
+    portfolios = {name: engine_portfolio(engine) for name, engine in engines.items()}
+    exposures = pd.DataFrame({name: p[0] for name, p in portfolios.items()}).fillna(0.0)
+    return exposures, pd.Series({name: p[1] for name, p in portfolios.items()})
+
+
+def returns_from_data(data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Daily close-to-close returns panel (dates x tickers) from an engine's data dict."""
+    closes = pd.DataFrame({ticker: df['Close'] for ticker, df in data.items()})
+    return closes.pct_change().iloc[1:]
+
+
+class StressTester:
+    """
+    Applies a grid of scenarios to one or many portfolios of dollar exposures.
+
+    Shock scenarios (index / asset shocks, historical replays) become rows of a
+    (scenarios x assets) return matrix, so every scenario and portfolio is revalued by a
+    single matrix product. Vol-spike / correlation-breakdown scenarios are distributional:
+    the stressed portfolio variance m^2 [(1 - b) w'Sw + b (rho (s.w)^2 + (1 - rho) (s^2.w^2))]
+    is closed form, so those are vectorized over scenarios as well. revalue_paths()
+    replays shock scenarios day by day for path-dependent rules such as the RiskManager
+    drawdown kill switch.
+
+    Scenario shocks are cached by definition; set_market() clears the cache.
+    """
+    def __init__(self, returns: pd.DataFrame, market: Optional[pd.Series] = None, lookback: int = 252):
+        """
+        Args:
+            returns: Daily asset returns (dates x tickers), e.g. returns_from_data(engine.data).
+            market: Index returns for betas (default: equal-weight average of `returns`).
+            lookback: Trailing days used for betas, volatilities and correlations.
+        """
+        self.lookback = lookback
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.set_market(returns, market)
+
+    def set_market(self, returns: pd.DataFrame, market: Optional[pd.Series] = None):
+        """Sets the return history and re-estimates betas, vols and correlations."""
+        self.returns = returns.sort_index()
+        self.assets = list(self.returns.columns)
+        self._asset_index = {a: i for i, a in enumerate(self.assets)}
+        recent = self.returns.iloc[-self.lookback:].fillna(0.0)
+        market = recent.mean(axis=1) if market is None else market.reindex(recent.index).fillna(0.0)
+        centred = recent.values - recent.values.mean(axis=0)
+        m = market.values - market.values.mean()
+        self.betas = centred.T @ m / max(m @ m, 1e-18)
+        self.cov = np.cov(recent.values, rowvar=False).reshape(len(self.assets), len(self.assets))
+        self.vols = np.sqrt(np.diag(self.cov))
+        self._cache: Dict[Scenario, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def _align(self, exposures) -> Tuple[np.ndarray, List]:
+        """Exposures as an (N, P) dollar matrix in asset order."""
+        if isinstance(exposures, dict):
+            exposures = pd.Series(exposures, dtype=float)
+        if isinstance(exposures, pd.Series):
+            exposures = exposures.to_frame(exposures.name if exposures.name is not None else 'Portfolio')
+        unknown = set(exposures.index) - set(self.assets)
+        if unknown:
+            raise KeyError(f"No return history for {sorted(unknown)}.")
+        X = exposures.reindex(self.assets).fillna(0.0).values.astype(float)
+        return X, list(exposures.columns)
+
+    def _path(self, scenario: PathScenario) -> Tuple[np.ndarray, np.ndarray]:
+        """(daily return path (days x N), total shock (N,)) for a shock scenario, cached."""
+        cached = self._cache.get(scenario)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+        self.cache_misses += 1
+        if isinstance(scenario, IndexShock):
+            total = self.betas * scenario.index_return
+            days = scenario.days
+        elif isinstance(scenario, AssetShock):
+            total = np.zeros(len(self.assets))
+            for ticker, shock in scenario.shocks:
+                total[self._asset_index[ticker]] = shock
+            days = scenario.days
+        elif isinstance(scenario, HistoricalReplay):
+            path = self.returns.loc[scenario.start:scenario.end].fillna(0.0).values
+            if not len(path):
+                raise ValueError(f"No data between {scenario.start} and {scenario.end} for {scenario.label}.")
+            total = np.prod(1 + path, axis=0) - 1
+            self._cache[scenario] = (path, total)
+            return path, total
+        else:
+            raise TypeError(f"{type(scenario).__name__} has no return path.")
+        total = np.maximum(total, -1.0)
+        daily = (1 + total) ** (1.0 / days) - 1
+        self._cache[scenario] = (np.tile(daily, (days, 1)), total)
+        return self._cache[scenario]
+
+    def shock_matrix(self, scenarios: Sequence[PathScenario]) -> pd.DataFrame:
+        """Total asset returns per shock scenario (scenarios x assets)."""
+        return pd.DataFrame([self._path(s)[1] for s in scenarios], index=[s.label for s in scenarios],
+                            columns=self.assets)
+
+    def run(self, scenarios: Sequence[Scenario], exposures) -> pd.DataFrame:
+        """
+        Scenario P&L in dollars for every portfolio (scenarios x portfolios), plus the
+        scenario type. Losses are negative.
+        """
+        X, names = self._align(exposures)
+        pnl = np.empty((len(scenarios), X.shape[1]))
+        shock_rows = [i for i, s in enumerate(scenarios) if not isinstance(s, VolSpike)]
+        vol_rows = [i for i, s in enumerate(scenarios) if isinstance(s, VolSpike)]
+        if shock_rows:
+            shocks = np.array([self._path(scenarios[i])[1] for i in shock_rows])
+            pnl[shock_rows] = shocks @ X
+        if vol_rows:
+            spikes = [scenarios[i] for i in vol_rows]
+            m = np.array([s.vol_multiplier for s in spikes])[:, None]
+            b = np.array([s.blend for s in spikes])[:, None]
+            rho = np.array([s.correlation for s in spikes])[:, None]
+            days = np.array([s.days for s in spikes])[:, None]
+            z = stats.norm.ppf(1 - np.array([s.confidence for s in spikes]))[:, None]
+            base = np.einsum('ip,ij,jp->p', X, self.cov, X)[None, :]
+            aligned = ((self.vols @ X) ** 2)[None, :]
+            idio = ((self.vols ** 2) @ (X ** 2))[None, :]
+            variance = m ** 2 * ((1 - b) * base + b * (rho * aligned + (1 - rho) * idio)) * days
+            pnl[vol_rows] = z * np.sqrt(np.maximum(variance, 0.0))
+        result = pd.DataFrame(pnl, index=[s.label for s in scenarios], columns=names)
+        result.insert(0, 'Type', [type(s).__name__ for s in scenarios])
+        return result
+
+    def revalue_paths(self, scenarios: Sequence[PathScenario], exposures, capital=None,
+                      risk_manager: Optional[RiskManager] = None, max_chunk_elements: int = 4_000_000) -> pd.DataFrame:
+        """
+        Full day-by-day revaluation of shock scenarios with the drawdown kill switch.
+
+        Positions drift with their returns; equity = capital + cumulative P&L. On the first
+        close where drawdown from peak equity breaches -risk_manager.max_drawdown_limit (the
+        RiskManager.check_portfolio_health rule) the book is flattened and P&L stops.
+
+        Args:
+            exposures: Dollar exposures (Series / dict, or tickers x portfolios DataFrame).
+            capital: Starting equity, scalar or per portfolio (default: gross exposure).
+            risk_manager: Supplies max_drawdown_limit (default RiskManager()).
+
+        Returns:
+            One row per (scenario, portfolio): P&L without and with the kill switch, the day
+            the switch fired (NaN if never) and the worst drawdown seen.
+        """
+        X, names = self._align(exposures)
+        limit = (risk_manager or RiskManager()).max_drawdown_limit
+        capital = np.abs(X).sum(axis=0) if capital is None else np.broadcast_to(
+            np.asarray(pd.Series(capital).reindex(names).values if isinstance(capital, (pd.Series, dict))
+                       else capital, dtype=float), (X.shape[1],))
+        paths = [self._path(s)[0] for s in scenarios]
+        n_days = max(len(p) for p in paths)
+        N, P = X.shape
+        out = {k: np.empty((len(scenarios), P)) for k in ('P&L', 'P&L (Kill Switch)', 'Kill Day', 'Max Drawdown')}
+        chunk = max(1, max_chunk_elements // (n_days * N))
+        for start in range(0, len(scenarios), chunk):
+            block = paths[start:start + chunk]
+            # Pad shorter paths with flat days; growth of each position (S x days x N)
+            padded = np.zeros((len(block), n_days, N))
+            for i, path in enumerate(block):
+                padded[i, :len(path)] = path
+            growth = np.cumprod(1 + padded, axis=1)
+            equity = capital + (growth - 1) @ X  # (S, days, P)
+            drawdown = drawdown_series(equity, initial=capital, axis=1)
+            breached = drawdown < -limit
+            fired = breached.any(axis=1)
+            kill_day = breached.argmax(axis=1)
+            final = equity[:, -1]
+            at_kill = np.take_along_axis(equity, kill_day[:, None, :], axis=1)[:, 0]
+            rows = slice(start, start + len(block))
+            out['P&L'][rows] = final - capital
+            out['P&L (Kill Switch)'][rows] = np.where(fired, at_kill, final) - capital
+            out['Kill Day'][rows] = np.where(fired, kill_day + 1, np.nan)
+            # Drawdown after the switch fires is not incurred
+            live = np.arange(n_days)[None, :, None] <= np.where(fired, kill_day, n_days)[:, None, :]
+            out['Max Drawdown'][rows] = np.where(live, drawdown, 0.0).min(axis=1)
+        index = pd.MultiIndex.from_product([[s.label for s in scenarios], names], names=['Scenario', 'Portfolio'])
+        return pd.DataFrame({k: v.reshape(-1) for k, v in out.items()}, index=index)
+
+
+def benchmark_stress_test(n_assets: int = 300, n_scenarios: int = 5000, n_portfolios: int = 10,
+                          seed: int = 0) -> Dict[str, float]:
+    """
+    Times a mixed grid (random asset shocks, index shocks, vol / correlation stresses and
+    replays) on synthetic history, cold and with the scenario cache warm.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2019-01-01', periods=800)
+    tickers = [f"T{i:03d}" for i in range(n_assets)]
+    market = rng.normal(0, 0.01, len(dates))
+    returns = pd.DataFrame(rng.uniform(0.5, 1.5, n_assets) * market[:, None]
+                           + rng.normal(0, 0.015, (len(dates), n_assets)), index=dates, columns=tickers)
+    exposures = pd.DataFrame(rng.normal(0, 10_000, (n_assets, n_portfolios)), index=tickers)
+
+    scenarios: List[Scenario] = []
+    n_each = n_scenarios // 4
+    scenarios += [IndexShock(float(r), int(d)) for r, d in zip(rng.uniform(-0.4, 0.1, n_each), rng.integers(1, 20, n_each))]
+    scenarios += [VolSpike(float(m), float(c), float(b)) for m, c, b in
+                  zip(rng.uniform(1, 4, n_each), rng.uniform(0, 1, n_each), rng.uniform(0, 1, n_each))]
+    starts = rng.integers(0, len(dates) - 30, n_each)
+    scenarios += [HistoricalReplay(str(dates[s].date()), str(dates[s + 20].date())) for s in starts]
+    picks = rng.integers(0, n_assets, (n_scenarios - len(scenarios), 3))
+    scenarios += [AssetShock(tuple((tickers[i], -0.3) for i in row), days=5) for row in picks]
+
+    tester = StressTester(returns)
+    start = time.perf_counter()
+    tester.run(scenarios, exposures)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    tester.run(scenarios, exposures)
+    warm = time.perf_counter() - start
+    path_scenarios = [s for s in scenarios if not isinstance(s, VolSpike)]
+    start = time.perf_counter()
+    tester.revalue_paths(path_scenarios, exposures, capital=exposures.abs().sum() * 0.5)
+    paths = time.perf_counter() - start
+    return {
+        'Scenarios': len(scenarios),
+        'Assets': n_assets,
+        'Portfolios': n_portfolios,
+        'Run, Cold (s)': cold,
+        'Run, Cached (s)': warm,
+        'Path Revaluation (s)': paths,
+        'Cache Hits': tester.cache_hits,
+    }
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Dict
 import pandas as pd
 
 class Strategy(ABC):
@@ -22,3 +23,17 @@ class Strategy(ABC):
             Signal values: 1 (Buy), -1 (Sell), 0 (Hold/Neutral).
         """
         pass
+
+    def generate_panel_signals(self, data: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """
+        Generates signals for a whole universe of tickers.
+        Default implementation calls generate_signals once per ticker; strategies
+        that can fit or score the universe jointly override this.
+        
+        Args:
+            data: Dictionary mapping ticker -> OHLCV DataFrame.
+            
+        Returns:
+            Dictionary mapping ticker -> signals DataFrame (see generate_signals).
+        """
+        return {ticker: self.generate_signals(df) for ticker, df in data.items()}
@@ -25,10 +25,29 @@ class LSTMModel(nn.Module):
         return torch.sigmoid(out)
 
 class LSTMAlphaStrategy(Strategy):
-    def __init__(self, name: str = "LSTM_DeepAlpha", lookback_window: int = 60, training_window: int = 500):
+    """
+    LSTM direction classifier over rolling feature sequences.
+    
+    With pooled=True, generate_panel_signals trains one network on the sequences
+    of every ticker (with a scaled 'Ticker_ID' feature) with shuffled mini-batch
+    epochs over the pooled data, and scores all test sequences in batched forward
+    passes. An epoch is at most steps_per_epoch mini-batches drawn without
+    replacement, so training work is capped however large the universe gets.
+    """
+    def __init__(self, name: str = "LSTM_DeepAlpha", lookback_window: int = 60, training_window: int = 500,
+                 pooled: bool = False, batch_size: int = 1024, hidden_size: int = 50, epochs: int = 50, lr: float = 0.001,
+                 steps_per_epoch: int = 32):
         super().__init__(name)
         self.lookback_window = lookback_window
         self.training_window = training_window
+        self.hidden_size = hidden_size
+        self.epochs = epochs
+        self.lr = lr
+        self.pooled = pooled
+        self.batch_size = batch_size
+        self.steps_per_epoch = steps_per_epoch
+        self.train_steps = 0
+        self.split_date = None
         self.fe = FeatureEngineer()
         self.model = None
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
@@ -79,32 +98,25 @@ class LSTMAlphaStrategy(Strategy):
         train_df = df_norm.iloc[:split]
         test_df = df_norm.iloc[split:]
         
-        # Create Sequences (Helper for single batch)
-        def create_sequences(df, lookback):
-            X, y = [], []
-            values = df[feature_cols].values
-            targets = df['Target'].values
-            for i in range(len(values) - lookback):
-                X.append(values[i : i+lookback])
-                y.append(targets[i+lookback])
-            return torch.FloatTensor(np.array(X)).to(self.device), torch.FloatTensor(np.array(y).reshape(-1, 1)).to(self.device)
-
-        X_train, y_train = create_sequences(train_df, self.lookback_window)
-        X_test, _ = create_sequences(test_df, self.lookback_window)
+        X_train, y_train = self._create_sequences(train_df, feature_cols)
+        X_test, _ = self._create_sequences(test_df, feature_cols)
         
         if len(X_train) == 0 or len(X_test) == 0:
              return pd.DataFrame(index=data.index, columns=['Signal'], data=0)
 
+        X_train = torch.FloatTensor(X_train).to(self.device)
+        y_train = torch.FloatTensor(y_train).to(self.device)
+        X_test = torch.FloatTensor(X_test).to(self.device)
+
         # Initialize Model
         input_dim = X_train.shape[2]
-        self.model = LSTMModel(input_dim).to(self.device)
+        self.model = LSTMModel(input_dim, hidden_size=self.hidden_size).to(self.device)
         criterion = nn.BCELoss()
-        optimizer = optim.Adam(self.model.parameters(), lr=0.001)
+        optimizer = optim.Adam(self.model.parameters(), lr=self.lr)
         
         # Train
-        epochs = 50 
         self.model.train()
-        for epoch in range(epochs):
+        for epoch in range(self.epochs):
             optimizer.zero_grad()
             outputs = self.model(X_train)
             loss = criterion(outputs, y_train)
@@ -124,7 +136,126 @@ class LSTMAlphaStrategy(Strategy):
         
         pred_series = pd.Series(test_preds.cpu().numpy().flatten(), index=test_dates)
         
-        signals = pd.DataFrame(index=data.index)
+        return self._build_signals(data.index, pred_series)
+
+    def generate_panel_signals(self, data: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """
+        Pooled cross-sectional training: one network for the whole universe.
+        Normalization stays per ticker, as in generate_signals, but every ticker is
+        split at one calendar date (70% through the pooled dates), so the shared model
+        never trains on a date inside another ticker's test period.
+        """
+        if not self.pooled:
+            return super().generate_panel_signals(data)
+        
+        n_tickers = max(len(data) - 1, 1)
+        frames = {}
+        feature_cols = None
+        
+        # 1. Per-ticker normalized features
+        for ticker_id, (ticker, df) in enumerate(data.items()):
+            data_with_features = self.fe.create_features(df).dropna()
+            if len(data_with_features) < self.training_window + self.lookback_window:
+                continue
+            
+            cols = [c for c in data_with_features.columns if c not in ['Open', 'High', 'Low', 'Close', 'Volume']]
+            df_norm = data_with_features[cols].copy()
+            df_norm = (df_norm - df_norm.mean()) / (df_norm.std() + 1e-8)
+            df_norm['Ticker_ID'] = ticker_id / n_tickers
+            df_norm['Target'] = (data_with_features['Close'].shift(-1) > data_with_features['Close']).astype(int)
+            df_norm.dropna(inplace=True)
+            if feature_cols is None:
+                feature_cols = cols + ['Ticker_ID']
+            frames[ticker] = df_norm
+        
+        if not frames:
+            return {ticker: pd.DataFrame(index=df.index, columns=['Signal'], data=0) for ticker, df in data.items()}
+        
+        # 2. Shared calendar cutoff, then per-ticker sequences on each side of it, stacked
+        dates = np.unique(np.concatenate([df_norm.index.values for df_norm in frames.values()]))
+        self.split_date = pd.Timestamp(dates[int(len(dates) * 0.7)])
+        train_X, train_y, test_X, test_slices = [], [], [], {}
+        offset = 0
+        for ticker, df_norm in frames.items():
+            split = df_norm.index.searchsorted(self.split_date)
+            X_tr, y_tr = self._create_sequences(df_norm.iloc[:split], feature_cols)
+            X_te, _ = self._create_sequences(df_norm.iloc[split:], feature_cols)
+            if len(X_tr):
+                train_X.append(X_tr)
+                train_y.append(y_tr)
+            if len(X_te):
+                test_X.append(X_te)
+                test_slices[ticker] = (offset, offset + len(X_te), df_norm.index[split:][self.lookback_window:])
+                offset += len(X_te)
+        
+        if not train_X or not test_X:
+            return {ticker: pd.DataFrame(index=df.index, columns=['Signal'], data=0) for ticker, df in data.items()}
+        
+        X_train = torch.FloatTensor(np.concatenate(train_X))
+        y_train = torch.FloatTensor(np.concatenate(train_y))
+        X_test = torch.FloatTensor(np.concatenate(test_X))
+        
+        # 3. Single model. Every epoch is a shuffled pass over the pooled sequences in
+        # mini-batches, capped at steps_per_epoch batches: small universes see every
+        # sequence each epoch, large ones a fresh random subset, so a fit costs at most
+        # epochs * steps_per_epoch steps whatever the number of tickers.
+        self.model = LSTMModel(X_train.shape[2], hidden_size=self.hidden_size).to(self.device)
+        criterion = nn.BCELoss()
+        optimizer = optim.Adam(self.model.parameters(), lr=self.lr)
+        
+        generator = torch.Generator().manual_seed(42)
+        batch_size = min(self.batch_size, len(X_train))
+        samples_per_epoch = min(len(X_train), batch_size * self.steps_per_epoch)
+        self.train_steps = 0
+        self.model.train()
+        for epoch in range(self.epochs):
+            order = torch.randperm(len(X_train), generator=generator)[:samples_per_epoch]
+            for start in range(0, len(order), batch_size):
+                batch = order[start:start + batch_size]
+                optimizer.zero_grad()
+                outputs = self.model(X_train[batch].to(self.device))
+                loss = criterion(outputs, y_train[batch].to(self.device))
+                loss.backward()
+                optimizer.step()
+                self.train_steps += 1
+        
+        # 4. Batched scoring of every ticker's test sequences
+        self.model.eval()
+        preds = []
+        with torch.no_grad():
+            for start in range(0, len(X_test), self.batch_size):
+                preds.append(self.model(X_test[start:start + self.batch_size].to(self.device)).cpu().numpy())
+        preds = np.concatenate(preds).flatten()
+        
+        signals = {}
+        for ticker, df in data.items():
+            if ticker not in test_slices:
+                signals[ticker] = pd.DataFrame(index=df.index, columns=['Signal'], data=0)
+                continue
+            lo, hi, test_dates = test_slices[ticker]
+            signals[ticker] = self._build_signals(df.index, pd.Series(preds[lo:hi], index=test_dates))
+        
+        return signals
+
+    def _create_sequences(self, df: pd.DataFrame, feature_cols: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Builds (samples, lookback, features) windows and next-step targets without a Python loop.
+        """
+        lookback = self.lookback_window
+        values = df[feature_cols].values.astype(np.float32)
+        targets = df['Target'].values.astype(np.float32)
+        n = len(values) - lookback
+        if n <= 0:
+            return np.empty((0, lookback, len(feature_cols)), dtype=np.float32), np.empty((0, 1), dtype=np.float32)
+        
+        windows = np.lib.stride_tricks.sliding_window_view(values, lookback, axis=0)[:n]
+        X = np.ascontiguousarray(windows.transpose(0, 2, 1))
+        y = targets[lookback:lookback + n].reshape(-1, 1)
+        return X, y
+
+    @staticmethod
+    def _build_signals(index: pd.Index, pred_series: pd.Series) -> pd.DataFrame:
+        signals = pd.DataFrame(index=index)
         signals['Signal'] = 0
         
         # Threshold 0.5
@@ -0,0 +1,250 @@
+from strategies.base import Strategy
+import time
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional
+
+
+class MeanReversionStrategy(Strategy):
+    """
+    Mean-reversion family scored on the whole ticker panel at once.
+
+    Every method reduces to a (T x N) score z where low values are cheap:
+        zscore:    (Close - rolling mean) / rolling std (sample std) over `window` bars
+        bollinger: same, with the population std of Bollinger bands; entries at the
+                   lower band (entry_z = num_std) and exits at the middle band
+        reversal:  k-bar log return divided by its expected size, rolling daily
+                   volatility * sqrt(k); optionally demeaned across tickers first
+                   (cross_sectional=True) so only relative losers are bought
+
+    Positions use hysteresis: long when z <= -entry_z, flat again once z >= -exit_z
+    (and, with allow_short, short when z >= entry_z until z <= exit_z).
+
+    Two equivalent paths share one state (an (N, window + 1) ring buffer of prices
+    plus the open long/short flags):
+        score_panel(prices)  - vectorized backfill over a (T x N) close panel
+        update_bar(prices)   - one bar for the whole universe, for live use
+    score_panel leaves the state as if update_bar had been called once per row, so a
+    strategy can be warmed up on history and then streamed. Missing prices carry the
+    last quote forward (zero return).
+    """
+    METHODS = ('zscore', 'bollinger', 'reversal')
+
+    def __init__(self, method: str = 'zscore', window: int = 20, entry_z: float = 2.0, exit_z: float = 0.5,
+                 num_std: float = 2.0, lookback: int = 5, cross_sectional: bool = False, allow_short: bool = False,
+                 tickers: Optional[List[str]] = None):
+        """
+        Args:
+            method: 'zscore', 'bollinger' or 'reversal'.
+            window: Bars in the rolling mean / volatility.
+            entry_z, exit_z: Hysteresis thresholds on |z| ('zscore' and 'reversal').
+            num_std: Band width for 'bollinger' (entry_z = num_std, exit_z = 0).
+            lookback: k, the return horizon for 'reversal' (at most `window`).
+            cross_sectional: 'reversal' only: demean k-bar returns across tickers.
+            allow_short: Emit -1 signals; otherwise the strategy is long/flat.
+            tickers: Universe for update_bar (set automatically by the panel methods).
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown method {method!r}; use one of {self.METHODS}.")
+        if not 1 <= lookback <= window:
+            raise ValueError("lookback must be between 1 and window.")
+        super().__init__(name=f"MeanReversion_{method}")
+        self.method = method
+        self.window = window
+        self.entry_z = num_std if method == 'bollinger' else entry_z
+        self.exit_z = 0.0 if method == 'bollinger' else exit_z
+        if self.exit_z > self.entry_z:
+            raise ValueError("exit_z must not exceed entry_z.")
+        self.lookback = lookback
+        self.cross_sectional = cross_sectional
+        self.allow_short = allow_short
+        self.ddof = 0 if method == 'bollinger' else 1
+        self.reset(tickers or [])
+
+    def reset(self, tickers: List[str]):
+        """Clears the streaming state for a (new) universe."""
+        self.tickers = list(tickers)
+        n = len(self.tickers)
+        self.prices = np.full((n, self.window + 1), np.nan)  # ring buffer, pos = oldest
+        self.pos = 0
+        self.last_price = np.full(n, np.nan)
+        self.long = np.zeros(n)
+        self.short = np.zeros(n)
+
+    # --- Scoring -------------------------------------------------------------------
+
+    def _score(self, windows: np.ndarray) -> np.ndarray:
+        """
+        z-scores from price windows (..., N, window + 1), oldest first along the last axis.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if self.method == 'reversal':
+                log_prices = np.log(windows)
+                k_return = log_prices[..., -1] - log_prices[..., -1 - self.lookback]
+                if self.cross_sectional:
+                    valid = np.isfinite(k_return)
+                    mean = np.where(valid, k_return, 0.0).sum(axis=-1, keepdims=True) / valid.sum(axis=-1, keepdims=True)
+                    k_return = k_return - mean
+                vol = np.diff(log_prices, axis=-1).std(axis=-1, ddof=1)
+                z = k_return / (vol * np.sqrt(self.lookback))
+            else:
+                recent = windows[..., 1:]
+                z = (recent[..., -1] - recent.mean(axis=-1)) / recent.std(axis=-1, ddof=self.ddof)
+        # A flat window has no defined z: treat it as "no signal" rather than infinite
+        return np.where(np.isfinite(z), z, np.nan)
+
+    def _events(self, z: np.ndarray):
+        """Entry (1) / exit (0) / nothing (NaN) for the long and short legs."""
+        long_events = np.where(z <= -self.entry_z, 1.0, np.where(z >= -self.exit_z, 0.0, np.nan))
+        short_events = np.where(z >= self.entry_z, 1.0, np.where(z <= self.exit_z, 0.0, np.nan))
+        return long_events, short_events
+
+    def _signal(self, long: np.ndarray, short: np.ndarray) -> np.ndarray:
+        return long - short if self.allow_short else long
+
+    @staticmethod
+    def _hold(events: np.ndarray, state: np.ndarray) -> np.ndarray:
+        """Forward-fills (T x N) events down the time axis, starting from `state`."""
+        stacked = np.vstack([state, events])
+        rows = np.where(np.isnan(stacked), 0, np.arange(len(stacked))[:, None])
+        np.maximum.accumulate(rows, axis=0, out=rows)
+        return np.take_along_axis(stacked, rows, axis=0)[1:]
+
+    # --- Streaming -----------------------------------------------------------------
+
+    def update_bar(self, prices: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Processes one bar of closes for every ticker (aligned with self.tickers; NaN =
+        no quote). O(N * window).
+
+        Returns:
+            Dict of per-ticker arrays: 'score' (z, NaN until the window is full) and
+            'signal' (1 long, 0 flat, -1 short).
+        """
+        prices = np.asarray(prices, dtype=float)
+        self.last_price = np.where(np.isfinite(prices) & (prices > 0), prices, self.last_price)
+        self.prices[:, self.pos] = self.last_price
+        self.pos = (self.pos + 1) % (self.window + 1)
+
+        order = (self.pos + np.arange(self.window + 1)) % (self.window + 1)
+        z = self._score(self.prices[:, order])
+        long_events, short_events = self._events(z)
+        self.long = np.where(np.isnan(long_events), self.long, long_events)
+        self.short = np.where(np.isnan(short_events), self.short, short_events)
+        return {'score': z, 'signal': self._signal(self.long, self.short)}
+
+    # --- Panel ---------------------------------------------------------------------
+
+    def score_panel(self, prices: pd.DataFrame, chunk_size: int = 256) -> Dict[str, pd.DataFrame]:
+        """
+        Vectorized scoring of a (T x N) close panel. Produces the same output as calling
+        update_bar once per row and leaves the strategy in the same state. If the
+        universe differs from self.tickers, the state is reset to prices.columns first.
+
+        Args:
+            prices: Closes (dates x tickers).
+            chunk_size: Bars per vectorized block (bounds the (chunk, N, window) working set).
+
+        Returns:
+            Dict of (T x N) DataFrames: 'score' and 'signal'.
+        """
+        if list(prices.columns) != self.tickers:
+            self.reset(list(prices.columns))
+        P = prices.values.astype(float)
+        T = len(P)
+        W = self.window + 1
+
+        # 1. Carry quotes forward (from the streaming state), then prepend the buffer
+        P = np.where(np.isfinite(P) & (P > 0), P, np.nan)
+        filled = pd.DataFrame(np.vstack([self.last_price, P])).ffill().values[1:]
+        order = (self.pos + np.arange(W)) % W
+        history = np.vstack([self.prices[:, order].T, filled])
+
+        # 2. Scores over sliding windows, chunked
+        windows = np.lib.stride_tricks.sliding_window_view(history, W, axis=0)[1:]
+        z = np.empty((T, len(self.tickers)))
+        for start in range(0, T, chunk_size):
+            stop = min(start + chunk_size, T)
+            z[start:stop] = self._score(windows[start:stop])
+
+        # 3. Hysteresis as forward-filled entry/exit events
+        long_events, short_events = self._events(z)
+        long = self._hold(long_events, self.long)
+        short = self._hold(short_events, self.short)
+        signal = self._signal(long, short)
+
+        # 4. Leave the streaming state as if update_bar had been called T times
+        if T:
+            self.pos = (self.pos + T) % W
+            self.prices = np.roll(history[-W:].T, self.pos, axis=1)
+            self.last_price = filled[-1]
+            self.long, self.short = long[-1], short[-1]
+
+        return {'score': pd.DataFrame(z, index=prices.index, columns=prices.columns),
+                'signal': pd.DataFrame(signal, index=prices.index, columns=prices.columns)}
+
+    # --- Strategy interface --------------------------------------------------------
+
+    @staticmethod
+    def _build_signals(index: pd.Index, score: pd.Series, signal: pd.Series) -> pd.DataFrame:
+        if not score.index.equals(index):
+            score, signal = score.reindex(index), signal.reindex(index)
+        signal = np.nan_to_num(signal.values)
+        positions = np.empty_like(signal)
+        positions[0:1] = np.nan
+        np.subtract(signal[1:], signal[:-1], out=positions[1:])
+        return pd.DataFrame({'Signal': signal, 'Score': score.values, 'Positions': positions}, index=index)
+
+    def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Signals for one ticker: the panel computation on a one-column panel.
+        """
+        self.reset([])
+        panel = self.score_panel(data[['Close']])
+        return self._build_signals(data.index, panel['score']['Close'], panel['signal']['Close'])
+
+    def generate_panel_signals(self, data: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """
+        Scores the universe in one pass on the union calendar (a ticker with no bar on
+        a date carries its last close). The strategy is left ready to stream the next
+        bar with update_bar.
+        """
+        self.reset([])
+        closes = pd.DataFrame({ticker: df['Close'] for ticker, df in data.items()})
+        panel = self.score_panel(closes)
+        return {ticker: self._build_signals(df.index, panel['score'][ticker], panel['signal'][ticker])
+                for ticker, df in data.items()}
+
+
+def benchmark_mean_reversion(n_tickers: int = 500, n_bars: int = 2520, seed: int = 0) -> Dict[str, float]:
+    """
+    Panel scoring vs one generate_signals call per ticker, and the per-bar cost of
+    streaming the universe through update_bar.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2010-01-01', periods=n_bars)
+    tickers = [f"T{i}" for i in range(n_tickers)]
+    closes = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.015, (n_bars, n_tickers)), axis=0)),
+                          index=dates, columns=tickers)
+    data = {t: closes[[t]].rename(columns={t: 'Close'}) for t in tickers}
+
+    results: Dict[str, float] = {'Tickers': n_tickers, 'Bars': n_bars}
+    for method in MeanReversionStrategy.METHODS:
+        strategy = MeanReversionStrategy(method)
+        start = time.perf_counter()
+        strategy.generate_panel_signals(data)
+        results[f"{method} Panel (s)"] = time.perf_counter() - start
+
+    strategy = MeanReversionStrategy()
+    sample = tickers[:50]
+    start = time.perf_counter()
+    for t in sample:
+        strategy.generate_signals(data[t])
+    results['zscore Per-Ticker (s, extrapolated)'] = (time.perf_counter() - start) * n_tickers / len(sample)
+
+    strategy.score_panel(closes.iloc[:-250])
+    start = time.perf_counter()
+    for row in closes.values[-250:]:
+        strategy.update_bar(row)
+    results['update_bar (us)'] = (time.perf_counter() - start) / 250 * 1e6
+    return results
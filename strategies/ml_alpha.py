@@ -1,6 +1,8 @@
 from strategies.base import Strategy
 import pandas as pd
 import numpy as np
+from typing import Dict
+from sklearn.base import clone
 from sklearn.ensemble import RandomForestClassifier
 from ai.feature_engineering import FeatureEngineer
 
@@ -8,12 +10,29 @@ class MLAlphaStrategy(Strategy):
     """
     Machine Learning based Alpha Strategy.
     Uses Random Forest to predict next day's return direction.
+    
+    With pooled=True, generate_panel_signals fits one model on the stacked
+    features of every ticker (plus a 'Ticker_ID' feature) instead of one
+    model per ticker, and scores the universe in a single predict call.
+
+    After generate_panel_signals, models[ticker] and ticker_features[ticker] hold the
+    fitted model and feature rows behind each ticker's signals (the same pooled model
+    for every ticker when pooled), for ai.explainability.
     """
-    def __init__(self, train_window: int = 252):
+    NON_FEATURE_COLS = ['Target', 'Open', 'High', 'Low', 'Close', 'Volume', 'Date', 'Ticker']
+    
+    def __init__(self, train_window: int = 252, pooled: bool = False, n_estimators: int = 100, max_depth: int = 5):
         super().__init__(name="ML_RandomForest_Alpha")
         self.train_window = train_window # Rolling train window or initial batch size
-        self.model = RandomForestClassifier(n_estimators=100, max_depth=5, random_state=42)
+        self.pooled = pooled
+        self.model = RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth, random_state=42, n_jobs=-1 if pooled else None)
         self.fe = FeatureEngineer()
+        # Populated on fit, used by ai.explainability
+        self.feature_cols = []
+        self.last_features = None
+        self.models: Dict[str, RandomForestClassifier] = {}
+        self.ticker_features: Dict[str, pd.DataFrame] = {}
+        self.split_date = None  # pooled train/test cutoff
         
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -46,12 +65,11 @@ class MLAlphaStrategy(Strategy):
         
         if train_data.empty or test_data.empty:
             print("Not enough data for ML split.")
-            signals = pd.DataFrame(index=data.index)
-            signals['Signal'] = 0.0
-            signals['Positions'] = 0.0
-            return signals
+            return self._empty_signals(data.index)
 
-        feature_cols = [c for c in df_model.columns if c not in ['Target', 'Open', 'High', 'Low', 'Close', 'Volume', 'Date']]
+        feature_cols = [c for c in df_model.columns if c not in self.NON_FEATURE_COLS]
+        self.feature_cols = feature_cols
+        self.last_features = df_model[feature_cols]
         
         X_train = train_data[feature_cols]
         y_train = train_data['Target']
@@ -72,23 +90,100 @@ class MLAlphaStrategy(Strategy):
         all_X = df_model[feature_cols]
         predictions = self.model.predict(all_X)
         
+        pred_series = pd.Series(predictions, index=df_model.index)
+        
+        # Only keep signals for the test period (after split point)
+        test_start_date = test_data.index[0]
+        
+        return self._build_signals(data.index, pred_series, test_start_date)
+
+    def generate_panel_signals(self, data: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """
+        Pooled cross-sectional training: one fit and one batched predict for the universe.
+        Every ticker is split at one calendar date, 70% through the pooled dates, so
+        the shared model never trains on a date inside another ticker's test period.
+        With a common date range this is each ticker's own 70/30 split.
+        """
+        if not self.pooled:
+            # One fresh model per ticker, kept alongside the features it was fitted on
+            signals, self.models, self.ticker_features = {}, {}, {}
+            for ticker, df in data.items():
+                self.model = clone(self.model)
+                self.last_features = None
+                signals[ticker] = self.generate_signals(df)
+                if self.last_features is not None:
+                    self.models[ticker] = self.model
+                    self.ticker_features[ticker] = self.last_features
+            return signals
+        
+        # 1. Stacked Feature Engineering (long format, one row per ticker-date)
+        panel = self.fe.create_panel_features(data)
+        if panel.empty:
+            return {ticker: self._empty_signals(df.index) for ticker, df in data.items()}
+        
+        grouped_close = panel.groupby('Ticker', sort=False)['Close']
+        panel['Target'] = np.where(grouped_close.shift(-1) > panel['Close'], 1, 0)
+        panel = panel.dropna()
+        
+        # 2. Shared calendar split
+        dates = panel.index.unique().sort_values()
+        self.split_date = dates[int(len(dates) * 0.7)]
+        is_train = np.asarray(panel.index < self.split_date)
+        
+        feature_cols = [c for c in panel.columns if c not in self.NON_FEATURE_COLS]
+        self.feature_cols = feature_cols
+        self.last_features = panel[feature_cols]
+        self.models = {ticker: self.model for ticker in panel['Ticker'].unique()}
+        self.ticker_features = {ticker: rows[feature_cols] for ticker, rows in panel.groupby('Ticker', sort=False)}
+        
+        X = panel[feature_cols]
+        if not is_train.any() or is_train.all():
+            print("Not enough data for ML split.")
+            return {ticker: self._empty_signals(df.index) for ticker, df in data.items()}
+        
+        # 3. Single fit, single batched predict
+        self.model.fit(X[is_train], panel['Target'][is_train])
+        predictions = self.model.predict(X)
+        
+        # 4. Scatter predictions back to per-ticker signal frames
+        signals = {}
+        tickers = panel['Ticker'].values
+        for ticker, df in data.items():
+            mask = tickers == ticker
+            test_mask = mask & ~is_train
+            if not test_mask.any():
+                signals[ticker] = self._empty_signals(df.index)
+                continue
+            pred_series = pd.Series(predictions[mask], index=panel.index[mask])
+            test_start_date = panel.index[test_mask][0]
+            signals[ticker] = self._build_signals(df.index, pred_series, test_start_date)
+        
+        return signals
+
+    @staticmethod
+    def _empty_signals(index: pd.Index) -> pd.DataFrame:
+        signals = pd.DataFrame(index=index)
+        signals['Signal'] = 0.0
+        signals['Positions'] = 0.0
+        return signals
+
+    @staticmethod
+    def _build_signals(index: pd.Index, pred_series: pd.Series, test_start_date) -> pd.DataFrame:
+        """
+        Maps model predictions onto the original data index, zeroing the training period.
+        """
         # Create Signals DataFrame aligned with ORIGINAL data index
-        signals = pd.DataFrame(index=data.index)
+        signals = pd.DataFrame(index=index)
         signals['Signal'] = 0.0
         
         # Map predictions back. 
-        # CAUTION: df_model has dropped rows (features).
+        # CAUTION: the feature frame has dropped rows (features).
         # We place predictions at the corresponding indices.
         
-        pred_series = pd.Series(predictions, index=df_model.index)
-        
-        # Only keep signals for the test period (after split point)
-        test_start_date = test_data.index[0]
-        
         # Logic: If pred=1 -> Buy (Signal 1). If pred=0 -> Cash/Neutra (Signal 0)
         # Or Short? Let's stick to Long/Cash for now.
         
-        signals.loc[df_model.index, 'Signal_Raw'] = pred_series
+        signals.loc[pred_series.index, 'Signal_Raw'] = pred_series
         
         # Filter: Set Signal to 0 before test_start_date
         signals.loc[:test_start_date, 'Signal'] = 0.0
@@ -0,0 +1,81 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backtesting.engine import BacktestEngine
+from execution.cost_model import CommissionSchedule, TransactionCostModel
+from strategies.base import Strategy
+
+class ScheduledStrategy(Strategy):
+    """Long on a fixed share of bars, flat otherwise: plenty of round trips."""
+    def __init__(self, seed=0):
+        super().__init__("Scheduled")
+        self.rng = np.random.default_rng(seed)
+
+    def generate_signals(self, data):
+        signal = (np.arange(len(data)) // 7 + self.rng.integers(0, 2)) % 2
+        return pd.DataFrame({'Signal': signal.astype(float)}, index=data.index)
+
+def make_universe(n_tickers=3, n_bars=300, seed=5):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2021-01-01', periods=n_bars)
+    data = {}
+    for i in range(n_tickers):
+        close = 50 * (i + 1) * np.exp(np.cumsum(rng.normal(0.0005, 0.01, n_bars)))
+        data[f"T{i}"] = pd.DataFrame({'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+                                      'Volume': rng.integers(50_000, 500_000, n_bars).astype(float)}, index=dates)
+    return data
+
+def main():
+    print("=== Transaction Cost Model Verification ===")
+    data = make_universe()
+
+    # 1. One fill priced by hand: half spread, sqrt impact on lagged sigma / ADV, commission
+    print("\n[1] Per-Fill Costs...")
+    commission = CommissionSchedule(per_share=0.005, minimum=1.0, maximum_pct=0.01)
+    model = TransactionCostModel(spread_bps=4.0, impact_coefficient=0.5, commission=commission).prepare(data)
+    t, ticker, shares = 150, 'T1', 2_000
+    df = data[ticker]
+    price = df['Close'].iloc[t]
+    sigma = pd.Series(np.log(df['Close'].values)).diff().iloc[t - 20:t].std()  # 20 returns ending the bar before
+    adv = df['Volume'].values[t - 20:t].mean()
+    spread = 4.0 / 2 / 10000 * price * shares
+    impact = 0.5 * sigma * np.sqrt(shares / adv) * price * shares
+    fee = max(shares * 0.005, 1.0)
+    fills = pd.DataFrame({'Date': [df.index[t]], 'Ticker': [ticker], 'Side': [1], 'Quantity': [shares],
+                          'Price': [price]})
+    priced = model.compute_costs(fills).iloc[0]
+    buy_price = model.execution_price(ticker, df.index[t], price, shares, 1)
+    print(f"Spread {priced['Spread Cost']:.4f} vs {spread:.4f}, impact {priced['Impact Cost']:.4f} vs {impact:.4f}, "
+          f"commission {priced['Commission']:.2f} vs {fee:.2f}")
+    ok = np.isclose(priced['Spread Cost'], spread) and np.isclose(priced['Impact Cost'], impact)
+    ok &= np.isclose(priced['Commission'], fee) and np.isclose((buy_price - price) * shares, spread + impact)
+    # Commission schedule: minimum ticket, notional cap, zero shares
+    fees = commission.compute([10, 1_000, 0], [50.0, 50_000.0, 0.0])
+    ok &= np.allclose(fees, [0.5, 5.0, 0.0])
+    print(f"Commission schedule (min 1.00, cap 1%): {fees}")
+    print("PASS" if ok else "FAIL")
+
+    # 2. Engine run: every fill price carries its modeled costs, and TCA totals
+    # reconcile with the change in cash
+    print("\n[2] TCA vs Engine Cash...")
+    engine = BacktestEngine(ScheduledStrategy(), data, initial_capital=100_000.0,
+                            cost_model=TransactionCostModel(spread_bps=4.0, impact_coefficient=0.5, commission=commission))
+    engine.run()
+    fills = engine.get_fills()
+    report = engine.get_tca_report()
+    per_share = fills['Side'] * (fills['Spread Cost'] + fills['Impact Cost']) / fills['Quantity']
+    priced_in = np.allclose(fills['Fill Price'] - fills['Price'], per_share)
+    gross_cash = engine.initial_capital - (fills['Side'] * fills['Quantity'] * fills['Price']).sum()
+    total = report.loc['Total']
+    explained = gross_cash - total['Spread Cost'] - total['Impact Cost'] - total['Commission']
+    print(report[['Trades', 'Spread Cost', 'Impact Cost', 'Commission', 'Total Cost (bps)']].round(2).to_string())
+    print(f"Engine cash {engine.cash:,.4f}, cash implied by TCA {explained:,.4f}")
+    print("PASS" if len(fills) > 20 and priced_in and np.isclose(engine.cash, explained, rtol=0, atol=1e-6)
+          and np.isclose(total['Trades'], len(fills)) else "FAIL")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai import explainability
+from ai.explainability import explain_strategy, get_explainer
+from strategies.ml_alpha import MLAlphaStrategy
+
+def make_universe(n_tickers=3, n_bars=300, seed=11):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2019-01-01', periods=n_bars)
+    data = {}
+    for i in range(n_tickers):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01 * (i + 1), n_bars)))
+        data[f"T{i}"] = pd.DataFrame({'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+                                      'Volume': rng.integers(1e5, 1e6, n_bars).astype(float)}, index=dates)
+    return data
+
+def main():
+    print("=== Explainability Verification ===")
+    data = make_universe()
+
+    # 1. Per-ticker fits: each ticker keeps its own model and features
+    print("\n[1] Per-Ticker Explainers...")
+    strategy = MLAlphaStrategy(n_estimators=20, max_depth=3)
+    strategy.generate_panel_signals(data)
+    explainers = {t: explain_strategy(strategy, t, n_background=20) for t in data}
+    ok = set(strategy.ticker_features) == set(data)
+    ok &= len({id(strategy.models[t]) for t in data}) == len(data)
+    ok &= all(explainers[t].X.equals(strategy.ticker_features[t]) and explainers[t].model is strategy.models[t]
+              for t in data)
+    # Attributions add up to each ticker's own model output (not the last-fitted model's)
+    for ticker, explainer in explainers.items():
+        date = explainer.X.index[-1]
+        row = explainer.explain_date(date)
+        proba = strategy.models[ticker].predict_proba(explainer.X.loc[[date]])[0, -1]
+        ok &= isinstance(row, pd.Series) and np.isclose(row.sum() + explainer.expected_value, proba, atol=1e-6)
+        print(f"{ticker}: {len(explainer.X)} rows, top feature {explainer.global_importance().index[0]}")
+    print("PASS" if ok else "FAIL")
+
+    # 2. Cache: same model and data hit, refit or new data miss, least recent evicted
+    print("\n[2] Explainer Cache...")
+    explainability._EXPLAINER_CACHE.clear()
+    model, X = strategy.models['T0'], strategy.ticker_features['T0']
+    first = get_explainer(model, X)
+    hit = get_explainer(model, X.copy()) is first
+    miss_data = get_explainer(model, X.iloc[:-1]) is not first
+    refit = MLAlphaStrategy(n_estimators=21, max_depth=3).model.fit(X, (X['Returns'] > 0).astype(int))
+    miss_model = get_explainer(refit, X) is not first
+    for k in range(explainability._MAX_CACHED_EXPLAINERS):
+        get_explainer(model, X.iloc[:-(k + 2)])
+    evicted = get_explainer(model, X) is not first
+    print(f"hit {hit}, miss on new data {miss_data}, miss on refit {miss_model}, evicted {evicted}, "
+          f"size {len(explainability._EXPLAINER_CACHE)}")
+    print("PASS" if hit and miss_data and miss_model and evicted
+          and len(explainability._EXPLAINER_CACHE) == explainability._MAX_CACHED_EXPLAINERS else "FAIL")
+
+    # 3. Pooled: one model, per-ticker rows; a date spans every ticker on the panel
+    print("\n[3] Pooled Explainer...")
+    pooled = MLAlphaStrategy(pooled=True, n_estimators=20, max_depth=3)
+    pooled.generate_panel_signals(data)
+    one = explain_strategy(pooled, 'T1', n_background=20)
+    panel = explain_strategy(pooled, n_background=20)
+    date = one.X.index[-1]
+    ids = one.X['Ticker_ID'].unique()
+    print(f"T1 rows {len(one.X)} of {len(panel.X)}; rows on {date.date()}: {len(panel.explain_date(date))}")
+    print("PASS" if list(ids) == [1] and one.model is pooled.model and len(panel.explain_date(date)) == len(data)
+          else "FAIL")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from execution.fill_simulator import FillSimulator
+from execution.order import OrderStatus, OrderStore, Side, TimeInForce
+from execution.order_book import LimitOrder, OrderBook
+
+def main():
+    print("=== Fill Simulator Verification ===")
+    # Four bars: open, high, low, volume
+    bars = pd.DataFrame({'Open': [100.0, 99.0, 97.0, 101.0], 'High': [101.0, 100.0, 99.0, 102.0],
+                         'Low': [99.5, 98.0, 96.5, 100.0], 'Volume': [1000.0, 2000.0, 500.0, 1000.0]})
+
+    # 1. Hand-computed fills
+    print("\n[1] Queue Models & Partial Fills...")
+    prices = np.array([98.0, 98.0, 98.0, 101.5, 95.0])
+    sides = np.array([Side.BUY, Side.BUY, Side.BUY, Side.SELL, Side.BUY])
+    quantities = np.array([100, 100, 250, 100, 100])
+    args = dict(high=bars['High'].values, low=bars['Low'].values, open_=bars['Open'].values)
+    touch = FillSimulator('touch').simulate(prices[:2], sides[:2], quantities[:2], [0, 0], **args)
+    through = FillSimulator('trade_through').simulate(prices[:2], sides[:2], quantities[:2], [0, 0], **args)
+    # Buy 98: bar 1 touches (low 98), bar 2 trades through and opens at 97 below the limit
+    ok = list(touch['fill_bar']) == [1, 1] and list(through['fill_bar']) == [2, 2]
+    ok &= np.allclose(touch['fill_price'], 98.0) and np.allclose(through['fill_price'], 97.0)
+
+    capped = FillSimulator('touch', participation_rate=0.1).simulate(
+        prices[2:], sides[2:], quantities[2:], [0, 0, 0], volume=bars['Volume'].values, **args)
+    # Buy 250 @ 98 at 10% of volume: 200 on bar 1 at 98, the last 50 on bar 2 at the 97 open
+    # Sell 100 @ 101.5: touched only on bar 3 (capacity 100) at the limit; buy @ 95 never fills
+    ok &= list(capped['filled_quantity']) == [250, 100, 0]
+    ok &= list(capped['fill_bar']) == [1, 3, -1] and list(capped['complete_bar']) == [2, 3, -1]
+    ok &= np.isclose(capped['fill_price'][0], (200 * 98.0 + 50 * 97.0) / 250)
+    ok &= np.isclose(capped['fill_price'][1], 101.5) and np.isnan(capped['fill_price'][2])
+    print("PASS" if ok else f"FAIL: {capped}")
+
+    # 2. OrderBook.check_executions agrees with a loop over check_execution
+    print("\n[2] Batched vs Per-Order Checks...")
+    rng = np.random.default_rng(0)
+    n = 2000
+    T = 250
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, T)))
+    ohlc = pd.DataFrame({'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close})
+    orders = [LimitOrder(float(p), 100, side, f"O{i}") for i, (p, side) in
+              enumerate(zip(close.mean() * rng.uniform(0.9, 1.1, n), rng.choice(['BUY', 'SELL'], n)))]
+    submit = rng.integers(0, T, n)
+    book = OrderBook()
+    batched = book.check_executions(orders, ohlc, submit_bars=submit)
+    expected = np.full(n, -1)
+    for i, order in enumerate(orders):
+        for t in range(submit[i], T):
+            if book.check_execution(order, ohlc.iloc[t]):
+                expected[i] = t
+                break
+    chunked = book.check_executions(orders, ohlc, submit_bars=submit, simulator=FillSimulator(max_cells=1000))
+    print(f"{int(batched['filled'].sum())}/{n} filled")
+    print("PASS" if (batched['fill_bar'] == expected).all() and (chunked['fill_bar'] == expected).all() else "FAIL")
+
+    # 3. A participation cap needs volume and a rate in (0, 1]
+    print("\n[3] Input Validation...")
+    errors = []
+    for make, run in ((lambda: FillSimulator(participation_rate=0.1),
+                       lambda s: book.check_executions(orders[:5], ohlc, simulator=s)),
+                      (lambda: FillSimulator(participation_rate=1.5), None),
+                      (lambda: FillSimulator(participation_rate=0.0), None)):
+        try:
+            simulator = make()
+            if run is not None:
+                run(simulator)
+        except ValueError as e:
+            errors.append(str(e))
+    print("\n".join(errors))
+    print("PASS" if len(errors) == 3 else "FAIL")
+
+    # 4. OrderStore round trip: fills written back, unfilled DAY orders cancelled
+    print("\n[4] Order Store Fills...")
+    store = OrderStore()
+    ids = store.add_many(sides=[Side.BUY, Side.BUY, Side.SELL], price_ticks=[9800, 9500, 10150],
+                         quantities=[100, 100, 100], time_in_force=[TimeInForce.GTC, TimeInForce.DAY, TimeInForce.GTC])
+    FillSimulator().simulate_store(store, ids, 0.01, submit_bars=0, high=bars['High'].values, low=bars['Low'].values)
+    status = [OrderStatus(int(s)) for s in store.status[ids]]
+    print([s.name for s in status])
+    print("PASS" if status == [OrderStatus.FILLED, OrderStatus.CANCELLED, OrderStatus.FILLED]
+          and list(store.filled[ids]) == [100, 0, 100] else "FAIL")
+
+if __name__ == "__main__":
+    main()
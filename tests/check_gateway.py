@@ -0,0 +1,142 @@
+import sys
+import os
+import asyncio
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from execution.exchange_simulator import start_exchange_process
+from execution.gateway import OrderGateway, TcpJsonAdapter, VenueAdapter, benchmark_gateway
+from risk.manager import RiskManager
+from risk.pre_trade import PreTradeLimits, PreTradeRiskChecker
+
+PORT = 9137
+
+async def reconnect_scenario(exchange):
+    """Kills the exchange mid-stream and restarts it; every order must still be acknowledged."""
+    gateway = OrderGateway(TcpJsonAdapter('127.0.0.1', PORT), risk_manager=RiskManager(),
+                           risk_checks=[lambda o: 'max order size' if o.quantity > 5000 else None])
+    async with gateway:
+        orders = []
+        for i in range(3000):
+            if i == 1000:
+                exchange.kill()
+                exchange.wait()
+                restart = asyncio.get_running_loop().run_in_executor(None, start_exchange_process, PORT)
+            quantity = 10000 if i == 5 else 100
+            orders.append(await gateway.submit_signal('SYN', 'BUY' if i % 2 else 'SELL', quantity))
+        exchange = await restart
+        await asyncio.wait_for(asyncio.gather(*(o.ack for o in orders)), 30)
+    return gateway, orders, exchange
+
+async def exposure_scenario():
+    """
+    A committing check followed by one that rejects, IOC orders that expire unfilled and a
+    cancelled resting order: none of them may leave shares committed.
+    """
+    checker = PreTradeRiskChecker(PreTradeLimits(max_position=1000))
+    blocked = lambda o: 'blocked' if o.price == 50.0 else None
+    gateway = OrderGateway(TcpJsonAdapter('127.0.0.1', PORT), risk_checks=[checker, blocked])
+    log = {}
+    async with gateway:
+        rejected = [await gateway.submit_signal('EXP', 'BUY', 400, 50.0) for _ in range(3)]
+        log['after local rejects'] = checker.position('EXP')
+        ioc = []
+        for _ in range(5):  # more than max_position in total, one at a time
+            ioc.append(await gateway.submit_signal('EXP', 'BUY', 400, 1.0, 'IOC'))
+            await ioc[-1].ack
+        log['after IOC'] = checker.position('EXP')
+        resting = [await gateway.submit_signal('EXP', 'BUY', 400, 90.0) for _ in range(3)]
+        await asyncio.gather(*(o.ack for o in resting))
+        log['resting'] = checker.position('EXP')
+        await gateway.cancel(resting[0])
+        for _ in range(1000):
+            if resting[0].status == 'CANCELLED':
+                break
+            await asyncio.sleep(0.001)
+        log['after cancel'] = checker.position('EXP')
+        refill = await gateway.submit_signal('EXP', 'BUY', 400, 90.0)
+        await refill.ack
+    return log, rejected, ioc, resting, refill
+
+class LossyAdapter(TcpJsonAdapter):
+    """Drops the link as the first ack for `lose_id` arrives, so that ack is never seen."""
+    def __init__(self, port, lose_id):
+        super().__init__('127.0.0.1', port)
+        self.lose_id = lose_id
+        self.lost = False
+
+    async def receive(self):
+        msg = await super().receive()
+        if not self.lost and msg.get('type') == 'ack' and msg.get('id') == self.lose_id:
+            self.lost = True
+            await self.close()
+            raise ConnectionError("link dropped")
+        return msg
+
+async def lost_ack_scenario():
+    """The ack of an unfillable IOC is lost; the resend is acked as a duplicate."""
+    checker = PreTradeRiskChecker(PreTradeLimits(max_position=1000))
+    adapter = LossyAdapter(PORT, lose_id='GW1')
+    gateway = OrderGateway(adapter, risk_checks=[checker])
+    async with gateway:
+        order = await gateway.submit_signal('LOST', 'BUY', 400, 1.0, 'IOC')
+        await asyncio.wait_for(order.ack, 10)
+    return adapter, gateway, order, checker.position('LOST')
+
+def main():
+    print("=== Order Gateway Verification ===")
+    exchange = start_exchange_process(PORT)
+    try:
+        # 1. Latency and throughput
+        print("\n[1] Round Trip & Throughput...")
+        bench = asyncio.run(benchmark_gateway(port=PORT))
+        print(f"Signal -> ack RTT: p50 {bench['p50 RTT (us)']:.0f}us, p99 {bench['p99 RTT (us)']:.0f}us")
+        print(f"Burst: {bench['Orders/sec']:,.0f} orders/sec in {bench['Burst Batches']} batches")
+
+        # 2. Risk rejects and reconnect with resend
+        print("\n[2] Risk Checks & Reconnect...")
+        gateway, orders, exchange = asyncio.run(reconnect_scenario(exchange))
+        stats = gateway.stats
+        print(f"Reconnects: {stats['reconnects']}, resent: {stats['resent']}, risk rejects: {stats['risk_rejects']}")
+        acked = sum(o.status in ('ACKED', 'FILLED') for o in orders)
+        if stats['reconnects'] >= 1 and acked == 2999 and stats['risk_rejects'] == 1:
+            print("PASS: All orders acknowledged across the exchange restart; oversized order rejected.")
+        else:
+            print(f"FAIL: {acked} acknowledged.")
+        print(gateway.latency_report()[['Count', 'p50 (us)', 'p99 (us)', 'Max (us)']])
+
+        # 3. Committed exposure is released for everything that will never fill
+        print("\n[3] Exposure Release...")
+        exchange.kill()
+        exchange.wait()
+        exchange = start_exchange_process(PORT)  # fresh order ids: a restarted gateway numbers from GW1 again
+        log, rejected, ioc, resting, refill = asyncio.run(exposure_scenario())
+        print(", ".join(f"{k}: {v:.0f}" for k, v in log.items()))
+        reasons = [o.reject_reason for o in rejected + ioc + resting + [refill]]
+        expected = ['blocked'] * 3 + [None] * 7 + ['max position', None]
+        if (log == {'after local rejects': 0, 'after IOC': 0, 'resting': 800, 'after cancel': 400}
+                and reasons == expected and resting[0].status == 'CANCELLED'):
+            print("PASS: Local rejects, expired IOC remainders and cancels release their shares.")
+        else:
+            print(f"FAIL: reasons {reasons}")
+
+        # 4. A lost ack: the duplicate ack for the resend still releases the IOC remainder
+        print("\n[4] Lost Ack & Duplicate...")
+        exchange.kill()
+        exchange.wait()
+        exchange = start_exchange_process(PORT)
+        adapter, gateway, order, position = asyncio.run(lost_ack_scenario())
+        print(f"Ack lost: {adapter.lost}, resent: {gateway.stats['resent']}, status {order.status}, "
+              f"committed after duplicate ack: {position:.0f}")
+        try:
+            VenueAdapter()
+            abstract = False
+        except TypeError:
+            abstract = True
+        print("PASS" if adapter.lost and gateway.stats['resent'] == 1 and order.status == 'ACKED' and position == 0
+              and abstract else "FAIL")
+    finally:
+        exchange.kill()
+
+if __name__ == "__main__":
+    main()
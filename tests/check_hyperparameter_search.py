@@ -0,0 +1,85 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.hyperparameter_search import (HyperparameterSearch, lstm_objective, make_sequences, prepare_dataset,
+                                      random_forest_objective)
+from backtesting.walk_forward import WalkForwardSplitter
+
+def make_panel(n_tickers=3, n_bars=400, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2020-01-01', periods=n_bars)
+    data = {}
+    for i in range(n_tickers):
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, n_bars)))
+        data[f"T{i}"] = pd.DataFrame({'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+                                      'Volume': rng.integers(1e5, 1e6, n_bars).astype(float)}, index=dates)
+    return data
+
+def main():
+    print("=== Hyperparameter Search Verification ===")
+
+    # 1. Folds are chronological: every training row precedes its validation block by
+    # at least the gap, and the validation blocks tile the tail in order
+    print("\n[1] Fold Chronology...")
+    ok = True
+    for splitter in (WalkForwardSplitter(), WalkForwardSplitter(n_splits=4, max_train_size=100, gap=3)):
+        folds = splitter.split(1000)
+        ok &= all(train.max() + splitter.gap < val.min() for train, val in folds)
+        ok &= all(prev[1].max() + 1 == nxt[1].min() for prev, nxt in zip(folds, folds[1:]))
+        ok &= folds[-1][1].max() == 999 and len(folds) == splitter.n_splits
+    print(f"Default gap: {WalkForwardSplitter().gap}")
+    print("PASS" if ok and WalkForwardSplitter().gap >= 1 else "FAIL")
+
+    # 2. Sampled trials are distinct, and a space smaller than n_trials is not padded with repeats
+    print("\n[2] Distinct Trials...")
+    space = {'max_depth': [3, 5], 'min_samples_leaf': [1, 5]}
+    trials = HyperparameterSearch(random_forest_objective, space, n_trials=10).sample_params()
+    keys = {tuple(t.items()) for t in trials}
+    print(f"{len(trials)} trials from a space of 4")
+    print("PASS" if len(trials) == len(keys) == 4 else "FAIL")
+
+    # 3. Panel sequences: windows never mix tickers
+    print("\n[3] Per-Ticker Sequences...")
+    X, y, cols = prepare_dataset(make_panel())
+    groups = X[:, cols.index('Ticker_ID')]
+    windows, targets = make_sequences(X, y, 20, groups)
+    ids = windows[:, :, cols.index('Ticker_ID')]
+    pooled, _ = make_sequences(X, y, 20)
+    mixed = (np.ptp(pooled[:, :, cols.index('Ticker_ID')], axis=1) > 0).mean()
+    print(f"{len(windows)} windows; mixed-ticker windows: grouped {(np.ptp(ids, axis=1) > 0).mean():.0%}, "
+          f"ungrouped {mixed:.0%}")
+    print("PASS" if (np.ptp(ids, axis=1) == 0).all() and len(windows) == len(X) - 3 * 20 else "FAIL")
+
+    # 4. Successive halving vs random search with pruning, on the same trials
+    print("\n[4] Halving vs Random Search...")
+    space = {'n_estimators': [25, 50, 100], 'max_depth': (2, 8), 'min_samples_leaf': [1, 5, 20]}
+    splitter = WalkForwardSplitter(n_splits=9, gap=3)  # 3 tickers per date
+    boards = {}
+    for method in ('halving', 'random'):
+        search = HyperparameterSearch(random_forest_objective, space, n_trials=12, method=method,
+                                      splitter=splitter, max_workers=2)
+        boards[method] = search.run(X, y, groups)
+        board = boards[method]
+        print(f"{method:8s} best loss {board['Loss'].iloc[0]:.4f}, completed "
+              f"{(board['Status'] == 'completed').sum()}, fold evaluations {board['Folds'].sum()}, "
+              f"CPU {board.attrs['Total CPU Seconds']:.1f}s")
+    halving, random = boards['halving'], boards['random']
+    full = 12 * 9
+    print("PASS" if (halving['Folds'].sum() < random['Folds'].sum() < full
+                     and (halving['Status'] == 'completed').sum() == 2
+                     and halving.iloc[0]['Folds'] == random.iloc[0]['Folds'] == 9) else "FAIL")
+
+    # 5. The LSTM objective runs on grouped panel folds
+    print("\n[5] LSTM Objective...")
+    search = HyperparameterSearch(lstm_objective, {'hidden_size': [8, 16], 'epochs': [5], 'lookback_window': [10]},
+                                  n_trials=4, splitter=WalkForwardSplitter(n_splits=3, gap=3), max_workers=0)
+    board = search.run(X, y, groups)
+    print(board[['hidden_size', 'Loss', 'Folds', 'Status']].to_string())
+    print("PASS" if len(board) == 2 and np.isfinite(board['Loss']).all() else "FAIL")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from strategies.mean_reversion import MeanReversionStrategy, benchmark_mean_reversion
+
+def main():
+    print("=== Mean Reversion Strategy Verification ===")
+    rng = np.random.default_rng(11)
+    n_bars, n_tickers = 600, 25
+    dates = pd.bdate_range('2020-01-01', periods=n_bars)
+    # Ornstein-Uhlenbeck-ish log prices with a few gaps
+    log_prices = np.zeros((n_bars, n_tickers))
+    for t in range(1, n_bars):
+        log_prices[t] = 0.9 * log_prices[t - 1] + rng.normal(0, 0.02, n_tickers)
+    closes = pd.DataFrame(100 * np.exp(log_prices), index=dates, columns=[f"T{i}" for i in range(n_tickers)])
+    closes.iloc[rng.integers(0, n_bars, 40), rng.integers(0, n_tickers, 40)] = np.nan
+    data = {t: closes[[t]].rename(columns={t: 'Close'}) for t in closes.columns}
+
+    for method in MeanReversionStrategy.METHODS:
+        print(f"\n[{method}]")
+        strategy = MeanReversionStrategy(method, allow_short=True)
+
+        # 1. Panel equals per-ticker generate_signals (same calendar)
+        panel = strategy.generate_panel_signals(data)
+        single = {t: MeanReversionStrategy(method, allow_short=True).generate_signals(df) for t, df in data.items()}
+        same = all(panel[t]['Signal'].equals(single[t]['Signal']) and
+                   np.allclose(panel[t]['Score'], single[t]['Score'], equal_nan=True) for t in data)
+        trades = sum(panel[t]['Positions'].abs().sum() for t in data)
+        print(f"Panel vs per-ticker: {trades:.0f} position changes", "PASS" if same else "FAIL")
+
+        # 2. Warm up on history, stream the rest: identical to one panel pass
+        full = MeanReversionStrategy(method, allow_short=True).score_panel(closes)
+        streamed = MeanReversionStrategy(method, allow_short=True)
+        streamed.score_panel(closes.iloc[:400])
+        rows = [streamed.update_bar(row) for row in closes.values[400:]]
+        scores = np.array([r['score'] for r in rows])
+        signals = np.array([r['signal'] for r in rows])
+        ok = (np.allclose(scores, full['score'].values[400:], equal_nan=True, atol=1e-10)
+              and (signals == full['signal'].values[400:]).all())
+        print("Streaming vs panel:", "PASS" if ok else "FAIL")
+
+    # 3. Cross-sectional reversal ranks relative moves: a market-wide drop is not a signal
+    shocked = closes.ffill().copy()
+    shocked.iloc[500:] *= 0.85
+    plain = MeanReversionStrategy('reversal').score_panel(shocked)['signal'].iloc[500]
+    relative = MeanReversionStrategy('reversal', cross_sectional=True).score_panel(shocked)['signal'].iloc[500]
+    print(f"\n[Cross-Sectional Reversal] Longs on a -15% market day: {plain.sum():.0f} absolute, "
+          f"{relative.sum():.0f} relative", "PASS" if relative.sum() < plain.sum() else "FAIL")
+
+    # 4. Scale
+    print("\n[Speed]")
+    print(pd.Series(benchmark_mean_reversion()).to_string())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from risk.optimizer import PortfolioOptimizer, benchmark_optimizer
+
+def slsqp_min_variance(mu, cov, target, max_weight=1.0):
+    """Reference long-only min-variance weights for a target return (None for no target)."""
+    n = len(mu)
+    constraints = [{'type': 'eq', 'fun': lambda w: w.sum() - 1}]
+    if target is not None:
+        constraints.append({'type': 'eq', 'fun': lambda w: w @ mu - target})
+    result = minimize(lambda w: w @ cov @ w, np.full(n, 1.0 / n), jac=lambda w: 2 * cov @ w, method='SLSQP',
+                      bounds=[(0, max_weight)] * n, constraints=constraints, options={'ftol': 1e-14, 'maxiter': 500})
+    return result.x
+
+def main():
+    print("=== Mean-Variance Optimizer Verification ===")
+    rng = np.random.default_rng(5)
+    n_assets = 40
+    returns = rng.normal(0.0005, 0.01, (750, n_assets)) + rng.normal(0, 0.01, (750, 1)) * rng.uniform(0, 2, n_assets)
+    mu, cov = returns.mean(axis=0) * 252, np.cov(returns, rowvar=False) * 252
+    sharpe = lambda w: (w @ mu - 0.02) / np.sqrt(w @ cov @ w)
+
+    # 1. Convex max-Sharpe agrees with SLSQP, uncapped and with a weight cap
+    print("\n[1] Max Sharpe: Convex QP vs SLSQP...")
+    ok = True
+    for max_weight in (1.0, 0.1):
+        optimizer = PortfolioOptimizer(max_weight=max_weight)
+        convex = optimizer.max_sharpe_from_moments(mu, cov)
+        method = optimizer.diagnostics['Method']
+        converged = optimizer.diagnostics['Converged']
+        slsqp = optimizer.max_sharpe_from_moments(mu, cov, method='slsqp')
+        feasible = np.isclose(convex.sum(), 1) and convex.min() >= -1e-10 and convex.max() <= max_weight + 1e-10
+        ok &= feasible and converged and sharpe(convex) - sharpe(slsqp) > -1e-6
+        print(f"cap {max_weight:.0%} ({method}): Sharpe {sharpe(convex):.6f} vs SLSQP {sharpe(slsqp):.6f}")
+    # A warm start from the answer lands on the same portfolio
+    optimizer = PortfolioOptimizer()
+    w = optimizer.max_sharpe_from_moments(mu, cov)
+    warm = optimizer.max_sharpe_from_moments(mu, cov, w0=w)
+    ok &= np.allclose(w, warm, atol=1e-8)
+    print(f"Warm start: {optimizer.diagnostics['Iterations']} iterations")
+    # A golden-section search cut short does not claim convergence
+    capped = PortfolioOptimizer(max_weight=0.1)
+    lb, ub = capped._bounds(n_assets)
+    cut_short = capped._max_sharpe_on_frontier(mu, cov, lb, ub, max_iter=3)[2]
+    ok &= not cut_short
+    print(f"Capped search after 3 steps reports converged={cut_short}")
+    print("PASS" if ok else "FAIL")
+
+    # 2. Frontier: monotone, on the independent SLSQP solution at each checked target,
+    # and topped by the tangency portfolio
+    print("\n[2] Efficient Frontier...")
+    summary, weights = optimizer.efficient_frontier_from_moments(mu, cov, n_points=50)
+    print(summary[['Return', 'Volatility', 'Sharpe', 'Holdings', 'Iterations']].iloc[::10])
+    ok = (np.diff(summary['Volatility']) > -1e-10).all() and np.allclose(weights.sum(axis=1), 1)
+    ok &= summary['Converged'].all() and summary['Sharpe'].max() <= sharpe(w) + 1e-9
+    # Each point achieves its target return
+    target_gap = (summary['Return'] - summary['Target Return']).abs().max()
+    ok &= target_gap < 1e-10
+    print(f"Max |return - target|: {target_gap:.2e}")
+    ok &= np.isclose(summary['Volatility'].iloc[0], np.sqrt(optimizer.min_variance(cov) @ cov @ optimizer.min_variance(cov)))
+    gaps = []
+    for k in (0, 12, 25, 37):
+        reference = slsqp_min_variance(mu, cov, summary['Target Return'].iloc[k] if k else None)
+        gaps.append(summary['Volatility'].iloc[k] - np.sqrt(reference @ cov @ reference))
+    ok &= max(gaps) < 1e-6
+    print(f"Max volatility above SLSQP: {max(gaps):.2e}")
+    print("PASS" if ok else "FAIL")
+
+    # 3. Bounds: a cap too tight to fully invest is rejected
+    print("\n[3] Input Validation...")
+    try:
+        PortfolioOptimizer(max_weight=0.01).min_variance(cov)
+        print("FAIL")
+    except ValueError as e:
+        print(f"{e}\nPASS")
+
+    # 4. Scale
+    print("\n[4] Speed...")
+    print(pd.Series(benchmark_optimizer(n_assets=1000)).to_string())
+
+if __name__ == "__main__":
+    main()
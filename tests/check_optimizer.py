@@ -0,0 +1,55 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from risk.optimizer import PortfolioOptimizer, benchmark_optimizer, benchmark_risk_parity
+
+def main():
+    print("=== Portfolio Optimizer Verification ===")
+    rng = np.random.default_rng(5)
+    n_assets = 40
+    returns = rng.normal(0.0005, 0.01, (750, n_assets)) + rng.normal(0, 0.01, (750, 1)) * rng.uniform(0, 2, n_assets)
+    mu, cov = returns.mean(axis=0) * 252, np.cov(returns, rowvar=False) * 252
+    sharpe = lambda w: (w @ mu - 0.02) / np.sqrt(w @ cov @ w)
+
+    # 1. Convex max-Sharpe agrees with SLSQP
+    print("\n[1] Max Sharpe: Convex QP vs SLSQP...")
+    optimizer = PortfolioOptimizer()
+    convex = optimizer.max_sharpe_from_moments(mu, cov)
+    print(optimizer.diagnostics)
+    slsqp = optimizer.max_sharpe_from_moments(mu, cov, method='slsqp')
+    print(optimizer.diagnostics)
+    gap = sharpe(convex) - sharpe(slsqp)
+    print(f"Sharpe {sharpe(convex):.6f} vs {sharpe(slsqp):.6f}", "PASS" if gap > -1e-6 else "FAIL")
+
+    # 2. Frontier is monotone and contains the tangency portfolio
+    print("\n[2] Efficient Frontier...")
+    summary, weights = optimizer.efficient_frontier_from_moments(mu, cov, n_points=50)
+    monotone = (np.diff(summary['Volatility']) > -1e-10).all() and np.allclose(weights.sum(axis=1), 1)
+    print(summary[['Return', 'Volatility', 'Sharpe', 'Holdings', 'Iterations']].iloc[::10])
+    print("PASS: Frontier volatility rises with return." if monotone and summary['Sharpe'].max() <= sharpe(convex) + 1e-9
+          else "FAIL")
+
+    # 3. Risk parity: contributions match budgets, with and without correlations
+    print("\n[3] Equal Risk Contribution...")
+    budgets = np.r_[np.full(10, 2.0), np.ones(n_assets - 10)]
+    for method in ('ccd', 'newton'):
+        w = optimizer.risk_parity_from_covariance(cov, budgets=budgets, method=method, warm_start=False)
+        shares = w * (cov @ w) / (w @ cov @ w)
+        ok = np.abs(shares - budgets / budgets.sum()).max() < 1e-6
+        print(f"{method}: {optimizer.diagnostics['Iterations']} iterations,", "PASS" if ok else "FAIL")
+    prices = pd.DataFrame(np.cumprod(1 + returns, axis=0), columns=[f"T{i}" for i in range(n_assets)])
+    erc = pd.Series(optimizer.calculate_risk_parity_weights(prices))
+    inverse_vol = pd.Series(optimizer.calculate_risk_parity_weights(prices, method='inverse_vol'))
+    print(f"Max |ERC - inverse vol| weight gap: {(erc - inverse_vol).abs().max():.4f}")
+
+    # 4. Scale
+    print("\n[4] Speed...")
+    print(pd.Series(benchmark_optimizer(n_assets=1000)).to_string())
+    print(pd.Series(benchmark_risk_parity(n_assets=2000, n_rebalances=120)).to_string())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import sys
+import os
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from execution.latency_model import LatencyModel
+from execution.matching_engine import MatchingEngine
+from execution.order import FillStore, OrderStatus, OrderStore, OrderType, Side, TimeInForce
+
+def main():
+    print("=== Order & Fill Store Verification ===")
+
+    # 1. Bulk and single adds grow the columns; views read the rows back
+    print("\n[1] Order Store...")
+    store = OrderStore(capacity=4)
+    ids = store.add_many(sides=np.where(np.arange(10) % 2, Side.SELL, Side.BUY), price_ticks=10000 + np.arange(10),
+                         quantities=100, timestamps_us=np.arange(10) * 10)
+    single = store.add(Side.BUY, 9990, 50, symbol_id=3, order_type=OrderType.MARKET,
+                       time_in_force=TimeInForce.IOC, timestamp_us=500)
+    order = store.get(single)
+    ok = len(store) == 11 and list(ids) == list(range(10)) and single == 10
+    ok &= (order.side, order.order_type, order.time_in_force, order.symbol_id, order.quantity) == \
+        (Side.BUY, OrderType.MARKET, TimeInForce.IOC, 3, 50)
+    ok &= store.get(9).side == Side.SELL and store.get(9).price_ticks == 10009
+    try:
+        store.get(11)
+        ok = False
+    except KeyError:
+        pass
+    print(repr(order))
+    print("PASS" if ok else "FAIL")
+
+    # 2. Fills: repeated ids accumulate, statuses follow, open mask tracks live orders
+    print("\n[2] Fills & Status...")
+    store.record_fills([0, 0, 1], [60, 40, 30])
+    store.record_fill(2, 100)
+    store.update_status([3], OrderStatus.CANCELLED)
+    status = [OrderStatus(int(s)) for s in store.status[:4]]
+    frame = store.to_frame()
+    ok = list(store.filled[:4]) == [100, 30, 100, 0] and list(store.remaining([0, 1])) == [0, 70]
+    ok &= status == [OrderStatus.FILLED, OrderStatus.PARTIALLY_FILLED, OrderStatus.FILLED, OrderStatus.CANCELLED]
+    ok &= list(np.flatnonzero(store.open_mask())[:3]) == [1, 4, 5] and len(frame) == 11
+    print([s.name for s in status])
+    print("PASS" if ok else "FAIL")
+
+    # 3. Latency stamping: arrival = creation + latency, submissions follow arrival order
+    print("\n[3] Latency Stamps...")
+    store = OrderStore()
+    ids = store.add_many(sides=Side.BUY, price_ticks=10000, quantities=10, timestamps_us=[0, 100, 200, 300])
+    unstamped = list(store.arrival_us[ids])
+    store.stamp_latency(ids, latency_us=[500, 50, 10, 400])
+    model_store = OrderStore()
+    model_ids = model_store.add_many(sides=[Side.BUY] * 1000, price_ticks=10000, quantities=10, timestamps_us=1_000)
+    model_store.stamp_latency(model_ids, latency_model=LatencyModel(mean_latency_ms=5.0, std_latency_ms=1.0, seed=7))
+    delay_ms = (model_store.arrival_us[model_ids] - 1_000) / 1000.0
+    ok = unstamped == [0, 100, 200, 300] and list(store.arrival_us[ids]) == [500, 150, 210, 700]
+    ok &= list(store.by_arrival()) == [1, 2, 0, 3] and store.get(0).arrival_us == 500
+    ok &= abs(delay_ms.mean() - 5.0) < 0.2 and abs(delay_ms.std() - 1.0) < 0.1
+    print(f"Arrival order {store.by_arrival().tolist()}; model delay {delay_ms.mean():.2f} +/- {delay_ms.std():.2f} ms")
+    print("PASS" if ok else "FAIL")
+
+    # 4. The matching engine stamps the ledger with arrival times
+    print("\n[4] Ledger Stamps...")
+    store, ledger = OrderStore(), FillStore(capacity=2)
+    engine = MatchingEngine(tick_size=0.01, store=store, ledger=ledger)
+    makers = store.add_many(sides=Side.SELL, price_ticks=[10000, 10001, 10002], quantities=100, timestamps_us=0)
+    taker = store.add(Side.BUY, 10001, 150, timestamp_us=1_000)
+    late = store.add(Side.BUY, 10002, 100, time_in_force=TimeInForce.IOC, timestamp_us=1_100)
+    store.stamp_latency([taker, late], latency_us=[2_000, 300])
+    for order_id in store.by_arrival():
+        engine.submit_order(int(order_id))
+    fills = ledger.to_frame(tick_size=0.01)
+    print(fills[['maker_id', 'taker_id', 'quantity', 'price', 'timestamp_us']].to_string(index=False))
+    # The late IOC arrives first (1,400us) and takes 100 @ 100.00; the first taker (3,000us)
+    # finds 100 @ 100.01 and rests its last 50
+    ok = list(fills['taker_id']) == [late, taker] and list(fills['timestamp_us']) == [1_400, 3_000]
+    ok &= np.allclose(fills['price'], [100.00, 100.01]) and list(fills['quantity']) == [100, 100]
+    ok &= store.get(taker).status == OrderStatus.PARTIALLY_FILLED and store.get(late).status == OrderStatus.FILLED
+    ok &= list(store.filled[makers]) == [100, 100, 0]
+    fill = ledger.get(1)
+    ok &= (fill.maker_id, fill.taker_id, fill.side, fill.timestamp_us) == (makers[1], taker, Side.BUY, 3_000)
+    print("PASS" if ok else "FAIL")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from strategies.ml_alpha import MLAlphaStrategy
+from strategies.lstm_alpha import LSTMAlphaStrategy
+
+def make_universe(n_tickers=4, n_bars=800, phi=-0.6, seed=3):
+    """Mean-reverting AR(1) returns: tomorrow's direction is predictable from today's return."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2018-01-01', periods=n_bars)
+    data = {}
+    for i in range(n_tickers):
+        noise = rng.normal(0, 0.01, n_bars)
+        returns = np.zeros(n_bars)
+        for t in range(1, n_bars):
+            returns[t] = phi * returns[t - 1] + noise[t]
+        close = 100 * np.exp(np.cumsum(returns))
+        data[f"T{i}"] = pd.DataFrame({'Open': close, 'High': close * 1.005, 'Low': close * 0.995, 'Close': close,
+                                      'Volume': rng.integers(1e5, 1e6, n_bars).astype(float)}, index=dates)
+    return data
+
+def hit_rate(data, signals):
+    """Share of long-signal bars followed by an up close, over the universe."""
+    hits, longs = 0, 0
+    for ticker, df in data.items():
+        up = (df['Close'].shift(-1) > df['Close']).iloc[:-1]
+        long = signals[ticker]['Signal'].reindex(up.index).fillna(0) == 1
+        hits += int((up & long).sum())
+        longs += int(long.sum())
+    return hits / max(longs, 1), longs
+
+def no_training_period_signals(data, signals):
+    """Signals are zero over each ticker's first 60% of bars (inside its 70% training block)."""
+    return all((signals[t]['Signal'].iloc[:int(len(df) * 0.6)] == 0).all() for t, df in data.items())
+
+def main():
+    print("=== Pooled Panel Alpha Verification ===")
+    data = make_universe()
+
+    # 1. Pooled random forest: one fit for the universe, test-period signals only
+    print("\n[1] Pooled Random Forest...")
+    strategy = MLAlphaStrategy(pooled=True, n_estimators=50)
+    start = time.perf_counter()
+    signals = strategy.generate_panel_signals(data)
+    elapsed = time.perf_counter() - start
+    precision, longs = hit_rate(data, signals)
+    print(f"{elapsed:.2f}s, {longs} long bars, next-day up rate {precision:.1%}")
+    print("PASS" if set(signals) == set(data) and no_training_period_signals(data, signals)
+          and 'Ticker_ID' in strategy.feature_cols and precision > 0.6 else "FAIL")
+
+    # 2. Pooled LSTM: each epoch passes over every pooled sequence, so a few epochs
+    # learn the mean reversion (a single mini-batch per epoch would not)
+    print("\n[2] Pooled LSTM...")
+    strategy = LSTMAlphaStrategy(lookback_window=20, training_window=200, pooled=True, batch_size=256,
+                                 hidden_size=16, epochs=15, lr=0.005)
+    start = time.perf_counter()
+    signals = strategy.generate_panel_signals(data)
+    elapsed = time.perf_counter() - start
+    precision, longs = hit_rate(data, signals)
+    print(f"{elapsed:.2f}s, {longs} long bars, next-day up rate {precision:.1%}")
+    print("PASS" if set(signals) == set(data) and no_training_period_signals(data, signals)
+          and longs > 0 and precision > 0.6 else "FAIL")
+
+    # 3. Staggered listings: one calendar cutoff for every ticker, no signal before it
+    # (a per-ticker 70% split would start T3's test period inside the others' training)
+    print("\n[3] Shared Train/Test Cutoff...")
+    staggered = dict(data)
+    staggered['T0'] = data['T0'].iloc[:500]
+    staggered['T3'] = data['T3'].iloc[300:]
+    ok = True
+    for strategy in (MLAlphaStrategy(pooled=True, n_estimators=20),
+                     LSTMAlphaStrategy(lookback_window=20, training_window=200, pooled=True, batch_size=256,
+                                       hidden_size=8, epochs=2)):
+        signals = strategy.generate_panel_signals(staggered)
+        early = [t for t, df in staggered.items() if (signals[t]['Signal'][df.index < strategy.split_date] != 0).any()]
+        ok &= not early and (signals['T0']['Signal'] == 0).all()
+        if isinstance(strategy, MLAlphaStrategy):
+            # T3 lists late but is still scored after the cutoff
+            ok &= (signals['T3']['Signal'] != 0).any()
+        print(f"{strategy.name}: cutoff {strategy.split_date.date()}, signals before it: {early or 'none'}")
+    print("PASS" if ok else "FAIL")
+
+    # 4. Work per pooled LSTM fit is capped: 4x the tickers, same number of steps
+    print("\n[4] LSTM Step Budget...")
+    steps = {}
+    for n_tickers in (4, 16):
+        strategy = LSTMAlphaStrategy(lookback_window=20, training_window=200, pooled=True, batch_size=64,
+                                     hidden_size=8, epochs=3, steps_per_epoch=10)
+        start = time.perf_counter()
+        strategy.generate_panel_signals(make_universe(n_tickers=n_tickers, n_bars=600))
+        steps[n_tickers] = strategy.train_steps
+        print(f"{n_tickers} tickers: {strategy.train_steps} steps, {time.perf_counter() - start:.2f}s")
+    print("PASS" if steps[4] == steps[16] == 30 else "FAIL")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import sys
+import os
+import asyncio
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from execution.gateway import OrderGateway, VenueAdapter
+from risk.manager import RiskManager
+from risk.pre_trade import PreTradeLimits, PreTradeRiskChecker, benchmark_pre_trade
+
+class LoopbackAdapter(VenueAdapter):
+    """Acknowledges every order in-process; rejects orders above 1000 shares."""
+    async def connect(self):
+        self.inbox = asyncio.Queue()
+
+    async def send(self, messages):
+        for m in messages:
+            status = 'rejected' if m['qty'] > 1000 else 'accepted'
+            await self.inbox.put({'type': 'ack', 'id': m['id'], 'status': status, 'reason': 'venue limit'})
+
+    async def receive(self):
+        return await self.inbox.get()
+
+async def gateway_scenario(checker):
+    gateway = OrderGateway(LoopbackAdapter(), risk_manager=RiskManager(pre_trade=checker))
+    async with gateway:
+        orders = [await gateway.submit_signal('AAA', 'BUY', qty, 100.0) for qty in (500, 1500, 4000, 800)]
+        await asyncio.gather(*(o.ack for o in orders))
+    return orders
+
+def main():
+    print("=== Pre-Trade Risk Verification ===")
+    limits = PreTradeLimits(max_order_quantity=5000, max_order_notional=400_000, max_position=3000,
+                            max_gross_exposure=1_000_000, max_net_exposure=600_000, price_band=0.05,
+                            max_orders_per_second=1e6)
+
+    # 1. Each limit rejects with its reason
+    print("\n[1] Limits...")
+    checker = PreTradeRiskChecker(limits)
+    checker.update_price('AAA', 100.0)
+    checker.update_price('BBB', 50.0)
+    checker.update_price('DDD', 200.0)
+    cases = [('AAA', 'BUY', 6000, None, 'max order quantity'), ('AAA', 'BUY', 4500, 100.0, 'max order notional'),
+             ('AAA', 'BUY', 100, 110.0, 'price band'), ('CCC', 'BUY', 100, None, 'no reference price'),
+             ('AAA', 'BUY', 2500, 100.0, None), ('AAA', 'BUY', 600, 100.0, 'max position'),
+             ('BBB', 'BUY', 2900, None, None), ('DDD', 'BUY', 1500, None, 'max net exposure'),
+             ('AAA', 'SELL', 2500, None, None)]
+    ok = True
+    for symbol, side, qty, price, expected in cases:
+        reason = checker.check(symbol, side, qty, price)
+        ok &= reason == expected
+        print(f"{side} {qty} {symbol} @ {price}: {reason}")
+    print("PASS" if ok else "FAIL")
+
+    # 2. Incremental exposure matches a full recomputation after price moves
+    print("\n[2] Incremental Exposure...")
+    checker.update_price('AAA', 103.0)
+    checker.update_price('BBB', 47.5)
+    book = checker.exposure_report()
+    gap = max(abs(checker.gross_exposure - book['Exposure'].abs().sum()), abs(checker.net_exposure - book['Exposure'].sum()))
+    print(book)
+    print(f"Max gap: {gap:.2e}", "PASS" if gap < 1e-6 else "FAIL")
+
+    # 3. Batch evaluation agrees with order-by-order checks, with limits binding
+    print("\n[3] Batch vs Scalar...")
+    rng = np.random.default_rng(1)
+    n = 20_000
+    symbols = np.array(['AAA', 'BBB', 'CCC', 'DDD'])[rng.integers(0, 4, n)]
+    sides = np.where(rng.random(n) < 0.55, 'BUY', 'SELL')
+    quantities = rng.integers(1, 800, n).astype(float)
+    prices = np.where(rng.random(n) < 0.5, np.nan, 100 * (1 + rng.normal(0, 0.03, n)))
+    scalar, batch = PreTradeRiskChecker(limits), PreTradeRiskChecker(limits)
+    for c in (scalar, batch):
+        for symbol in ('AAA', 'BBB', 'CCC', 'DDD'):
+            c.update_price(symbol, 100.0)
+    expected = [scalar.check(s, side, q, None if np.isnan(p) else p)
+                for s, side, q, p in zip(symbols.tolist(), sides.tolist(), quantities.tolist(), prices.tolist())]
+    result = np.concatenate([batch.check_batch(symbols[i:i + 1000], sides[i:i + 1000], quantities[i:i + 1000],
+                                               prices[i:i + 1000]) for i in range(0, n, 1000)])
+    print(pd.Series(scalar.rejects))
+    same = list(result) == expected and abs(scalar.net_exposure - batch.net_exposure) < 1e-6
+    print("PASS: Identical decisions and state." if same else "FAIL")
+
+    # 4. Gateway hook: rejects before the venue, venue rejects release committed exposure
+    print("\n[4] Order Gateway...")
+    checker = PreTradeRiskChecker(limits)
+    checker.update_price('AAA', 100.0)
+    orders = asyncio.run(gateway_scenario(checker))
+    print([(o.quantity, o.status, o.reject_reason) for o in orders])
+    ok = [o.status for o in orders] == ['ACKED', 'REJECTED', 'REJECTED', 'ACKED'] and checker.position('AAA') == 1300
+    print("PASS" if ok else f"FAIL: position {checker.position('AAA')}")
+
+    # 5. Latency
+    print("\n[5] Latency...")
+    print(pd.Series(benchmark_pre_trade()).to_string())
+    profiled = PreTradeRiskChecker(limits, profile_checks=True)
+    profiled.update_price('AAA', 100.0)
+    for k in range(20_000):
+        profiled.check('AAA', 'BUY' if k % 2 else 'SELL', 100, 100.0)
+    print(profiled.latency_report()[['Count', 'p50 (us)', 'p99 (us)', 'Max (us)']])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import sys
+import os
+import warnings
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from strategies.stat_arb import (PairsScreener, StatArbStrategy, adf_statistics, adjusted_rejections,
+                                 benchmark_pairs_screening, engle_granger_pvalue)
+from backtesting.engine import BacktestEngine
+from backtesting.portfolio import PortfolioBacktestEngine
+
+def main():
+    print("=== Statistical Arbitrage Verification ===")
+    rng = np.random.default_rng(21)
+    n_bars, n_tickers = 500, 120
+    log_prices = 4 + np.cumsum(rng.normal(0, 0.01, (n_bars, 1)) + rng.normal(0, 0.012, (n_bars, n_tickers)), axis=0)
+    planted = [(2 * i, 2 * i + 1) for i in range(10)]
+    for y, x in planted:
+        spread = np.zeros(n_bars)
+        for t in range(1, n_bars):
+            spread[t] = 0.85 * spread[t - 1] + rng.normal(0, 0.005)
+        log_prices[:, y] = 0.05 + 0.8 * log_prices[:, x] + spread
+    closes = pd.DataFrame(np.exp(log_prices), index=pd.bdate_range('2020-01-01', periods=n_bars),
+                          columns=[f"T{i}" for i in range(n_tickers)])
+
+    # 1. Batched ADF statistics match one least-squares fit per pair
+    print("\n[1] Batched ADF Regressions...")
+    L = log_prices[:252]
+    y_idx, x_idx = rng.integers(0, n_tickers, 30), rng.integers(0, n_tickers, 30)
+    beta, alpha = rng.uniform(0.5, 1.5, 30), rng.normal(0, 0.1, 30)
+    stats, _ = adf_statistics(L, y_idx, x_idx, beta, alpha, n_lags=2)
+    gap = 0.0
+    for p in range(30):
+        e = L[:, y_idx[p]] - beta[p] * L[:, x_idx[p]] - alpha[p]
+        de = np.diff(e)
+        X = np.column_stack([e[2:-1], de[1:-1], de[:-2]])
+        coef, res, _, _ = np.linalg.lstsq(X, de[2:], rcond=None)
+        se = np.sqrt(res[0] / (len(X) - 3) * np.linalg.inv(X.T @ X)[0, 0])
+        gap = max(gap, abs(coef[0] / se - stats[p]))
+    print(f"Max t-stat gap: {gap:.2e}", "PASS" if gap < 1e-8 else "FAIL")
+
+    # 2. Screening: planted pairs found, pool == in-process, cached re-screen
+    print("\n[2] Pairs Screening...")
+    serial = PairsScreener(max_workers=0, chunk_size=50).screen(closes, lookback=252)
+    screener = PairsScreener(max_workers=2, chunk_size=50)
+    pooled = screener.screen(closes, lookback=252)
+    screener.screen(closes, lookback=252)
+    found = set(zip(pooled.loc[pooled['Cointegrated'], 'Y'], pooled.loc[pooled['Cointegrated'], 'X']))
+    recovered = sum((f"T{y}", f"T{x}") in found for y, x in planted)
+    print(f"{len(pooled)} candidates, {recovered}/{len(planted)} planted pairs flagged, cache hits {screener.cache_hits}")
+    print("PASS" if serial.equals(pooled) and recovered == len(planted) and screener.cache_hits == 1 else "FAIL")
+
+    # 2b. Multiple testing: p-values reproduce the critical values; BH and Bonferroni
+    # cut-offs by hand; pure noise flags (almost) nothing once corrected
+    print("\n[2b] Multiple-Testing Correction...")
+    p_crit = engle_granger_pvalue([-3.89644, -3.33613, -3.04445])
+    p = np.array([0.001, 0.008, 0.039, 0.041, 0.042, 0.06, 0.074, 0.205, 0.212, 0.216])
+    bh = adjusted_rejections(p, 0.05, 'fdr')                 # 0.008 <= 2 x 0.005, 0.039 > 3 x 0.005
+    bonferroni = adjusted_rejections(p, 0.05, 'bonferroni')  # 0.001 <= 0.005 only
+    noise = pd.DataFrame(np.exp(4 + np.cumsum(rng.normal(0, 0.01, (252, 1)) + rng.normal(0, 0.01, (252, 150)), axis=0)),
+                         columns=[f"N{i}" for i in range(150)])
+    flagged = {c: int(PairsScreener(min_correlation=0.3, correction=c, max_workers=0).screen(noise)['Cointegrated'].sum())
+               for c in (None, 'fdr', 'bonferroni')}
+    print(f"p at 1/5/10% critical values: {np.round(p_crit, 4)}; noise pairs flagged: {flagged}")
+    ok = np.allclose(p_crit, [0.01, 0.05, 0.10], atol=5e-4)
+    ok &= list(np.flatnonzero(bh)) == [0, 1] and list(np.flatnonzero(bonferroni)) == [0]
+    ok &= flagged['fdr'] <= 1 and flagged['bonferroni'] <= 1 and flagged[None] > 5 * max(flagged['fdr'], 1)
+    print("PASS" if ok else "FAIL")
+
+    # 3. Rolling hedge ratios from running sums equal a direct OLS on the window
+    print("\n[3] Rolling Hedge Ratio...")
+    pairs = PairsScreener.select_pairs(pooled, n_pairs=10)
+    strategy = StatArbStrategy(hedge='rolling', window=60)
+    strategy.reset(list(closes.columns), pairs)
+    gaps = []
+    for t, row in enumerate(closes.values[:203]):
+        strategy.update_bar(row)
+        if t in (59, 120, 202):
+            ys, xs = log_prices[t - 59:t + 1][:, strategy.y_idx], log_prices[t - 59:t + 1][:, strategy.x_idx]
+            direct = [np.polyfit(xs[:, p], ys[:, p], 1)[0] for p in range(len(pairs))]
+            gaps.append(np.abs(strategy.beta - direct).max())
+    # A flat window has no hedge ratio: the pair holds nothing instead of NaN weights
+    flat = closes.iloc[:70, :2].copy()
+    flat['T1'] = 50.0
+    stuck = StatArbStrategy(pd.DataFrame({'Y': ['T0'], 'X': ['T1']}), hedge='rolling', window=60)
+    stuck.reset(['T0', 'T1'], stuck.pairs)
+    stuck.position[:] = 1.0
+    out = [stuck.update_bar(row) for row in flat.values][-1]
+    clean = np.isnan(out['hedge_ratio']).all() and np.array_equal(out['weights'], [0.0, 0.0])
+    print(f"Max gap: {max(gaps):.2e}, flat-window weights {out['weights']}",
+          "PASS" if max(gaps) < 1e-8 and clean else "FAIL")
+
+    # 4. Kalman filter tracks a drifting hedge ratio: its forecast errors stay near the
+    # observation noise while a fixed full-sample hedge leaves a trending spread
+    print("\n[4] Kalman Hedge Ratio...")
+    x = 4 + np.cumsum(rng.normal(0, 0.01, n_bars))
+    y = np.linspace(0.5, 1.0, n_bars) * x + rng.normal(0, 0.005, n_bars)
+    drifting = pd.DataFrame(np.exp(np.column_stack([y, x])), columns=['Y', 'X'])
+    strategy = StatArbStrategy(pd.DataFrame({'Y': ['Y'], 'X': ['X'], 'Spread Std': [0.005]}), delta=1e-5)
+    strategy.reset(['Y', 'X'], strategy.pairs)
+    kalman_std = strategy.score_panel(drifting)['spread'].values[100:, 0].std()
+    fixed_std = np.std(y - np.polyval(np.polyfit(x, y, 1), x))
+    print(f"Spread std: Kalman {kalman_std:.4f}, fixed OLS {fixed_std:.4f}",
+          "PASS" if kalman_std < 0.01 < fixed_std else "FAIL")
+
+    # 5. Strategy interface: screen on formation, trade afterwards
+    print("\n[5] Panel Signals...")
+    data = {t: closes[[t]].rename(columns={t: 'Close'}) for t in closes.columns}
+    strategy = StatArbStrategy(formation=252, n_pairs=10, screener=PairsScreener(max_workers=0))
+    signals = strategy.generate_panel_signals(data)
+    panel = pd.DataFrame({t: s['Signal'] for t, s in signals.items()})
+    flat_formation = (panel.iloc[:252] == 0).all().all()
+    print(f"{len(strategy.pairs)} pairs, {int(panel.diff().abs().sum().sum())} signal changes after formation",
+          "PASS" if flat_formation and panel.iloc[252:].values.any() else "FAIL")
+
+    # 6. Through an engine: the portfolio engine holds the hedged long/short book (its
+    # P&L carries little of the common factor a long-only book does); the long/flat
+    # BacktestEngine warns that it would drop the short legs
+    print("\n[6] Engine Backtest...")
+    weights = strategy.target_weights(data)
+    market = closes.pct_change().mean(axis=1).values[253:]
+    betas = {}
+    for name, book in (('hedged', weights), ('long legs only', weights.clip(lower=0))):
+        engine = PortfolioBacktestEngine(closes, weights=book, frequency=1, lookback=1)
+        returns = engine.run()['Returns'].values[253:]
+        betas[name] = np.cov(returns, market)[0, 1] / market.var(ddof=1)
+    held = np.allclose(engine.target_weights.values, weights.clip(lower=0).loc[engine.target_weights.index].values)
+    tickers = sorted(set(strategy.pairs['Y']) | set(strategy.pairs['X']))
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        BacktestEngine(StatArbStrategy(strategy.pairs, allow_short=True), {t: data[t] for t in tickers}).run()
+    warned = any('long/flat' in str(w.message) for w in caught)
+    print(f"Market beta: hedged {betas['hedged']:.3f}, long legs only {betas['long legs only']:.3f}; "
+          f"BacktestEngine warned: {warned}")
+    print("PASS" if held and warned and abs(betas['hedged']) < 0.5 * abs(betas['long legs only']) else "FAIL")
+
+    # 7. Scale
+    print("\n[7] Speed...")
+    print(pd.Series(benchmark_pairs_screening()).to_string())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from risk.manager import RiskManager
+from risk.stress_testing import AssetShock, HistoricalReplay, IndexShock, StressTester, benchmark_stress_test
+
+def main():
+    print("=== Stress Testing Verification ===")
+    rng = np.random.default_rng(4)
+    dates = pd.bdate_range('2023-01-02', periods=64)
+    returns = pd.DataFrame(rng.normal(0, 0.01, (64, 2)), index=dates, columns=['A', 'B'])
+    # The last four days are the crisis replayed below
+    returns.iloc[-4:] = [[0.02, -0.01], [-0.10, -0.05], [-0.12, 0.01], [0.20, 0.03]]
+    crisis = HistoricalReplay(str(dates[-4].date()), str(dates[-1].date()), 'Crisis')
+    exposures = pd.DataFrame({'Mixed': [60_000.0, 40_000.0], 'B Only': [0.0, 100_000.0]}, index=['A', 'B'])
+    tester = StressTester(returns)
+
+    # 1. Kill switch on a hand-computed path (drawdown limit 10%, capital 100k):
+    #   Mixed:  equity 100,800 / 92,700 / 86,466.60 / 97,300.566 -> day 3 is 14.22% below
+    #           the 100,800 peak, so the book is flattened there at -13,533.40
+    #   B Only: equity 99,000 / 94,050 / 94,990.50 / 97,840.215 -> never below -10%
+    print("\n[1] Path Revaluation & Kill Switch...")
+    result = tester.revalue_paths([crisis], exposures, capital=100_000.0,
+                                  risk_manager=RiskManager(max_drawdown_limit=0.10))
+    print(result.round(4).to_string())
+    mixed, b_only = result.loc[('Crisis', 'Mixed')], result.loc[('Crisis', 'B Only')]
+    ok = mixed['Kill Day'] == 3 and np.isclose(mixed['P&L (Kill Switch)'], -13_533.40)
+    ok &= np.isclose(mixed['P&L'], -2_699.434) and np.isclose(mixed['Max Drawdown'], 86_466.60 / 100_800 - 1)
+    ok &= np.isnan(b_only['Kill Day']) and np.isclose(b_only['P&L'], -2_159.785)
+    ok &= np.isclose(b_only['P&L (Kill Switch)'], b_only['P&L']) and np.isclose(b_only['Max Drawdown'], -0.0595)
+    print("PASS" if ok else "FAIL")
+
+    # 2. Paths of different lengths in one pass; without a kill, the path P&L equals
+    # the one-step shock P&L of run()
+    print("\n[2] Mixed Horizons vs Single-Step Revaluation...")
+    scenarios = [IndexShock(-0.05, days=3), AssetShock((('A', -0.04),), days=2), crisis]
+    loose = RiskManager(max_drawdown_limit=0.99)
+    paths = tester.revalue_paths(scenarios, exposures, risk_manager=loose)['P&L'].unstack()
+    single = tester.run(scenarios, exposures)[exposures.columns]
+    gap = np.abs(paths.loc[single.index, single.columns].values - single.values).max()
+    by_hand = [[60_000 * tester.betas[0] * -0.05 + 40_000 * tester.betas[1] * -0.05, 100_000 * tester.betas[1] * -0.05],
+               [-2_400.0, 0.0], [-2_699.434, -2_159.785]]
+    print(f"Max gap {gap:.2e}")
+    print("PASS" if gap < 1e-6 and np.allclose(single.values, by_hand) else "FAIL")
+
+    # 3. Scale
+    print("\n[3] Speed...")
+    print(pd.Series(benchmark_stress_test(n_scenarios=2000)).to_string())
+
+if __name__ == "__main__":
+    main()